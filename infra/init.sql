@@ -1,17 +1,44 @@
 CREATE EXTENSION IF NOT EXISTS vector;
 
 CREATE TABLE document_chunks (
-    id            UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    document_name VARCHAR(512) NOT NULL,
-    chunk_index   INTEGER NOT NULL,
-    content       TEXT NOT NULL,
-    metadata      JSONB NOT NULL DEFAULT '{}',
-    embedding     vector(384) NOT NULL,
-    created_at    TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    document_name   VARCHAR(512) NOT NULL,
+    chunk_index     INTEGER NOT NULL,
+    content         TEXT NOT NULL,
+    metadata        JSONB NOT NULL DEFAULT '{}',
+    embedding       vector(384) NOT NULL,
+    content_hash    VARCHAR(64),
+    embedding_model VARCHAR(255),
+    content_tsv     TSVECTOR,
+    created_at      TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated_at      TIMESTAMP WITH TIME ZONE DEFAULT now(),
     CONSTRAINT uq_document_chunk UNIQUE (document_name, chunk_index)
 );
 
 CREATE INDEX idx_chunks_embedding ON document_chunks
-    USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+    USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
 
 CREATE INDEX idx_chunks_document_name ON document_chunks (document_name);
+
+CREATE INDEX idx_chunks_metadata ON document_chunks USING gin (metadata jsonb_path_ops);
+
+CREATE INDEX idx_chunks_content_tsv ON document_chunks USING gin (content_tsv);
+
+CREATE TABLE corpus_state (
+    id              SMALLINT PRIMARY KEY DEFAULT 1,
+    version         BIGINT NOT NULL DEFAULT 0,
+    updated_at      TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    CONSTRAINT ck_corpus_state_single_row CHECK (id = 1)
+);
+
+INSERT INTO corpus_state (id, version) VALUES (1, 0);
+
+CREATE TABLE vector_index_builds (
+    id              BIGSERIAL PRIMARY KEY,
+    index_type      VARCHAR(16) NOT NULL,
+    parameters      JSONB NOT NULL DEFAULT '{}',
+    row_count       BIGINT NOT NULL,
+    reason          TEXT NOT NULL,
+    started_at      TIMESTAMP WITH TIME ZONE NOT NULL,
+    finished_at     TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
@@ -2,5 +2,8 @@
 
 __version__ = "0.1.0"
 
+from lib_embedding.cache import EmbeddingCache
+from lib_embedding.cross_encoder import CrossEncoderClient
 from lib_embedding.embedding import EmbeddingClient
+from lib_embedding.hnsw import HnswIndex
 from lib_embedding.settings import EmbeddingSettings
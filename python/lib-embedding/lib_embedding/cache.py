@@ -0,0 +1,178 @@
+"""Persistent content-addressed cache for embedding vectors."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key       TEXT PRIMARY KEY,
+    vector    BLOB NOT NULL,
+    last_used INTEGER NOT NULL
+)
+"""
+_LAST_USED_INDEX = "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)"
+
+# Vectors are stored as little-endian float32 regardless of platform.
+_DTYPE = np.dtype("<f4")
+
+# SQLite limits the number of host parameters per statement.
+_MAX_PARAMS = 500
+
+
+def cache_key(model_name: str, text: str) -> str:
+    """
+    Build the cache key for a text embedded by a given model.
+
+    The text is NFC-normalised and stripped of surrounding whitespace, which
+    does not change what the tokenizer sees, so trivially different copies
+    of the same chunk share an entry.
+
+    Parameters
+    ----------
+    model_name : str
+        Model identity (Hub name, local path, or pinned MLFlow URI), as in
+        ``EmbeddingClient.model_version``.
+    text : str
+        Text to embed.
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest of the model identity and normalised text.
+    """
+    normalized = unicodedata.normalize("NFC", text).strip()
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalized.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache backed by SQLite with size-bounded LRU eviction.
+
+    Vectors are stored as float32 blobs keyed by ``cache_key``. Each lookup
+    refreshes the entry's last-used time; once the cache holds more than
+    ``max_entries`` vectors, the least recently used ones are evicted. The
+    cache is safe to share between threads.
+
+    Parameters
+    ----------
+    path : str | Path
+        SQLite database file. Parent directories are created if needed.
+    max_entries : int
+        Maximum number of vectors kept on disk.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 100_000) -> None:
+        """
+        Open (or create) the cache database.
+
+        Parameters
+        ----------
+        path : str | Path
+            SQLite database file.
+        max_entries : int
+            Maximum number of vectors kept on disk.
+
+        Raises
+        ------
+        ValueError
+            If ``max_entries`` is not positive.
+        """
+        if max_entries < 1:
+            msg = f"max_entries must be positive, got {max_entries}"
+            raise ValueError(msg)
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.execute(_LAST_USED_INDEX)
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached vectors.
+
+        Returns
+        -------
+        int
+            Number of entries.
+        """
+        with self._lock:
+            (count,) = self._conn.execute("SELECT count(*) FROM embeddings").fetchone()
+        return int(count)
+
+    def get_many(self, keys: list[str]) -> dict[str, NDArray[np.float32]]:
+        """
+        Look up vectors and mark the found entries as recently used.
+
+        Parameters
+        ----------
+        keys : list[str]
+            Cache keys to look up.
+
+        Returns
+        -------
+        dict[str, NDArray[np.float32]]
+            Vectors for the keys that are cached; missing keys are omitted.
+        """
+        found: dict[str, NDArray[np.float32]] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock, self._conn:
+            now = time.time_ns()
+            for start in range(0, len(unique), _MAX_PARAMS):
+                chunk = unique[start : start + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=_DTYPE).astype(np.float32)
+                self._conn.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE key IN ({placeholders})",
+                    [now, *chunk],
+                )
+        return found
+
+    def put_many(self, items: dict[str, NDArray[np.float32]]) -> None:
+        """
+        Store vectors, then evict least recently used entries over the limit.
+
+        Parameters
+        ----------
+        items : dict[str, NDArray[np.float32]]
+            Vectors keyed by cache key.
+        """
+        if not items:
+            return
+        with self._lock, self._conn:
+            now = time.time_ns()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, np.asarray(vec, dtype=_DTYPE).tobytes(), now) for key, vec in items.items()],
+            )
+            (count,) = self._conn.execute("SELECT count(*) FROM embeddings").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,59 @@
+"""Cross-encoder client wrapping sentence-transformers."""
+
+import numpy as np
+from numpy.typing import NDArray
+from sentence_transformers import CrossEncoder
+
+
+class CrossEncoderClient:
+    """
+    Client scoring query/passage pairs with a sentence-transformers cross-encoder.
+
+    Unlike a bi-encoder, a cross-encoder reads the query and the passage
+    together, which ranks more accurately but costs one forward pass per
+    pair, so it is used to rerank a short candidate list.
+
+    Parameters
+    ----------
+    model_name : str
+        Name of the cross-encoder model to load, or a local path.
+    """
+
+    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L6-v2") -> None:
+        """
+        Initialize the cross-encoder client.
+
+        Parameters
+        ----------
+        model_name : str
+            Hugging Face model name or local path.
+        """
+        self._model = CrossEncoder(model_name)
+        self.model_name = model_name
+
+    def score(self, query: str, passages: list[str], batch_size: int = 32) -> NDArray[np.float32]:
+        """
+        Score passages against a query.
+
+        Parameters
+        ----------
+        query : str
+            Query text.
+        passages : list[str]
+            Passages to score.
+        batch_size : int
+            Number of pairs per forward pass.
+
+        Returns
+        -------
+        NDArray[np.float32]
+            One relevance score per passage; higher is more relevant.
+        """
+        if not passages:
+            return np.empty(0, dtype=np.float32)
+        scores = self._model.predict(
+            [(query, passage) for passage in passages],
+            batch_size=batch_size,
+            show_progress_bar=False,
+        )
+        return np.asarray(scores, dtype=np.float32).reshape(len(passages))
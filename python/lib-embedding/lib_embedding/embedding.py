@@ -1,10 +1,54 @@
 """Embedding client wrapping sentence-transformers."""
 
+import numpy as np
+from numpy.typing import NDArray
 from sentence_transformers import SentenceTransformer
 
+from lib_embedding.cache import EmbeddingCache, cache_key
+
 _MLFLOW_URI_PREFIX = "models:/"
 
 
+def _resolve_model_uri(model_name_or_uri: str) -> str:
+    """
+    Pin an MLFlow alias URI to the model version it currently points to.
+
+    ``models:/<name>@<alias>`` becomes ``models:/<name>/<version>``, so the
+    loaded weights and the name recorded with their embeddings stay the
+    same when the alias is moved. Other inputs are returned unchanged.
+
+    Parameters
+    ----------
+    model_name_or_uri : str
+        Hugging Face model name, local path, or MLFlow registered-model URI.
+
+    Returns
+    -------
+    str
+        The input, with an alias replaced by its version number.
+
+    Raises
+    ------
+    ImportError
+        If an alias URI is given but the ``mlflow`` package is not installed.
+    """
+    if not model_name_or_uri.startswith(_MLFLOW_URI_PREFIX):
+        return model_name_or_uri
+    name, sep, alias = model_name_or_uri.removeprefix(_MLFLOW_URI_PREFIX).partition("@")
+    if not sep:
+        return model_name_or_uri
+    try:
+        from mlflow import MlflowClient
+    except ImportError as exc:  # pragma: no cover - guard for missing optional dep
+        msg = (
+            f"mlflow is required to resolve '{model_name_or_uri}'. "
+            "Install the optional extra: `pip install lib-embedding[mlflow]`."
+        )
+        raise ImportError(msg) from exc
+    version = MlflowClient().get_model_version_by_alias(name, alias).version
+    return f"{_MLFLOW_URI_PREFIX}{name}/{version}"
+
+
 def _load_sentence_transformer(model_name_or_uri: str) -> SentenceTransformer:
     """
     Load a ``SentenceTransformer`` from a Hub name, local path, or MLFlow URI.
@@ -51,9 +95,25 @@ class EmbeddingClient:
         Name of the sentence-transformers model to load, a local path, or an
         MLFlow registered-model URI of the form ``models:/<name>@<alias>`` or
         ``models:/<name>/<version>``.
+    cache : EmbeddingCache | None
+        Optional persistent cache. Texts already embedded by the same model
+        version are served from it instead of running inference.
+
+    Attributes
+    ----------
+    model_version : str
+        Identifier of the loaded weights: ``model_name``, with an MLFlow
+        alias resolved to the version it pointed to at load time. Record it
+        with stored embeddings rather than ``model_name``.
+    cache_hits : int
+        Number of texts served from the cache.
+    cache_misses : int
+        Number of texts that required inference while a cache was set.
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2") -> None:
+    def __init__(
+        self, model_name: str = "all-MiniLM-L6-v2", cache: EmbeddingCache | None = None
+    ) -> None:
         """
         Initialize the embedding client.
 
@@ -62,12 +122,22 @@ class EmbeddingClient:
         model_name : str
             Hugging Face model name, local path, or MLFlow URI
             (``models:/<name>@<alias>``).
+        cache : EmbeddingCache | None
+            Optional persistent embedding cache.
         """
-        self._model = _load_sentence_transformer(model_name)
+        self.model_version = _resolve_model_uri(model_name)
+        self._model = _load_sentence_transformer(self.model_version)
+        self.model_name = model_name
+        self.cache = cache
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def encode(self, texts: list[str], batch_size: int = 32) -> list[list[float]]:
         """
-        Encode texts into embedding vectors.
+        Encode texts into embedding vectors as Python lists.
+
+        Prefer ``encode_array`` on hot paths; this wrapper converts its
+        result to nested lists for callers that need plain Python values.
 
         Parameters
         ----------
@@ -83,8 +153,84 @@ class EmbeddingClient:
         """
         if not texts:
             return []
+        return self.encode_array(texts, batch_size).tolist()  # type: ignore[no-any-return]
+
+    def encode_array(
+        self,
+        texts: list[str],
+        batch_size: int = 32,
+        out: NDArray[np.float32] | None = None,
+    ) -> NDArray[np.float32]:
+        """
+        Encode texts into a contiguous float32 matrix.
+
+        When a cache is set, only texts missing from it are sent to the
+        model, and their vectors are added to the cache.
+
+        Parameters
+        ----------
+        texts : list[str]
+            List of texts to encode.
+        batch_size : int
+            Batch size for encoding.
+        out : NDArray[np.float32] | None
+            Optional preallocated C-contiguous float32 buffer of shape
+            ``(len(texts), dimension)`` to write the vectors into.
+
+        Returns
+        -------
+        NDArray[np.float32]
+            Matrix of shape ``(len(texts), dimension)``; ``out`` if given.
+
+        Raises
+        ------
+        ValueError
+            If ``out`` has the wrong shape, dtype or memory layout.
+        """
+        shape = (len(texts), self.dimension)
+        if out is None:
+            out = np.empty(shape, dtype=np.float32)
+        elif out.shape != shape or out.dtype != np.float32 or not out.flags.c_contiguous:
+            msg = f"out must be a C-contiguous float32 array of shape {shape}"
+            raise ValueError(msg)
+        if not texts:
+            return out
+        if self.cache is None:
+            out[:] = self._encode(texts, batch_size)
+            return out
+
+        keys = [cache_key(self.model_version, text) for text in texts]
+        cached = self.cache.get_many(keys)
+        hits = sum(key in cached for key in keys)
+        self.cache_hits += hits
+        self.cache_misses += len(keys) - hits
+        missing = {key: text for key, text in zip(keys, texts, strict=True) if key not in cached}
+        if missing:
+            computed = self._encode(list(missing.values()), batch_size)
+            self.cache.put_many(dict(zip(missing, computed, strict=True)))
+            cached.update(zip(missing, computed, strict=True))
+        for row, key in enumerate(keys):
+            out[row] = cached[key]
+        return out
+
+    def _encode(self, texts: list[str], batch_size: int) -> NDArray[np.float32]:
+        """
+        Run model inference on texts.
+
+        Parameters
+        ----------
+        texts : list[str]
+            Non-empty list of texts to encode.
+        batch_size : int
+            Batch size for encoding.
+
+        Returns
+        -------
+        NDArray[np.float32]
+            Matrix of embedding vectors, one row per text.
+        """
         embeddings = self._model.encode(texts, batch_size=batch_size)
-        return [vec.tolist() for vec in embeddings]
+        return np.asarray(embeddings, dtype=np.float32)
 
     @property
     def dimension(self) -> int:
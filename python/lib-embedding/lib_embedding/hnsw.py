@@ -0,0 +1,567 @@
+"""In-process HNSW graph over unit vectors, persisted as memory-mappable arrays."""
+
+import heapq
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Bumped whenever the on-disk layout changes; older artifacts are rejected.
+FORMAT_VERSION = 1
+
+_MANIFEST = "manifest.json"
+_CURRENT = "CURRENT"
+_VECTORS = "vectors.npy"
+_LAYER0 = "layer0.npy"
+_IDS = "ids.npy"
+
+Links = Callable[[int], list[int]]
+
+
+def _normalize(vectors: NDArray[np.float32]) -> NDArray[np.float32]:
+    """
+    Scale vectors to unit length so dot products are cosine similarities.
+
+    Parameters
+    ----------
+    vectors : NDArray[np.float32]
+        Vectors along the last axis; zero vectors are left as is.
+
+    Returns
+    -------
+    NDArray[np.float32]
+        Contiguous unit-length float32 vectors.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    normalized: NDArray[np.float32] = np.divide(
+        vectors, norms, out=np.zeros_like(vectors), where=norms > 0
+    )
+    return normalized
+
+
+class HnswIndex:
+    """
+    Hierarchical navigable small world graph for cosine nearest neighbours.
+
+    Nodes are the rows of a unit-normalised float32 matrix. Layer 0 links
+    every node to at most ``2 * m`` neighbours and is stored as one
+    fixed-width ``int32`` array padded with ``-1``; each upper layer stores
+    the sorted IDs of its nodes and their links, at most ``m`` per node.
+    All arrays are plain ``.npy`` files, so a saved index can be opened with
+    ``mmap_mode="r"``: loading is zero-copy and processes mapping the same
+    files share the page cache.
+
+    Parameters
+    ----------
+    vectors : NDArray[np.float32]
+        Unit-normalised vectors, one row per node.
+    layer0 : NDArray[np.int32]
+        Layer 0 links, shape ``(n, 2 * m)``, padded with ``-1``.
+    upper : list[tuple[NDArray[np.int32], NDArray[np.int32]]]
+        Sorted node IDs and links, shape ``(nodes, m)``, of layers 1 and up.
+    entry_point : int
+        Node the search starts from, on the top layer.
+    m : int
+        Maximum number of links per node on the upper layers.
+    """
+
+    def __init__(
+        self,
+        vectors: NDArray[np.float32],
+        layer0: NDArray[np.int32],
+        upper: list[tuple[NDArray[np.int32], NDArray[np.int32]]],
+        entry_point: int,
+        m: int,
+    ) -> None:
+        """
+        Initialize an index from its arrays.
+
+        Parameters
+        ----------
+        vectors : NDArray[np.float32]
+            Unit-normalised vectors, one row per node.
+        layer0 : NDArray[np.int32]
+            Layer 0 links, padded with ``-1``.
+        upper : list[tuple[NDArray[np.int32], NDArray[np.int32]]]
+            Sorted node IDs and links of layers 1 and up.
+        entry_point : int
+            Node the search starts from.
+        m : int
+            Maximum number of links per node on the upper layers.
+        """
+        self.vectors = vectors
+        self.layer0 = layer0
+        self.upper = upper
+        self.entry_point = entry_point
+        self.m = m
+
+    def __len__(self) -> int:
+        """
+        Return the number of nodes.
+
+        Returns
+        -------
+        int
+            Number of indexed vectors.
+        """
+        return len(self.vectors)
+
+    @property
+    def dimension(self) -> int:
+        """
+        Return the vector dimension.
+
+        Returns
+        -------
+        int
+            Number of components per vector.
+        """
+        return int(self.vectors.shape[1])
+
+    @classmethod
+    def build(
+        cls,
+        vectors: NDArray[np.float32],
+        m: int = 16,
+        ef_construction: int = 100,
+    ) -> "HnswIndex":
+        """
+        Build an index with faiss and export its graph.
+
+        The graph is built by ``faiss.IndexHNSWFlat`` over inner products
+        of the normalised vectors, which is native code and parallel, then
+        its link lists are copied into this class's arrays; faiss already
+        allows ``2 * m`` links on layer 0 and ``m`` above, and pads with
+        ``-1``. Searches run on the exported arrays, so faiss is only
+        needed to build.
+
+        Parameters
+        ----------
+        vectors : NDArray[np.float32]
+            Vectors to index, one row per node; normalised on the way in.
+        m : int
+            Maximum number of links per node on the upper layers; layer 0
+            allows twice as many.
+        ef_construction : int
+            Candidate list size while inserting.
+
+        Returns
+        -------
+        HnswIndex
+            The built index.
+
+        Raises
+        ------
+        ValueError
+            If ``vectors`` is not a 2-D matrix or ``m`` is below 2.
+        ImportError
+            If the ``faiss`` package is not installed.
+        """
+        if m < 2:
+            msg = f"m must be at least 2, got {m}"
+            raise ValueError(msg)
+        data = _normalize(vectors)
+        if data.ndim != 2:
+            msg = f"expected a 2-D matrix of vectors, got shape {data.shape}"
+            raise ValueError(msg)
+        if len(data) == 0:
+            return cls(data, np.full((0, 2 * m), -1, dtype=np.int32), [], -1, m)
+        try:
+            import faiss
+        except ImportError as exc:  # pragma: no cover - guard for missing optional dep
+            msg = (
+                "faiss is required to build an HNSW index. "
+                "Install the optional extra: `pip install lib-embedding[faiss]`."
+            )
+            raise ImportError(msg) from exc
+
+        built = faiss.IndexHNSWFlat(data.shape[1], m, faiss.METRIC_INNER_PRODUCT)
+        built.hnsw.efConstruction = ef_construction
+        built.add(data)
+        hnsw = built.hnsw
+        # Node i's links on layer l are neighbors[offsets[i] + cum[l] : offsets[i] + cum[l + 1]]
+        # and it has levels[i] layers, so upper layer l holds the nodes with levels > l.
+        # faiss's generated type hints omit the SWIG vector attributes
+        neighbors_vec = hnsw.neighbors  # type: ignore[attr-defined, unused-ignore]
+        offsets_vec = hnsw.offsets  # type: ignore[attr-defined, unused-ignore]
+        neighbors = faiss.vector_to_array(neighbors_vec).astype(np.int32)
+        offsets = faiss.vector_to_array(offsets_vec)[:-1].astype(np.int64)
+        levels = faiss.vector_to_array(hnsw.levels)
+        cum = faiss.vector_to_array(hnsw.cum_nneighbor_per_level).astype(np.int64)
+
+        def links(nodes: NDArray[np.int64], layer: int) -> NDArray[np.int32]:
+            columns = np.arange(cum[layer], cum[layer + 1])
+            return np.ascontiguousarray(neighbors[offsets[nodes][:, None] + columns])
+
+        layer0 = links(np.arange(len(data)), 0)
+        upper = []
+        for layer in range(1, int(levels.max())):
+            nodes = np.flatnonzero(levels > layer)
+            upper.append((nodes.astype(np.int32), links(nodes, layer)))
+        return cls(data, layer0, upper, int(hnsw.entry_point), m)
+
+    def _links(self, layer: int) -> Links:
+        """
+        Return the neighbour lookup of a layer.
+
+        Parameters
+        ----------
+        layer : int
+            Layer number, 0 for the bottom layer.
+
+        Returns
+        -------
+        Links
+            Function mapping a node to its neighbours on that layer.
+        """
+        if layer == 0:
+            layer0 = self.layer0
+            return lambda node: [x for x in layer0[node].tolist() if x >= 0]
+        nodes, table = self.upper[layer - 1]
+
+        def links(node: int) -> list[int]:
+            row = int(np.searchsorted(nodes, node))
+            return [x for x in table[row].tolist() if x >= 0]
+
+        return links
+
+    def search(
+        self, query: NDArray[np.float32], k: int, ef: int = 64
+    ) -> tuple[NDArray[np.int64], NDArray[np.float32]]:
+        """
+        Return the approximate nearest nodes to a query vector.
+
+        Parameters
+        ----------
+        query : NDArray[np.float32]
+            Query vector; normalised on the way in.
+        k : int
+            Number of nodes to return.
+        ef : int
+            Candidate list size on layer 0, raised to at least ``k``; larger
+            values trade latency for recall.
+
+        Returns
+        -------
+        tuple[NDArray[np.int64], NDArray[np.float32]]
+            Node IDs and cosine similarities, most similar first.
+        """
+        if len(self) == 0 or k < 1:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        q = _normalize(query.reshape(-1))
+        nearest = self.entry_point
+        for layer in range(len(self.upper), 0, -1):
+            nearest = _search_layer(self.vectors, q, [nearest], 1, self._links(layer))[0][1]
+        found = _search_layer(self.vectors, q, [nearest], max(ef, k), self._links(0))[:k]
+        nodes = np.array([node for _distance, node in found], dtype=np.int64)
+        similarities = np.array([1.0 - distance for distance, _node in found], dtype=np.float32)
+        return nodes, similarities
+
+    def save(self, directory: str | Path, metadata: dict[str, Any] | None = None) -> None:
+        """
+        Write the index arrays and a manifest to a directory.
+
+        Parameters
+        ----------
+        directory : str | Path
+            Existing directory to write into.
+        metadata : dict[str, Any] | None
+            JSON-serialisable details stored in the manifest.
+        """
+        directory = Path(directory)
+        np.save(directory / _VECTORS, self.vectors)
+        np.save(directory / _LAYER0, self.layer0)
+        for layer, (nodes, table) in enumerate(self.upper, start=1):
+            np.save(directory / f"layer{layer}_nodes.npy", nodes)
+            np.save(directory / f"layer{layer}_links.npy", table)
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "count": len(self),
+            "dimension": self.dimension,
+            "m": self.m,
+            "layers": len(self.upper) + 1,
+            "entry_point": self.entry_point,
+            "metadata": metadata or {},
+        }
+        (directory / _MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "HnswIndex":
+        """
+        Open an index written by ``save``.
+
+        Parameters
+        ----------
+        directory : str | Path
+            Directory holding the index.
+        mmap : bool
+            Map the arrays read-only instead of reading them into memory.
+
+        Returns
+        -------
+        HnswIndex
+            The index, backed by the files when ``mmap`` is set.
+        """
+        directory = Path(directory)
+        manifest = read_manifest(directory)
+        mode: Any = "r" if mmap else None
+        upper = [
+            (
+                np.load(directory / f"layer{layer}_nodes.npy", mmap_mode=mode),
+                np.load(directory / f"layer{layer}_links.npy", mmap_mode=mode),
+            )
+            for layer in range(1, manifest["layers"])
+        ]
+        return cls(
+            np.load(directory / _VECTORS, mmap_mode=mode),
+            np.load(directory / _LAYER0, mmap_mode=mode),
+            upper,
+            manifest["entry_point"],
+            manifest["m"],
+        )
+
+
+def _search_layer(
+    data: NDArray[np.float32],
+    query: NDArray[np.float32],
+    entry_points: list[int],
+    ef: int,
+    links: Links,
+) -> list[tuple[float, int]]:
+    """
+    Beam search for the nearest nodes on one layer.
+
+    Parameters
+    ----------
+    data : NDArray[np.float32]
+        Unit-normalised vectors.
+    query : NDArray[np.float32]
+        Unit-normalised query vector.
+    entry_points : list[int]
+        Nodes the search starts from.
+    ef : int
+        Number of nearest nodes kept.
+    links : Links
+        Neighbour lookup of the layer.
+
+    Returns
+    -------
+    list[tuple[float, int]]
+        Up to ``ef`` pairs of cosine distance and node, nearest first.
+    """
+    visited = set(entry_points)
+    distances = (1.0 - data[entry_points] @ query).tolist()
+    candidates = list(zip(distances, entry_points, strict=True))
+    heapq.heapify(candidates)
+    nearest = [(-distance, node) for distance, node in candidates]
+    heapq.heapify(nearest)
+    while candidates:
+        distance, node = heapq.heappop(candidates)
+        if distance > -nearest[0][0]:
+            break
+        fresh = [x for x in links(node) if x not in visited]
+        if not fresh:
+            continue
+        visited.update(fresh)
+        for d, neighbour in zip((1.0 - data[fresh] @ query).tolist(), fresh, strict=True):
+            if len(nearest) < ef or d < -nearest[0][0]:
+                heapq.heappush(candidates, (d, neighbour))
+                heapq.heappush(nearest, (-d, neighbour))
+                if len(nearest) > ef:
+                    heapq.heappop(nearest)
+    return sorted((-d, node) for d, node in nearest)
+
+
+def read_manifest(directory: str | Path) -> dict[str, Any]:
+    """
+    Read and check the manifest of a saved index.
+
+    Parameters
+    ----------
+    directory : str | Path
+        Directory holding the index.
+
+    Returns
+    -------
+    dict[str, Any]
+        The manifest.
+
+    Raises
+    ------
+    ValueError
+        If the index was written in another format version.
+    """
+    manifest: dict[str, Any] = json.loads((Path(directory) / _MANIFEST).read_text(encoding="utf-8"))
+    if manifest.get("format_version") != FORMAT_VERSION:
+        msg = (
+            f"unsupported HNSW format version {manifest.get('format_version')} "
+            f"(expected {FORMAT_VERSION})"
+        )
+        raise ValueError(msg)
+    return manifest
+
+
+class HnswArtifact(NamedTuple):
+    """
+    A published index with the chunk ID of every node.
+
+    Attributes
+    ----------
+    version : str
+        Name of the artifact version directory.
+    graph : HnswIndex
+        The graph.
+    ids : NDArray[np.uint8]
+        Chunk UUIDs as 16 raw bytes per node, shape ``(n, 16)``.
+    metadata : dict[str, Any]
+        Details recorded when the artifact was published.
+    """
+
+    version: str
+    graph: HnswIndex
+    ids: NDArray[np.uint8]
+    metadata: dict[str, Any]
+
+    def chunk_id(self, node: int) -> uuid.UUID:
+        """
+        Return the chunk ID of a node.
+
+        Parameters
+        ----------
+        node : int
+            Node ID.
+
+        Returns
+        -------
+        uuid.UUID
+            Chunk ID.
+        """
+        return uuid.UUID(bytes=self.ids[node].tobytes())
+
+
+def publish_artifact(
+    root: str | Path,
+    version: str,
+    index: HnswIndex,
+    ids: Sequence[uuid.UUID],
+    metadata: dict[str, Any] | None = None,
+    keep: int = 2,
+) -> Path:
+    """
+    Write an index as a new artifact version and make it current.
+
+    The version is written to a temporary directory and renamed into
+    place, then the ``CURRENT`` pointer file is replaced atomically, so
+    readers never see a partial artifact. Only the newest ``keep`` versions
+    are retained; processes still mapping a removed version keep reading
+    it until they reopen.
+
+    Parameters
+    ----------
+    root : str | Path
+        Directory holding the artifact versions.
+    version : str
+        Name of the new version directory.
+    index : HnswIndex
+        The graph.
+    ids : Sequence[uuid.UUID]
+        Chunk ID of every node, in node order.
+    metadata : dict[str, Any] | None
+        JSON-serialisable details stored in the manifest.
+    keep : int
+        Number of versions retained, including the new one.
+
+    Returns
+    -------
+    Path
+        Directory of the new version.
+
+    Raises
+    ------
+    ValueError
+        If ``ids`` does not have one entry per node.
+    """
+    if len(ids) != len(index):
+        msg = f"expected {len(index)} chunk IDs, got {len(ids)}"
+        raise ValueError(msg)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=root))
+    try:
+        index.save(staging, metadata)
+        id_bytes = np.frombuffer(b"".join(i.bytes for i in ids), dtype=np.uint8)
+        np.save(staging / _IDS, id_bytes.reshape(len(ids), 16))
+        target = root / version
+        if target.exists():
+            shutil.rmtree(target)
+        staging.rename(target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    pointer = root / f".{_CURRENT}.tmp"
+    pointer.write_text(version, encoding="utf-8")
+    os.replace(pointer, root / _CURRENT)
+
+    versions = sorted(
+        (p for p in root.iterdir() if p.is_dir() and not p.name.startswith(".")),
+        key=lambda p: p.stat().st_mtime,
+    )
+    for stale in versions[:-keep]:
+        if stale != target:
+            shutil.rmtree(stale, ignore_errors=True)
+    return target
+
+
+def current_version(root: str | Path) -> str:
+    """
+    Read the name of the current artifact version from the pointer file.
+
+    Cheap enough to poll, so readers can tell whether a new version was
+    published without opening it.
+
+    Parameters
+    ----------
+    root : str | Path
+        Directory holding the artifact versions.
+
+    Returns
+    -------
+    str
+        Name of the current version directory.
+    """
+    return (Path(root) / _CURRENT).read_text(encoding="utf-8").strip()
+
+
+def open_artifact(root: str | Path, mmap: bool = True) -> HnswArtifact:
+    """
+    Open the current artifact version.
+
+    Parameters
+    ----------
+    root : str | Path
+        Directory holding the artifact versions.
+    mmap : bool
+        Map the arrays read-only instead of reading them into memory.
+
+    Returns
+    -------
+    HnswArtifact
+        The current version.
+    """
+    version = current_version(root)
+    directory = Path(root) / version
+    mode: Any = "r" if mmap else None
+    return HnswArtifact(
+        version=version,
+        graph=HnswIndex.load(directory, mmap=mmap),
+        ids=np.load(directory / _IDS, mmap_mode=mode),
+        metadata=read_manifest(directory)["metadata"],
+    )
@@ -0,0 +1,107 @@
+"""Tests for the persistent embedding cache."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from lib_embedding.cache import EmbeddingCache, cache_key
+
+
+def _vec(*values: float) -> NDArray[np.float32]:
+    """
+    Build a float32 vector.
+
+    Parameters
+    ----------
+    *values : float
+        Vector components.
+
+    Returns
+    -------
+    NDArray[np.float32]
+        The vector.
+    """
+    return np.array(values, dtype=np.float32)
+
+
+def test_cache_key_normalizes_text() -> None:
+    """Test that keys ignore surrounding whitespace and Unicode composition."""
+    assert cache_key("m", "  café\n") == cache_key("m", "café")
+    assert cache_key("m", "hello") != cache_key("m", "Hello")
+
+
+def test_cache_key_includes_model() -> None:
+    """Test that the same text embedded by different models has different keys."""
+    assert cache_key("model-a", "hello") != cache_key("model-b", "hello")
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    """
+    Test that stored vectors are returned and missing keys are omitted.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+    cache.put_many({"a": _vec(0.5, -1.0), "b": _vec(2.0, 0.25)})
+
+    found = cache.get_many(["a", "missing", "b", "a"])
+
+    assert set(found) == {"a", "b"}
+    np.testing.assert_array_equal(found["a"], _vec(0.5, -1.0))
+    np.testing.assert_array_equal(found["b"], _vec(2.0, 0.25))
+    assert found["a"].dtype == np.float32
+    assert len(cache) == 2
+
+
+def test_persists_across_instances(tmp_path: Path) -> None:
+    """
+    Test that entries survive reopening the cache file.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    path = tmp_path / "nested" / "cache.sqlite"
+    first = EmbeddingCache(path)
+    first.put_many({"a": _vec(1.0)})
+    first.close()
+
+    np.testing.assert_array_equal(EmbeddingCache(path).get_many(["a"])["a"], _vec(1.0))
+
+
+def test_evicts_least_recently_used(tmp_path: Path) -> None:
+    """
+    Test that the least recently used entries are evicted over the limit.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    cache = EmbeddingCache(tmp_path / "cache.sqlite", max_entries=2)
+    cache.put_many({"a": _vec(1.0)})
+    cache.put_many({"b": _vec(2.0)})
+    cache.get_many(["a"])
+    cache.put_many({"c": _vec(3.0)})
+
+    assert len(cache) == 2
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_invalid_max_entries(tmp_path: Path) -> None:
+    """
+    Test that a non-positive size limit is rejected.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    with pytest.raises(ValueError, match="max_entries must be positive"):
+        EmbeddingCache(tmp_path / "cache.sqlite", max_entries=0)
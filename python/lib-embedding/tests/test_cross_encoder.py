@@ -0,0 +1,46 @@
+"""Tests for the cross-encoder client."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from lib_embedding.cross_encoder import CrossEncoderClient
+
+
+def test_score_pairs_query_with_each_passage(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that each passage is scored paired with the query.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.MonkeyPatch
+        Pytest monkeypatch fixture.
+    """
+    model = MagicMock()
+    model.predict.side_effect = lambda pairs, **_: [float(len(p)) for _, p in pairs]
+    monkeypatch.setattr("lib_embedding.cross_encoder.CrossEncoder", lambda _name: model)
+
+    scores = CrossEncoderClient("fake-model").score("q", ["a", "bbb"], batch_size=8)
+
+    assert scores.dtype == np.float32
+    assert scores.tolist() == [1.0, 3.0]
+    pairs = model.predict.call_args.args[0]
+    assert pairs == [("q", "a"), ("q", "bbb")]
+    assert model.predict.call_args.kwargs["batch_size"] == 8
+
+
+def test_score_no_passages(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that scoring nothing skips the model.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.MonkeyPatch
+        Pytest monkeypatch fixture.
+    """
+    model = MagicMock()
+    monkeypatch.setattr("lib_embedding.cross_encoder.CrossEncoder", lambda _name: model)
+
+    assert CrossEncoderClient("fake-model").score("q", []).shape == (0,)
+    model.predict.assert_not_called()
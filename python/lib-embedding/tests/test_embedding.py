@@ -2,11 +2,18 @@
 
 import sys
 import types
+from pathlib import Path
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 
-from lib_embedding.embedding import EmbeddingClient, _load_sentence_transformer
+from lib_embedding.cache import EmbeddingCache
+from lib_embedding.embedding import (
+    EmbeddingClient,
+    _load_sentence_transformer,
+    _resolve_model_uri,
+)
 
 DIMENSION = 384
 
@@ -67,6 +74,55 @@ def test_encode_batch(client: EmbeddingClient) -> None:
     assert all(len(vec) == DIMENSION for vec in result)
 
 
+def test_encode_array(client: EmbeddingClient) -> None:
+    """
+    Test that encode_array returns a contiguous float32 matrix matching encode.
+
+    Parameters
+    ----------
+    client : EmbeddingClient
+        The embedding client fixture.
+    """
+    texts = ["hello", "world"]
+    result = client.encode_array(texts)
+    assert result.shape == (2, DIMENSION)
+    assert result.dtype == np.float32
+    assert result.flags.c_contiguous
+    np.testing.assert_allclose(result, np.array(client.encode(texts), dtype=np.float32))
+
+
+def test_encode_array_into_buffer(client: EmbeddingClient) -> None:
+    """
+    Test that encode_array writes into a preallocated buffer.
+
+    Parameters
+    ----------
+    client : EmbeddingClient
+        The embedding client fixture.
+    """
+    buffer = np.zeros((4, DIMENSION), dtype=np.float32)
+    result = client.encode_array(["a", "b"], out=buffer[1:3])
+    assert np.shares_memory(result, buffer)
+    assert buffer[1:3].any(axis=1).all()
+    assert not buffer[0].any()
+    assert client.encode_array([]).shape == (0, DIMENSION)
+
+
+def test_encode_array_rejects_bad_buffer(client: EmbeddingClient) -> None:
+    """
+    Test that a buffer with the wrong shape or dtype is rejected.
+
+    Parameters
+    ----------
+    client : EmbeddingClient
+        The embedding client fixture.
+    """
+    with pytest.raises(ValueError, match="float32 array of shape"):
+        client.encode_array(["a"], out=np.zeros((2, DIMENSION), dtype=np.float32))
+    with pytest.raises(ValueError, match="float32 array of shape"):
+        client.encode_array(["a"], out=np.zeros((1, DIMENSION), dtype=np.float64))
+
+
 def test_dimension(client: EmbeddingClient) -> None:
     """
     Test dimension property matches encode output.
@@ -79,6 +135,66 @@ def test_dimension(client: EmbeddingClient) -> None:
     assert client.dimension == DIMENSION
 
 
+def test_encode_uses_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """
+    Test that cached texts skip inference and hits/misses are counted.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.MonkeyPatch
+        Pytest monkeypatch fixture.
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    model = MagicMock()
+    model.get_sentence_embedding_dimension.return_value = 2
+    model.encode.side_effect = lambda texts, batch_size: np.array(
+        [[float(len(t)), 1.0] for t in texts], dtype=np.float32
+    )
+    monkeypatch.setattr("lib_embedding.embedding.SentenceTransformer", lambda _name: model)
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+
+    client = EmbeddingClient("fake-model", cache=cache)
+    first = client.encode(["a", "bb", "a"])
+    second = client.encode(["bb", "ccc"])
+
+    assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert second == [[2.0, 1.0], [3.0, 1.0]]
+    assert [call.args[0] for call in model.encode.call_args_list] == [["a", "bb"], ["ccc"]]
+    assert client.cache_hits == 1
+    assert client.cache_misses == 4
+    assert len(cache) == 3
+
+
+def test_cache_keyed_on_model_version(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """
+    Test that moving an MLFlow alias to another version misses the cache.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.MonkeyPatch
+        Pytest monkeypatch fixture.
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    model = MagicMock()
+    model.get_sentence_embedding_dimension.return_value = 2
+    model.encode.side_effect = lambda texts, batch_size: np.ones((len(texts), 2), np.float32)
+    monkeypatch.setattr("lib_embedding.embedding._load_sentence_transformer", lambda _uri: model)
+    versions = iter(["models:/rag-embedder/1", "models:/rag-embedder/2"])
+    monkeypatch.setattr("lib_embedding.embedding._resolve_model_uri", lambda _uri: next(versions))
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+
+    first = EmbeddingClient("models:/rag-embedder@champion", cache=cache)
+    first.encode(["a"])
+    second = EmbeddingClient("models:/rag-embedder@champion", cache=cache)
+    second.encode(["a"])
+
+    assert second.model_version == "models:/rag-embedder/2"
+    assert second.cache_misses == 1
+    assert len(cache) == 2
+
+
 def test_load_hub_model_does_not_touch_mlflow(monkeypatch: pytest.MonkeyPatch) -> None:
     """
     Test that loading a Hub name routes through ``SentenceTransformer`` only.
@@ -215,3 +331,47 @@ def test_load_mlflow_uri_missing_mlflow_raises_import_error(
 
     with pytest.raises(ImportError, match="mlflow is required"):
         _load_sentence_transformer("models:/rag-embedder@candidate")
+
+
+def test_resolve_model_uri_pins_alias_to_version(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that an MLFlow alias URI is pinned to the version it points to.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.MonkeyPatch
+        Pytest monkeypatch fixture.
+    """
+    mlflow_client = MagicMock()
+    mlflow_client.get_model_version_by_alias.return_value = MagicMock(version="7")
+    fake_mlflow = types.ModuleType("mlflow")
+    fake_mlflow.MlflowClient = MagicMock(return_value=mlflow_client)  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "mlflow", fake_mlflow)
+
+    assert _resolve_model_uri("models:/rag-embedder@candidate") == "models:/rag-embedder/7"
+    mlflow_client.get_model_version_by_alias.assert_called_once_with("rag-embedder", "candidate")
+
+
+@pytest.mark.parametrize("name", ["all-MiniLM-L6-v2", "models:/rag-embedder/3"])
+def test_resolve_model_uri_keeps_pinned_names(name: str) -> None:
+    """
+    Test that names already identifying fixed weights are returned unchanged.
+
+    Parameters
+    ----------
+    name : str
+        Hub name or versioned MLFlow URI.
+    """
+    assert _resolve_model_uri(name) == name
+
+
+def test_client_model_version_defaults_to_name(client: EmbeddingClient) -> None:
+    """
+    Test that a Hub model's version is its name.
+
+    Parameters
+    ----------
+    client : EmbeddingClient
+        The embedding client fixture.
+    """
+    assert client.model_version == "all-MiniLM-L6-v2"
@@ -0,0 +1,174 @@
+"""Tests for the HNSW index and its on-disk artifact."""
+
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from lib_embedding.hnsw import HnswIndex, current_version, open_artifact, publish_artifact
+
+
+def _corpus(n: int = 500, dimension: int = 16) -> NDArray[np.float32]:
+    """
+    Build reproducible random vectors.
+
+    Parameters
+    ----------
+    n : int
+        Number of vectors.
+    dimension : int
+        Vector dimension.
+
+    Returns
+    -------
+    NDArray[np.float32]
+        The vectors.
+    """
+    return np.random.default_rng(7).standard_normal((n, dimension)).astype(np.float32)
+
+
+def _exact_top_k(
+    vectors: NDArray[np.float32], query: NDArray[np.float32], k: int
+) -> NDArray[np.intp]:
+    """
+    Rank vectors by exact cosine similarity.
+
+    Parameters
+    ----------
+    vectors : NDArray[np.float32]
+        Corpus vectors.
+    query : NDArray[np.float32]
+        Query vector.
+    k : int
+        Number of rows returned.
+
+    Returns
+    -------
+    NDArray[np.intp]
+        Rows of the ``k`` most similar vectors.
+    """
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.argsort(-(unit @ (query / np.linalg.norm(query))))[:k]
+
+
+def test_search_recall() -> None:
+    """Test that the graph finds nearly all exact nearest neighbours."""
+    vectors = _corpus()
+    index = HnswIndex.build(vectors, m=8, ef_construction=64)
+    queries = np.random.default_rng(8).standard_normal((20, 16)).astype(np.float32)
+
+    hits = 0
+    for query in queries:
+        nodes, similarities = index.search(query, k=10, ef=64)
+        assert np.all(np.diff(similarities) <= 1e-6)
+        hits += len(set(nodes.tolist()) & set(_exact_top_k(vectors, query, 10).tolist()))
+
+    assert hits / (10 * len(queries)) >= 0.95
+
+
+def test_search_recall_against_exact_at_embedding_dimension() -> None:
+    """Test recall against exact search on clustered vectors shaped like sentence embeddings."""
+    rng = np.random.default_rng(11)
+    centers = rng.standard_normal((50, 384)).astype(np.float32)
+    vectors = centers[rng.integers(0, 50, 2_000)] + 0.6 * rng.standard_normal((2_000, 384))
+    queries = centers[rng.integers(0, 50, 20)] + 0.6 * rng.standard_normal((20, 384))
+    index = HnswIndex.build(vectors.astype(np.float32), m=16, ef_construction=100)
+
+    hits = 0
+    for query in queries.astype(np.float32):
+        nodes, _similarities = index.search(query, k=10, ef=64)
+        hits += len(set(nodes.tolist()) & set(_exact_top_k(vectors, query, 10).tolist()))
+
+    assert hits / (10 * len(queries)) >= 0.95
+
+
+def test_search_finds_indexed_vector() -> None:
+    """Test that an indexed vector is its own nearest neighbour."""
+    vectors = _corpus(200)
+    index = HnswIndex.build(vectors, m=8)
+
+    nodes, similarities = index.search(vectors[42], k=1)
+
+    assert nodes.tolist() == [42]
+    assert similarities[0] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_links_respect_budget() -> None:
+    """Test that no node exceeds its link budget on any layer."""
+    index = HnswIndex.build(_corpus(300), m=4)
+
+    assert index.layer0.shape == (300, 8)
+    for _nodes, links in index.upper:
+        assert links.shape[1] == 4
+    assert np.all(index.layer0 < 300)
+
+
+def test_empty_index() -> None:
+    """Test that an empty index returns no results."""
+    index = HnswIndex.build(np.empty((0, 4), dtype=np.float32))
+
+    nodes, similarities = index.search(np.ones(4, dtype=np.float32), k=5)
+
+    assert len(index) == 0
+    assert nodes.size == 0
+    assert similarities.size == 0
+
+
+def test_build_rejects_small_m() -> None:
+    """Test that m below 2 is rejected."""
+    with pytest.raises(ValueError, match="m must be at least 2"):
+        HnswIndex.build(_corpus(10), m=1)
+
+
+def test_save_and_load_memory_mapped(tmp_path: Path) -> None:
+    """Test that a loaded index is memory-mapped and returns the same results."""
+    vectors = _corpus(300)
+    index = HnswIndex.build(vectors, m=8)
+    index.save(tmp_path, {"corpus_version": 3})
+
+    loaded = HnswIndex.load(tmp_path)
+
+    assert isinstance(loaded.vectors, np.memmap)
+    assert isinstance(loaded.layer0, np.memmap)
+    assert loaded.dimension == 16
+    for query in vectors[:5]:
+        expected, _ = index.search(query, k=5)
+        actual, _ = loaded.search(query, k=5)
+        assert actual.tolist() == expected.tolist()
+
+
+def test_publish_and_open_artifact(tmp_path: Path) -> None:
+    """Test that publishing makes a version current and prunes old versions."""
+    vectors = _corpus(50)
+    index = HnswIndex.build(vectors, m=4)
+    ids = [uuid.uuid4() for _ in range(50)]
+
+    for version in ("v1", "v2", "v3"):
+        publish_artifact(tmp_path, version, index, ids, {"corpus_version": version})
+
+    artifact = open_artifact(tmp_path)
+    assert current_version(tmp_path) == "v3"
+    assert artifact.version == "v3"
+    assert artifact.metadata == {"corpus_version": "v3"}
+    assert artifact.chunk_id(17) == ids[17]
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == ["v2", "v3"]
+
+
+def test_publish_rejects_mismatched_ids(tmp_path: Path) -> None:
+    """Test that every node needs a chunk ID."""
+    index = HnswIndex.build(_corpus(10), m=4)
+    with pytest.raises(ValueError, match="expected 10 chunk IDs"):
+        publish_artifact(tmp_path, "v1", index, [uuid.uuid4()])
+    assert not (tmp_path / "CURRENT").exists()
+
+
+def test_load_rejects_other_format_version(tmp_path: Path) -> None:
+    """Test that artifacts written in another format are rejected."""
+    HnswIndex.build(_corpus(10), m=4).save(tmp_path)
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(manifest.read_text().replace('"format_version": 1', '"format_version": 99'))
+
+    with pytest.raises(ValueError, match="unsupported HNSW format version 99"):
+        HnswIndex.load(tmp_path)
@@ -1,9 +1,18 @@
 """Tests for lib-embedding public API."""
 
-from lib_embedding import EmbeddingClient, EmbeddingSettings
+from lib_embedding import (
+    CrossEncoderClient,
+    EmbeddingCache,
+    EmbeddingClient,
+    EmbeddingSettings,
+    HnswIndex,
+)
 
 
 def test_exports() -> None:
     """Test that key classes are importable from the package root."""
+    assert CrossEncoderClient is not None
+    assert EmbeddingCache is not None
     assert EmbeddingClient is not None
     assert EmbeddingSettings is not None
+    assert HnswIndex is not None
@@ -2,6 +2,18 @@
 
 __version__ = "0.1.0"
 
-from lib_orm.db import get_async_engine, get_async_session, get_async_session_factory
-from lib_orm.models import Base, DocumentChunk
+from lib_orm.corpus import bump_corpus_version, get_corpus_version
+from lib_orm.db import (
+    dispose_engines,
+    get_async_engine,
+    get_async_session,
+    get_async_session_factory,
+    get_engine,
+)
+from lib_orm.indexes import (
+    EMBEDDING_INDEX_NAME,
+    embedding_index_ddl,
+    rebuild_embedding_index,
+)
+from lib_orm.models import Base, CorpusState, DocumentChunk, VectorIndexBuild
 from lib_orm.settings import DbSettings
@@ -1,25 +1,47 @@
 """Application module for lib-orm."""
 
 import asyncio
+import time
 
 from sqlalchemy import text
 
 from lib_orm.db import get_async_engine
+from lib_orm.fulltext import backfill_fulltext
+from lib_orm.indexes import rebuild_embedding_index_concurrently
+from lib_orm.reload import add_missing_columns, create_secondary_indexes
+from lib_orm.settings import DbSettings
 from lib_orm.task_inputs import task_inputs
 
 
 class App:
-    """Diagnostic tool for database and ORM library."""
+    """Diagnostic and maintenance tool for database and ORM library."""
 
     def run(self) -> None:
         """
-        Run diagnostics.
+        Run the selected command.
 
-        Verify DB connectivity and print connection status.
+        ``check`` verifies DB connectivity and prints connection status;
+        ``rebuild-index`` recreates the vector index concurrently with the
+        index settings from ``DbSettings``, so searches and writes continue;
+        ``backfill-fulltext`` adds and fills the ``content_tsv`` column and
+        its index on a database created without;
+        ``create-indexes`` adds the secondary indexes missing from an older
+        database; ``add-columns`` adds the columns it is missing.
         """
         db_url = task_inputs.db_url
         print(f"Database URL: {db_url}")
-        asyncio.run(self._check_db(db_url))
+        if task_inputs.command == "rebuild-index":
+            asyncio.run(
+                self._rebuild_index(DbSettings(db_url=db_url), task_inputs.maintenance_work_mem)
+            )
+        elif task_inputs.command == "backfill-fulltext":
+            asyncio.run(self._backfill_fulltext(db_url))
+        elif task_inputs.command == "create-indexes":
+            asyncio.run(self._create_indexes(db_url))
+        elif task_inputs.command == "add-columns":
+            asyncio.run(self._add_columns(db_url))
+        else:
+            asyncio.run(self._check_db(db_url))
 
     @staticmethod
     async def _check_db(url: str) -> None:
@@ -40,3 +62,80 @@ class App:
             print(f"DB connection: FAILED ({exc})")
         finally:
             await engine.dispose()
+
+    @staticmethod
+    async def _rebuild_index(settings: DbSettings, maintenance_work_mem: str) -> None:
+        """
+        Recreate the vector index without blocking the table and report progress.
+
+        Parameters
+        ----------
+        settings : DbSettings
+            Connection URL, index type and build parameters.
+        maintenance_work_mem : str
+            Memory for the build session.
+        """
+        print(f"Rebuilding {settings.index_type} index concurrently")
+        engine = get_async_engine(settings.db_url, settings)
+        try:
+            t0 = time.perf_counter()
+            parameters = await rebuild_embedding_index_concurrently(
+                engine, settings, "manual rebuild", maintenance_work_mem
+            )
+            print(f"Index rebuilt in {time.perf_counter() - t0:.1f}s with {parameters}")
+        finally:
+            await engine.dispose()
+
+    @staticmethod
+    async def _backfill_fulltext(url: str) -> None:
+        """
+        Add and fill the full-text search column and index.
+
+        Parameters
+        ----------
+        url : str
+            Database connection URL.
+        """
+        engine = get_async_engine(url)
+        try:
+            t0 = time.perf_counter()
+            filled = await backfill_fulltext(engine)
+            print(f"Full-text backfill: {filled} rows filled in {time.perf_counter() - t0:.1f}s")
+        finally:
+            await engine.dispose()
+
+    @staticmethod
+    async def _create_indexes(url: str) -> None:
+        """
+        Create the missing secondary indexes.
+
+        Parameters
+        ----------
+        url : str
+            Database connection URL.
+        """
+        engine = get_async_engine(url)
+        try:
+            t0 = time.perf_counter()
+            created = await create_secondary_indexes(engine)
+            names = ", ".join(created) or "none missing"
+            print(f"Secondary indexes: {names} ({time.perf_counter() - t0:.1f}s)")
+        finally:
+            await engine.dispose()
+
+    @staticmethod
+    async def _add_columns(url: str) -> None:
+        """
+        Add the missing columns of the chunks table.
+
+        Parameters
+        ----------
+        url : str
+            Database connection URL.
+        """
+        engine = get_async_engine(url)
+        try:
+            added = await add_missing_columns(engine)
+            print(f"Added columns: {', '.join(added) or 'none missing'}")
+        finally:
+            await engine.dispose()
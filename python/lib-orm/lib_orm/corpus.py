@@ -0,0 +1,58 @@
+"""Corpus version counter used to invalidate caches."""
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql import func
+
+from lib_orm.models import CorpusState
+
+
+async def bump_corpus_version(session: AsyncSession | AsyncConnection) -> int:
+    """
+    Increment the corpus version in the caller's transaction.
+
+    Creates the ``corpus_state`` row on first use. The new version becomes
+    visible to readers when the caller commits, together with its writes.
+
+    Parameters
+    ----------
+    session : AsyncSession | AsyncConnection
+        Session or connection in the transaction that wrote to
+        ``document_chunks``.
+
+    Returns
+    -------
+    int
+        The new corpus version.
+    """
+    stmt = (
+        insert(CorpusState)
+        .values(id=1, version=1)
+        .on_conflict_do_update(
+            index_elements=[CorpusState.id],
+            set_={"version": CorpusState.version + 1, "updated_at": func.now()},
+        )
+        .returning(CorpusState.version)
+    )
+    result = await session.execute(stmt)
+    return int(result.scalar_one())
+
+
+async def get_corpus_version(connection: AsyncConnection | AsyncSession) -> int:
+    """
+    Read the current corpus version.
+
+    Parameters
+    ----------
+    connection : AsyncConnection | AsyncSession
+        Connection or session to read with.
+
+    Returns
+    -------
+    int
+        The corpus version, or 0 if it has never been bumped.
+    """
+    result = await connection.execute(select(CorpusState.version).where(CorpusState.id == 1))
+    version = result.scalar_one_or_none()
+    return int(version) if version is not None else 0
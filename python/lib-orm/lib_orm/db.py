@@ -2,30 +2,116 @@
 
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from typing import Any
 
+from sqlalchemy import event, make_url
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
+from lib_orm.settings import DbSettings
+from lib_orm.vector import register_vector_codec
 
-def get_async_engine(url: str) -> AsyncEngine:
+# Process-wide engines keyed by connection URL.
+_engines: dict[str, AsyncEngine] = {}
+
+
+def engine_options(settings: DbSettings) -> dict[str, Any]:
+    """
+    Build ``create_async_engine`` keyword arguments from the pool settings.
+
+    Parameters
+    ----------
+    settings : DbSettings
+        Pool and connection settings.
+
+    Returns
+    -------
+    dict[str, Any]
+        Engine options. Statement cache size and connect timeout are passed
+        to the driver only for asyncpg URLs.
+    """
+    options: dict[str, Any] = {
+        "echo": False,
+        "pool_size": settings.pool_size,
+        "max_overflow": settings.max_overflow,
+        "pool_pre_ping": settings.pool_pre_ping,
+        "pool_recycle": settings.pool_recycle_s,
+    }
+    if make_url(settings.db_url).get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.statement_cache_size,
+            "timeout": settings.connect_timeout_s,
+        }
+    return options
+
+
+def get_async_engine(url: str, settings: DbSettings | None = None) -> AsyncEngine:
     """
     Create an async SQLAlchemy engine.
 
+    The caller owns the engine and must dispose of it. Prefer ``get_engine``
+    to share a warm pool across callers. On asyncpg, every new connection
+    gets pgvector's binary codec, so vectors are sent and received as
+    ``float4`` arrays rather than text.
+
     Parameters
     ----------
     url : str
         Database connection URL (e.g. ``postgresql+asyncpg://...``).
+    settings : DbSettings | None
+        Pool settings; defaults to ``DbSettings`` loaded from the environment.
 
     Returns
     -------
     AsyncEngine
         Configured async engine instance.
     """
-    return create_async_engine(url, echo=False, pool_size=5, max_overflow=10)
+    settings = (settings or DbSettings()).model_copy(update={"db_url": url})
+    engine = create_async_engine(url, **engine_options(settings))
+    if engine.dialect.driver == "asyncpg":
+        event.listen(engine.sync_engine, "connect", register_vector_codec)
+    return engine
+
+
+def get_engine(url: str, settings: DbSettings | None = None) -> AsyncEngine:
+    """
+    Return the process-wide engine for a URL, creating it on first use.
+
+    Every caller asking for the same URL shares one connection pool, so
+    connections stay warm instead of paying the TCP and authentication
+    handshake per use. ``settings`` only applies when the engine is created.
+    Pooled asyncpg connections belong to the event loop that opened them:
+    call ``dispose_engines`` before that loop closes.
+
+    Parameters
+    ----------
+    url : str
+        Database connection URL.
+    settings : DbSettings | None
+        Pool settings used if the engine does not exist yet.
+
+    Returns
+    -------
+    AsyncEngine
+        The shared engine.
+    """
+    engine = _engines.get(url)
+    if engine is None:
+        engine = _engines[url] = get_async_engine(url, settings)
+    return engine
+
+
+async def dispose_engines() -> None:
+    """Dispose of every shared engine and empty the registry."""
+    engines = list(_engines.values())
+    _engines.clear()
+    for engine in engines:
+        await engine.dispose()
 
 
 def get_async_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
@@ -48,7 +134,7 @@ def get_async_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSe
 @asynccontextmanager
 async def get_async_session(url: str) -> AsyncGenerator[AsyncSession]:
     """
-    Yield an async database session.
+    Yield an async database session from the shared engine for a URL.
 
     Parameters
     ----------
@@ -60,8 +146,7 @@ async def get_async_session(url: str) -> AsyncGenerator[AsyncSession]:
     AsyncSession
         An active async session that is committed on success and rolled back on error.
     """
-    engine = get_async_engine(url)
-    session_factory = get_async_session_factory(engine)
+    session_factory = get_async_session_factory(get_engine(url))
     async with session_factory() as session:
         try:
             yield session
@@ -69,5 +154,27 @@ async def get_async_session(url: str) -> AsyncGenerator[AsyncSession]:
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await engine.dispose()
+
+
+@asynccontextmanager
+async def read_only_connection(engine: AsyncEngine) -> AsyncGenerator[AsyncConnection]:
+    """
+    Yield a pooled connection in a read-only transaction.
+
+    A lightweight alternative to a session for read paths: no ORM unit of
+    work and no commit. The transaction is rolled back when the connection
+    returns to the pool, which also discards any ``SET LOCAL`` settings.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine to take the connection from.
+
+    Yields
+    ------
+    AsyncConnection
+        A connection whose transaction rejects writes.
+    """
+    async with engine.connect() as conn:
+        await conn.execution_options(postgresql_readonly=True)
+        yield conn
@@ -0,0 +1,116 @@
+"""Full-text search over chunk content."""
+
+from typing import Any
+
+from sqlalchemy import ColumnElement, Text, cast, func, literal_column, select, text, update
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from lib_orm.models import DocumentChunk
+from lib_orm.settings import DbSettings
+
+# Text search configuration of ``content_tsv``, read from
+# ``RAG_TEXT_SEARCH_CONFIG`` so the embedder and the retriever agree on it.
+TEXT_SEARCH_CONFIG = DbSettings().text_search_config
+
+FULLTEXT_INDEX_NAME = "idx_chunks_content_tsv"
+
+# Inlined rather than bound, so the server sees a constant configuration; the
+# setting only admits identifiers, so it cannot break out of the literal.
+_CONFIG: ColumnElement[Any] = literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig")
+
+# Rows updated per statement by the backfill, so no single transaction
+# holds row locks on the whole table.
+_BACKFILL_BATCH_ROWS = 5_000
+
+
+def content_tsvector(content: Any) -> ColumnElement[Any]:
+    """
+    Build the ``content_tsv`` value of a chunk's content.
+
+    Parameters
+    ----------
+    content : Any
+        Content string or SQL expression.
+
+    Returns
+    -------
+    ColumnElement[Any]
+        ``to_tsvector`` of the content under ``TEXT_SEARCH_CONFIG``.
+    """
+    return func.to_tsvector(_CONFIG, content)
+
+
+def any_terms_tsquery(query: str) -> ColumnElement[Any]:
+    """
+    Build a query matching chunks that contain any of the query's terms.
+
+    ``plainto_tsquery`` normalises the text like the indexed content (stop
+    words dropped, words stemmed) but requires every term; its ``&``
+    operators are turned into ``|`` so natural-language questions still
+    match, and ``ts_rank_cd`` rewards chunks covering more terms.
+
+    Parameters
+    ----------
+    query : str
+        Raw query text.
+
+    Returns
+    -------
+    ColumnElement[Any]
+        ``tsquery`` expression, empty if the text has only stop words.
+    """
+    plain = func.plainto_tsquery(_CONFIG, query)
+    return cast(func.replace(cast(plain, Text), " & ", " | "), TSQUERY)
+
+
+async def backfill_fulltext(engine: AsyncEngine) -> int:
+    """
+    Add and fill ``content_tsv`` on a database created before it existed.
+
+    Adds the column if missing, computes it for rows without one in
+    batches, then builds the GIN index concurrently so writes are not
+    blocked. Safe to run again.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine connected to the RAG database.
+
+    Returns
+    -------
+    int
+        Number of rows filled.
+    """
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS content_tsv tsvector")
+        )
+    pending = (
+        select(DocumentChunk.id)
+        .where(DocumentChunk.content_tsv.is_(None))
+        .limit(_BACKFILL_BATCH_ROWS)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(DocumentChunk)
+        .where(DocumentChunk.id.in_(pending))
+        .values(content_tsv=content_tsvector(DocumentChunk.content))
+    )
+    filled = 0
+    while True:
+        async with engine.begin() as conn:
+            count = int((await conn.execute(stmt)).rowcount)
+        filled += count
+        if count < _BACKFILL_BATCH_ROWS:
+            break
+    async with engine.connect() as conn:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        autocommit = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await autocommit.execute(
+            text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {FULLTEXT_INDEX_NAME} "
+                "ON document_chunks USING gin (content_tsv)"
+            )
+        )
+    return filled
@@ -0,0 +1,444 @@
+"""Vector index management for ``document_chunks.embedding``."""
+
+import asyncio
+import math
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from lib_orm.models import DocumentChunk, VectorIndexBuild
+from lib_orm.settings import DbSettings
+
+EMBEDDING_INDEX_NAME = "idx_chunks_embedding"
+
+# A concurrent rebuild builds under this name, then swaps it in.
+_NEW_INDEX_NAME = f"{EMBEDDING_INDEX_NAME}_new"
+
+# pgvector guidance: rows / 1000 lists up to 1M rows, sqrt(rows) beyond.
+_ROWS_PER_LIST = 1000
+_SQRT_LISTS_ABOVE_ROWS = 1_000_000
+
+_PROGRESS_QUERY = text(
+    "SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total "
+    "FROM pg_stat_progress_create_index "
+    "WHERE relid = to_regclass(:table)"
+)
+
+
+class IndexBuildProgress(NamedTuple):
+    """
+    Snapshot of a running ``CREATE INDEX`` from ``pg_stat_progress_create_index``.
+
+    Attributes
+    ----------
+    phase : str
+        Current build phase as reported by PostgreSQL.
+    blocks_done : int
+        Heap blocks processed in the current phase.
+    blocks_total : int
+        Heap blocks to process in the current phase.
+    tuples_done : int
+        Tuples processed in the current phase.
+    tuples_total : int
+        Tuples to process in the current phase.
+    """
+
+    phase: str
+    blocks_done: int
+    blocks_total: int
+    tuples_done: int
+    tuples_total: int
+
+    def __str__(self) -> str:
+        """
+        Format the snapshot as a one-line progress report.
+
+        Returns
+        -------
+        str
+            Phase with tuple or block completion, whichever is known.
+        """
+        if self.tuples_total:
+            done, total, unit = self.tuples_done, self.tuples_total, "tuples"
+        elif self.blocks_total:
+            done, total, unit = self.blocks_done, self.blocks_total, "blocks"
+        else:
+            return self.phase
+        return f"{self.phase}: {done}/{total} {unit} ({100 * done / total:.1f}%)"
+
+
+class IndexState(NamedTuple):
+    """
+    Size of the corpus relative to the last recorded index build.
+
+    Attributes
+    ----------
+    row_count : int
+        Rows currently in ``document_chunks``.
+    built_row_count : int | None
+        Rows when the index was last rebuilt, or None if no build is recorded.
+    rows_changed_since_build : int
+        Rows inserted or updated after the last build finished.
+    """
+
+    row_count: int
+    built_row_count: int | None
+    rows_changed_since_build: int
+
+
+def compute_ivfflat_lists(row_count: int) -> int:
+    """
+    Choose the number of IVFFlat lists for a table size.
+
+    Parameters
+    ----------
+    row_count : int
+        Number of indexed rows.
+
+    Returns
+    -------
+    int
+        ``row_count / 1000`` up to one million rows, ``sqrt(row_count)``
+        beyond, and at least 1.
+    """
+    if row_count <= _SQRT_LISTS_ABOVE_ROWS:
+        return max(1, row_count // _ROWS_PER_LIST)
+    return math.isqrt(row_count)
+
+
+def index_parameters(settings: DbSettings, lists: int | None = None) -> dict[str, int]:
+    """
+    Return the build parameters of the configured vector index.
+
+    Parameters
+    ----------
+    settings : DbSettings
+        Index type and build parameters.
+    lists : int | None
+        IVFFlat list count overriding ``settings.ivfflat_lists``.
+
+    Returns
+    -------
+    dict[str, int]
+        ``m`` and ``ef_construction`` for HNSW, ``lists`` for IVFFlat.
+    """
+    if settings.index_type == "hnsw":
+        return {"m": settings.hnsw_m, "ef_construction": settings.hnsw_ef_construction}
+    return {"lists": lists if lists is not None else settings.ivfflat_lists}
+
+
+def embedding_index_ddl(
+    settings: DbSettings,
+    name: str = EMBEDDING_INDEX_NAME,
+    lists: int | None = None,
+    concurrently: bool = False,
+    table: str = "document_chunks",
+) -> str:
+    """
+    Build the ``CREATE INDEX`` statement for the configured vector index.
+
+    Parameters
+    ----------
+    settings : DbSettings
+        Index type and build parameters.
+    name : str
+        Index name.
+    lists : int | None
+        IVFFlat list count overriding ``settings.ivfflat_lists``.
+    concurrently : bool
+        Whether to build with ``CREATE INDEX CONCURRENTLY``.
+    table : str
+        Table to index.
+
+    Returns
+    -------
+    str
+        DDL statement for a cosine-distance HNSW or IVFFlat index.
+    """
+    params = index_parameters(settings, lists)
+    options = ", ".join(f"{key} = {value}" for key, value in params.items())
+    create = "CREATE INDEX CONCURRENTLY" if concurrently else "CREATE INDEX"
+    return (
+        f"{create} {name} ON {table} "
+        f"USING {settings.index_type} (embedding vector_cosine_ops) WITH ({options})"
+    )
+
+
+async def fetch_index_state(conn: AsyncConnection) -> IndexState:
+    """
+    Compare the current corpus size with the last recorded index build.
+
+    Parameters
+    ----------
+    conn : AsyncConnection
+        Connection to query with.
+
+    Returns
+    -------
+    IndexState
+        Current and last-built row counts, and rows changed since.
+    """
+    row_count = (await conn.execute(select(func.count()).select_from(DocumentChunk))).scalar_one()
+    last = (
+        await conn.execute(
+            select(VectorIndexBuild.row_count, VectorIndexBuild.finished_at)
+            .order_by(VectorIndexBuild.finished_at.desc())
+            .limit(1)
+        )
+    ).first()
+    if last is None:
+        return IndexState(row_count, None, row_count)
+    changed = (
+        await conn.execute(
+            select(func.count())
+            .select_from(DocumentChunk)
+            .where(DocumentChunk.updated_at > last.finished_at)
+        )
+    ).scalar_one()
+    return IndexState(row_count, last.row_count, changed)
+
+
+def rebuild_reason(state: IndexState, threshold: float) -> str | None:
+    """
+    Decide whether the corpus has moved enough to rebuild the index.
+
+    Rows re-embedded in place, e.g. by a new embedding model, count as
+    changed even though the row count stays the same.
+
+    Parameters
+    ----------
+    state : IndexState
+        Corpus size relative to the last build.
+    threshold : float
+        Fraction of the last-built row count that must have been inserted
+        or updated, or by which the row count must have changed.
+
+    Returns
+    -------
+    str | None
+        Human-readable reason to rebuild, or None if the index is current.
+    """
+    if state.row_count == 0:
+        return None
+    if state.built_row_count is None:
+        return f"no recorded build ({state.row_count} rows)"
+    base = max(state.built_row_count, 1)
+    if abs(state.row_count - state.built_row_count) / base >= threshold:
+        return f"row count changed from {state.built_row_count} to {state.row_count}"
+    if state.rows_changed_since_build / base >= threshold:
+        return f"{state.rows_changed_since_build} rows added or updated since the last build"
+    return None
+
+
+async def fetch_index_progress(
+    engine: AsyncEngine, table: str = "document_chunks"
+) -> IndexBuildProgress | None:
+    """
+    Read the progress of an index build on a table.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine to query with; uses a connection other than the build's.
+    table : str
+        Table the index is built on.
+
+    Returns
+    -------
+    IndexBuildProgress | None
+        Progress snapshot, or None if no build is running.
+    """
+    async with engine.connect() as conn:
+        row = (await conn.execute(_PROGRESS_QUERY, {"table": table})).first()
+    if row is None:
+        return None
+    return IndexBuildProgress(*row)
+
+
+async def await_index_build(
+    engine: AsyncEngine,
+    build: Awaitable[Any],
+    report: Callable[[str], None],
+    poll_interval_s: float,
+    table: str = "document_chunks",
+) -> None:
+    """
+    Await an index build, reporting its progress periodically.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine to read progress with.
+    build : Awaitable[Any]
+        The running build.
+    report : Callable[[str], None]
+        Receives a progress line every ``poll_interval_s`` seconds.
+    poll_interval_s : float
+        Seconds between progress reports.
+    table : str
+        Table the index is built on.
+    """
+    task = asyncio.ensure_future(build)
+    try:
+        while True:
+            done, _pending = await asyncio.wait({task}, timeout=poll_interval_s)
+            if done:
+                break
+            progress = await fetch_index_progress(engine, table)
+            if progress is not None:
+                report(str(progress))
+    finally:
+        if not task.done():
+            task.cancel()
+    await task
+
+
+async def record_index_build(
+    conn: AsyncConnection,
+    settings: DbSettings,
+    parameters: dict[str, int],
+    row_count: int,
+    reason: str,
+    started_at: Any,
+) -> None:
+    """
+    Insert a ``vector_index_builds`` row for a finished build.
+
+    Parameters
+    ----------
+    conn : AsyncConnection
+        Connection in the transaction that activated the index.
+    settings : DbSettings
+        Index type.
+    parameters : dict[str, int]
+        Build parameters.
+    row_count : int
+        Rows when the build started.
+    reason : str
+        Why the index was rebuilt.
+    started_at : Any
+        Database timestamp when the build started.
+    """
+    await conn.execute(
+        insert(VectorIndexBuild).values(
+            index_type=settings.index_type,
+            parameters=parameters,
+            row_count=row_count,
+            reason=reason,
+            started_at=started_at,
+        )
+    )
+
+
+async def rebuild_embedding_index(
+    engine: AsyncEngine,
+    settings: DbSettings,
+    report: Callable[[str], None] = print,
+    poll_interval_s: float = 2.0,
+    reason: str = "manual rebuild",
+) -> None:
+    """
+    Drop and recreate the vector index, reporting build progress.
+
+    Meant to run after a bulk load, so HNSW graphs and IVFFlat centroids are
+    built from the data actually stored. The drop, the build and the
+    ``vector_index_builds`` record run in one transaction, and the drop holds
+    an ``ACCESS EXCLUSIVE`` lock on ``document_chunks`` until it commits, so
+    searches as well as writes block for the whole build. Use
+    ``rebuild_embedding_index_concurrently`` on a database serving queries.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine to run the build with.
+    settings : DbSettings
+        Index type and build parameters.
+    report : Callable[[str], None]
+        Receives a progress line every ``poll_interval_s`` seconds.
+    poll_interval_s : float
+        Seconds between progress reports.
+    reason : str
+        Why the index is rebuilt, recorded with the build.
+    """
+
+    async def build() -> None:
+        """Drop the old index, build the new one and record it."""
+        async with engine.begin() as conn:
+            started_at = (await conn.execute(select(func.now()))).scalar_one()
+            state = await fetch_index_state(conn)
+            await conn.execute(text(f"DROP INDEX IF EXISTS {EMBEDDING_INDEX_NAME}"))
+            await conn.execute(text(embedding_index_ddl(settings)))
+            await record_index_build(
+                conn, settings, index_parameters(settings), state.row_count, reason, started_at
+            )
+
+    await await_index_build(engine, build(), report, poll_interval_s)
+
+
+async def rebuild_embedding_index_concurrently(
+    engine: AsyncEngine,
+    settings: DbSettings,
+    reason: str,
+    maintenance_work_mem: str = "1GB",
+    report: Callable[[str], None] = print,
+    poll_interval_s: float = 2.0,
+) -> dict[str, int]:
+    """
+    Rebuild the vector index without blocking writes, then swap it in.
+
+    The new index is built with ``CREATE INDEX CONCURRENTLY`` under a
+    temporary name, with ``maintenance_work_mem`` raised for the build
+    session and, for IVFFlat, a list count computed from the current row
+    count. A short transaction then drops the old index, renames the new
+    one and records the build in ``vector_index_builds``. If the build
+    fails, the partial index is dropped and the old one stays in place.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine to run the build with.
+    settings : DbSettings
+        Index type and HNSW build parameters.
+    reason : str
+        Why the index is rebuilt, recorded with the build.
+    maintenance_work_mem : str
+        Memory for the build session, e.g. ``"1GB"``.
+    report : Callable[[str], None]
+        Receives a progress line every ``poll_interval_s`` seconds.
+    poll_interval_s : float
+        Seconds between progress reports.
+
+    Returns
+    -------
+    dict[str, int]
+        Parameters the index was built with.
+    """
+    async with engine.connect() as conn:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        build_conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        started_at = (await build_conn.execute(select(func.now()))).scalar_one()
+        state = await fetch_index_state(build_conn)
+        parameters = index_parameters(settings, compute_ivfflat_lists(state.row_count))
+        await build_conn.execute(
+            text("SELECT set_config('maintenance_work_mem', :value, false)"),
+            {"value": maintenance_work_mem},
+        )
+        await build_conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {_NEW_INDEX_NAME}"))
+        ddl = embedding_index_ddl(
+            settings, _NEW_INDEX_NAME, lists=parameters.get("lists"), concurrently=True
+        )
+        try:
+            await await_index_build(engine, build_conn.execute(text(ddl)), report, poll_interval_s)
+        except BaseException:
+            await build_conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {_NEW_INDEX_NAME}"))
+            raise
+        finally:
+            await build_conn.execute(text("RESET maintenance_work_mem"))
+
+    async with engine.begin() as swap:
+        await swap.execute(text(f"DROP INDEX IF EXISTS {EMBEDDING_INDEX_NAME}"))
+        await swap.execute(text(f"ALTER INDEX {_NEW_INDEX_NAME} RENAME TO {EMBEDDING_INDEX_NAME}"))
+        await record_index_build(swap, settings, parameters, state.row_count, reason, started_at)
+    return parameters
@@ -4,12 +4,22 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import String, Text, UniqueConstraint, text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    DateTime,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.sql import func
 
+from lib_orm.vector import VectorType
+
 
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
@@ -35,8 +45,18 @@ class DocumentChunk(Base):
         Additional metadata as JSONB.
     embedding : Any
         384-dimensional vector embedding.
+    content_hash : str | None
+        SHA-256 hex digest of the content and metadata the embedding was
+        computed from, used to skip unchanged chunks on re-ingestion.
+    embedding_model : str | None
+        Name of the model that produced ``embedding``.
+    content_tsv : Any
+        Full-text search vector of ``content``, written with the chunk.
     created_at : datetime
         Timestamp of row creation.
+    updated_at : datetime
+        Timestamp of the last insert or upsert of the row, used to detect
+        how much of the corpus changed since the vector index was built.
     """
 
     __tablename__ = "document_chunks"
@@ -55,5 +75,75 @@ class DocumentChunk(Base):
         nullable=False,
         server_default=text("'{}'::jsonb"),
     )
-    embedding: Mapped[Any] = mapped_column(Vector(384), nullable=False)
+    embedding: Mapped[Any] = mapped_column(VectorType(384), nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(String(64))
+    embedding_model: Mapped[str | None] = mapped_column(String(255))
+    content_tsv: Mapped[Any] = mapped_column(TSVECTOR)
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+
+class CorpusState(Base):
+    """
+    ORM model for the single-row ``corpus_state`` table.
+
+    Holds a version counter that writers bump after changing
+    ``document_chunks``, so readers can invalidate caches derived from the
+    corpus.
+
+    Attributes
+    ----------
+    id : int
+        Primary key; always 1.
+    version : int
+        Monotonically increasing corpus version.
+    updated_at : datetime
+        Timestamp of the last bump.
+    """
+
+    __tablename__ = "corpus_state"
+    __table_args__ = (CheckConstraint("id = 1", name="ck_corpus_state_single_row"),)
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=1)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+
+class VectorIndexBuild(Base):
+    """
+    ORM model for the ``vector_index_builds`` table.
+
+    Records every rebuild of the vector index on ``document_chunks``, so
+    later runs can tell how far the corpus has moved since.
+
+    Attributes
+    ----------
+    id : int
+        Primary key, auto-incremented.
+    index_type : str
+        Index method, ``hnsw`` or ``ivfflat``.
+    parameters : dict[str, Any]
+        Build parameters (``lists``, or ``m`` and ``ef_construction``).
+    row_count : int
+        Rows in ``document_chunks`` when the build started.
+    reason : str
+        Why the index was rebuilt.
+    started_at : datetime
+        When the build started.
+    finished_at : datetime
+        When the new index became active.
+    """
+
+    __tablename__ = "vector_index_builds"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    index_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    parameters: Mapped[dict[str, Any]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+    row_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    reason: Mapped[str] = mapped_column(Text, nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    finished_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
@@ -0,0 +1,284 @@
+"""Blue/green full reload of ``document_chunks``."""
+
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import MetaData, Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from lib_orm.corpus import bump_corpus_version
+from lib_orm.fulltext import FULLTEXT_INDEX_NAME
+from lib_orm.indexes import (
+    EMBEDDING_INDEX_NAME,
+    await_index_build,
+    compute_ivfflat_lists,
+    embedding_index_ddl,
+    index_parameters,
+    record_index_build,
+)
+from lib_orm.models import DocumentChunk
+from lib_orm.settings import DbSettings
+
+LIVE_TABLE = "document_chunks"
+NEXT_TABLE = "document_chunks_next"
+_OLD_TABLE = "document_chunks_old"
+
+# Constraints of the live table, rebuilt on the next table under a suffixed
+# name and renamed on swap. ``{table}`` and ``{name}`` are filled in.
+_CONSTRAINTS = {
+    "document_chunks_pkey": "ALTER TABLE {table} ADD CONSTRAINT {name} PRIMARY KEY (id)",
+    "uq_document_chunk": "ALTER TABLE {table} ADD CONSTRAINT {name} "
+    "UNIQUE (document_name, chunk_index)",
+}
+
+# Secondary indexes of the live table other than the vector index. The
+# btree and ``jsonb_path_ops`` GIN indexes serve search filters on the
+# document name and on metadata containment (``metadata @> ...``).
+SECONDARY_INDEXES = {
+    "idx_chunks_document_name": "CREATE INDEX {name} ON {table} (document_name)",
+    "idx_chunks_metadata": "CREATE INDEX {name} ON {table} USING gin (metadata jsonb_path_ops)",
+    FULLTEXT_INDEX_NAME: "CREATE INDEX {name} ON {table} USING gin (content_tsv)",
+}
+
+# Columns added to the live table after its first release, with the type
+# ``ALTER TABLE ... ADD COLUMN`` gives them on an older database. ``now()``
+# is stable, so the default fills existing rows without a table rewrite.
+ADDED_COLUMNS = {
+    "content_hash": "VARCHAR(64)",
+    "embedding_model": "VARCHAR(255)",
+    "updated_at": "TIMESTAMP WITH TIME ZONE DEFAULT now()",
+}
+
+
+@lru_cache
+def chunks_table(name: str = LIVE_TABLE) -> Table:
+    """
+    Return a Core table with the ``document_chunks`` columns under another name.
+
+    Parameters
+    ----------
+    name : str
+        Table name.
+
+    Returns
+    -------
+    Table
+        ``DocumentChunk.__table__`` itself for the live table, otherwise a
+        copy bound to its own metadata.
+    """
+    if name == LIVE_TABLE:
+        return DocumentChunk.__table__  # type: ignore[return-value]
+    return DocumentChunk.__table__.to_metadata(MetaData(), name=name)  # type: ignore[attr-defined, no-any-return]
+
+
+async def create_next_table(conn: AsyncConnection) -> None:
+    """
+    Create an empty ``document_chunks_next`` table to load a full reload into.
+
+    The table has the live table's columns, defaults and constraints, but
+    none of its secondary or vector indexes, so bulk inserts do not pay for
+    index maintenance. A leftover table from an aborted reload is dropped.
+
+    Parameters
+    ----------
+    conn : AsyncConnection
+        Connection in the transaction creating the table.
+    """
+    await conn.execute(text(f"DROP TABLE IF EXISTS {NEXT_TABLE}"))
+    await conn.execute(
+        text(
+            f"CREATE TABLE {NEXT_TABLE} "
+            f"(LIKE {LIVE_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    for name, ddl in _CONSTRAINTS.items():
+        await conn.execute(text(ddl.format(table=NEXT_TABLE, name=f"{name}_next")))
+
+
+async def build_next_indexes(
+    engine: AsyncEngine,
+    settings: DbSettings,
+    report: Callable[[str], None] = print,
+    poll_interval_s: float = 2.0,
+) -> dict[str, int]:
+    """
+    Build the secondary and vector indexes on the loaded next table.
+
+    Nothing reads the next table yet, so the indexes are built with plain
+    ``CREATE INDEX`` over the complete data, IVFFlat lists sized from its
+    row count.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine to run the builds with.
+    settings : DbSettings
+        Index type and build parameters.
+    report : Callable[[str], None]
+        Receives vector index progress lines.
+    poll_interval_s : float
+        Seconds between progress reports.
+
+    Returns
+    -------
+    dict[str, int]
+        Parameters the vector index was built with.
+    """
+    async with engine.begin() as conn:
+        row_count = (
+            await conn.execute(select(func.count()).select_from(chunks_table(NEXT_TABLE)))
+        ).scalar_one()
+        for name, ddl in SECONDARY_INDEXES.items():
+            await conn.execute(text(ddl.format(table=NEXT_TABLE, name=f"{name}_next")))
+    parameters = index_parameters(settings, compute_ivfflat_lists(row_count))
+
+    async def build() -> None:
+        """Build the vector index on the next table."""
+        ddl = embedding_index_ddl(
+            settings,
+            f"{EMBEDDING_INDEX_NAME}_next",
+            lists=parameters.get("lists"),
+            table=NEXT_TABLE,
+        )
+        async with engine.begin() as conn:
+            await conn.execute(text(ddl))
+
+    await await_index_build(engine, build(), report, poll_interval_s, table=NEXT_TABLE)
+    return parameters
+
+
+async def swap_in_next_table(
+    conn: AsyncConnection,
+    settings: DbSettings,
+    parameters: dict[str, int],
+    started_at: Any,
+) -> int:
+    """
+    Atomically replace ``document_chunks`` with the loaded next table.
+
+    Renames the live table and its constraints and indexes out of the way,
+    renames the next table's into their place, records the vector index
+    build, bumps the corpus version and drops the old table, all in the
+    caller's transaction. Readers see either the old corpus or the new one
+    with its indexes complete.
+
+    Parameters
+    ----------
+    conn : AsyncConnection
+        Connection in the swap transaction.
+    settings : DbSettings
+        Index type of the new vector index.
+    parameters : dict[str, int]
+        Parameters the new vector index was built with.
+    started_at : Any
+        Database timestamp when the reload started.
+
+    Returns
+    -------
+    int
+        The new corpus version.
+    """
+    # Renaming the index behind a constraint renames the constraint too
+    indexes = [*_CONSTRAINTS, *SECONDARY_INDEXES, EMBEDDING_INDEX_NAME]
+    await conn.execute(text(f"ALTER TABLE {LIVE_TABLE} RENAME TO {_OLD_TABLE}"))
+    # A live table created before a secondary index was added lacks it; the
+    # next table always has every index
+    for name in indexes:
+        await conn.execute(text(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_old"))
+    await conn.execute(text(f"ALTER TABLE {NEXT_TABLE} RENAME TO {LIVE_TABLE}"))
+    for name in indexes:
+        await conn.execute(text(f"ALTER INDEX {name}_next RENAME TO {name}"))
+
+    row_count = (await conn.execute(select(func.count()).select_from(DocumentChunk))).scalar_one()
+    await record_index_build(conn, settings, parameters, row_count, "full reload", started_at)
+    version = await bump_corpus_version(conn)
+    await conn.execute(text(f"DROP TABLE {_OLD_TABLE}"))
+    return version
+
+
+async def create_secondary_indexes(engine: AsyncEngine) -> list[str]:
+    """
+    Create the secondary indexes missing from the live table.
+
+    Brings a database created before an index was added up to date. Each
+    missing index is built concurrently so writes are not blocked; the
+    full-text index needs the ``content_tsv`` column, added by
+    ``backfill_fulltext``.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine connected to the RAG database.
+
+    Returns
+    -------
+    list[str]
+        Names of the indexes created.
+    """
+    created: list[str] = []
+    async with engine.connect() as conn:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        autocommit = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        existing = set(
+            (
+                await autocommit.execute(
+                    text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+                    {"table": LIVE_TABLE},
+                )
+            ).scalars()
+        )
+        for name, ddl in SECONDARY_INDEXES.items():
+            if name in existing:
+                continue
+            statement = ddl.format(table=LIVE_TABLE, name=name)
+            await autocommit.execute(
+                text(
+                    statement.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY IF NOT EXISTS", 1)
+                )
+            )
+            created.append(name)
+    return created
+
+
+async def add_missing_columns(engine: AsyncEngine) -> list[str]:
+    """
+    Add the columns missing from the live table.
+
+    Brings a database created before a column was added up to date without
+    rewriting the table. Existing rows get NULL hashes, so the next
+    re-ingestion embeds them once, and the migration time as
+    ``updated_at``, so the next index maintenance counts them as changed.
+    Safe to run again.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine connected to the RAG database.
+
+    Returns
+    -------
+    list[str]
+        Names of the columns added.
+    """
+    async with engine.begin() as conn:
+        existing = set(
+            (
+                await conn.execute(
+                    text(
+                        "SELECT column_name FROM information_schema.columns "
+                        "WHERE table_name = :table"
+                    ),
+                    {"table": LIVE_TABLE},
+                )
+            ).scalars()
+        )
+        added = [name for name in ADDED_COLUMNS if name not in existing]
+        for name in added:
+            await conn.execute(
+                text(
+                    f"ALTER TABLE {LIVE_TABLE} "
+                    f"ADD COLUMN IF NOT EXISTS {name} {ADDED_COLUMNS[name]}"
+                )
+            )
+    return added
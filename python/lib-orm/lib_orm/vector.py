@@ -0,0 +1,66 @@
+"""Binary transport of pgvector values over asyncpg."""
+
+from typing import Any
+
+from pgvector.asyncpg import register_vector
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Dialect
+
+
+class VectorType(Vector):
+    """
+    pgvector column type sent in binary form on asyncpg connections.
+
+    pgvector's SQLAlchemy type renders every bound vector as text, which the
+    server then parses back into floats. On asyncpg, engines from
+    ``lib_orm.db`` register pgvector's binary codec on each new connection,
+    so values are passed through untouched and travel as ``float4`` arrays
+    in both directions. Other drivers keep the text format.
+    """
+
+    cache_ok = True
+
+    def bind_processor(self, dialect: Dialect) -> Any:
+        """
+        Return the bind processor for a dialect.
+
+        Parameters
+        ----------
+        dialect : Dialect
+            Dialect the statement is executed with.
+
+        Returns
+        -------
+        Any
+            None on asyncpg, leaving lists and arrays to the binary codec,
+            otherwise pgvector's text processor.
+        """
+        if dialect.driver == "asyncpg":
+            return None
+        return super().bind_processor(dialect)
+
+
+def register_vector_codec(dbapi_connection: Any, _connection_record: Any) -> None:
+    """
+    Register pgvector's binary codecs on a new asyncpg connection.
+
+    Meant as a pool ``connect`` event listener. Databases without the
+    ``vector`` extension are left with the default codecs.
+
+    Parameters
+    ----------
+    dbapi_connection : Any
+        SQLAlchemy's adapted asyncpg connection.
+    _connection_record : Any
+        Pool record of the connection.
+
+    Raises
+    ------
+    ValueError
+        If registration fails for a reason other than a missing type.
+    """
+    try:
+        dbapi_connection.run_async(register_vector)
+    except ValueError as exc:
+        if not str(exc).startswith("unknown type"):
+            raise
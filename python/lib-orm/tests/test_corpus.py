@@ -0,0 +1,63 @@
+"""Tests for the corpus version counter."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from lib_orm.corpus import bump_corpus_version, get_corpus_version
+
+
+def _compiled_sql(session: AsyncMock) -> str:
+    """
+    Compile the statement passed to the mocked session.
+
+    Parameters
+    ----------
+    session : AsyncMock
+        Mocked session after one ``execute`` call.
+
+    Returns
+    -------
+    str
+        The statement rendered for PostgreSQL.
+    """
+    stmt = session.execute.call_args.args[0]
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_bump_corpus_version_upserts_and_returns_version() -> None:
+    """Test that bumping increments the single row and returns the new version."""
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalar_one.return_value = 7
+    session.execute.return_value = result
+
+    assert asyncio.run(bump_corpus_version(session)) == 7
+
+    sql = _compiled_sql(session)
+    assert "INSERT INTO corpus_state" in sql
+    assert "ON CONFLICT (id) DO UPDATE" in sql
+    assert "corpus_state.version + " in sql
+    assert "RETURNING corpus_state.version" in sql
+
+
+def test_get_corpus_version() -> None:
+    """Test that the stored version is returned."""
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = 3
+    session.execute.return_value = result
+
+    assert asyncio.run(get_corpus_version(session)) == 3
+    assert "FROM corpus_state" in _compiled_sql(session)
+
+
+def test_get_corpus_version_defaults_to_zero() -> None:
+    """Test that a missing row reads as version 0."""
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = None
+    session.execute.return_value = result
+
+    assert asyncio.run(get_corpus_version(session)) == 0
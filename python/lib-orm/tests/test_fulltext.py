@@ -0,0 +1,80 @@
+"""Tests for full-text search expressions and backfill."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from lib_orm.fulltext import (
+    FULLTEXT_INDEX_NAME,
+    any_terms_tsquery,
+    backfill_fulltext,
+    content_tsvector,
+)
+from lib_orm.models import DocumentChunk
+
+
+def _sql(expr: object) -> str:
+    """
+    Compile an expression for PostgreSQL with literal parameters.
+
+    Parameters
+    ----------
+    expr : object
+        SQL expression or statement.
+
+    Returns
+    -------
+    str
+        Compiled SQL.
+    """
+    return str(
+        select(expr).compile(  # type: ignore[call-overload]
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def test_content_tsvector_uses_configured_language() -> None:
+    """Test that content is vectorised with the configured text search configuration."""
+    assert "to_tsvector('english'::regconfig" in _sql(content_tsvector(DocumentChunk.content))
+
+
+def test_any_terms_tsquery_ors_terms() -> None:
+    """Test that the query's terms are combined with OR."""
+    sql = _sql(any_terms_tsquery("embedding models"))
+    assert "plainto_tsquery('english'::regconfig, 'embedding models')" in sql
+    assert "replace(CAST(" in sql
+    assert "' & ', ' | ')" in sql
+    assert "AS TSQUERY)" in sql
+
+
+def test_backfill_fills_in_batches_then_indexes() -> None:
+    """Test that rows are filled batch by batch before the index is built."""
+    conn = AsyncMock()
+    conn.execute.side_effect = [None, MagicMock(rowcount=5_000), MagicMock(rowcount=3)]
+    build_conn = AsyncMock()
+    index_conn = AsyncMock()
+    index_conn.execution_options.return_value = build_conn
+
+    @asynccontextmanager
+    async def _begin() -> AsyncGenerator[AsyncMock]:
+        yield conn
+
+    @asynccontextmanager
+    async def _connect() -> AsyncGenerator[AsyncMock]:
+        yield index_conn
+
+    engine = MagicMock(begin=_begin, connect=_connect)
+
+    filled = asyncio.run(backfill_fulltext(engine))
+
+    assert filled == 5_003
+    assert "ADD COLUMN IF NOT EXISTS content_tsv" in str(conn.execute.await_args_list[0].args[0])
+    assert "UPDATE document_chunks" in str(conn.execute.await_args_list[1].args[0])
+    index_conn.execution_options.assert_awaited_once_with(isolation_level="AUTOCOMMIT")
+    ddl = str(build_conn.execute.await_args.args[0])
+    assert f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {FULLTEXT_INDEX_NAME}" in ddl
@@ -0,0 +1,235 @@
+"""Tests for vector index management."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from lib_orm.indexes import (
+    IndexBuildProgress,
+    IndexState,
+    compute_ivfflat_lists,
+    embedding_index_ddl,
+    fetch_index_state,
+    rebuild_embedding_index,
+    rebuild_embedding_index_concurrently,
+    rebuild_reason,
+)
+from lib_orm.settings import DbSettings
+
+
+def _result(scalar: Any = 0, first: Any = None) -> MagicMock:
+    """
+    Create a mock query result.
+
+    Parameters
+    ----------
+    scalar : Any
+        Value returned by ``scalar_one``.
+    first : Any
+        Value returned by ``first``.
+
+    Returns
+    -------
+    MagicMock
+        Mock result.
+    """
+    result = MagicMock()
+    result.scalar_one.return_value = scalar
+    result.first.return_value = first
+    return result
+
+
+def test_ddl_hnsw() -> None:
+    """Test that the HNSW index uses the configured build parameters."""
+    ddl = embedding_index_ddl(DbSettings(hnsw_m=24, hnsw_ef_construction=128))
+    assert ddl == (
+        "CREATE INDEX idx_chunks_embedding ON document_chunks "
+        "USING hnsw (embedding vector_cosine_ops) WITH (m = 24, ef_construction = 128)"
+    )
+
+
+def test_ddl_ivfflat() -> None:
+    """Test that the IVFFlat index uses the configured number of lists."""
+    ddl = embedding_index_ddl(DbSettings(index_type="ivfflat", ivfflat_lists=50), name="tmp")
+    assert ddl == (
+        "CREATE INDEX tmp ON document_chunks "
+        "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 50)"
+    )
+
+
+def test_progress_str() -> None:
+    """Test that progress is reported in tuples, then blocks, then phase only."""
+    loading = IndexBuildProgress("building index: loading tuples", 0, 0, 250, 1000)
+    assert str(loading) == "building index: loading tuples: 250/1000 tuples (25.0%)"
+    scanning = IndexBuildProgress("building index: scanning table", 5, 10, 0, 0)
+    assert str(scanning) == "building index: scanning table: 5/10 blocks (50.0%)"
+    assert str(IndexBuildProgress("initializing", 0, 0, 0, 0)) == "initializing"
+
+
+def test_rebuild_reports_progress() -> None:
+    """Test that the rebuild drops and creates the index while reporting progress."""
+    build_conn = AsyncMock()
+    build_started = asyncio.Event()
+    release_build = asyncio.Event()
+
+    async def _slow_execute(stmt: Any, *_args: Any) -> MagicMock:
+        if str(stmt).startswith("CREATE INDEX"):
+            build_started.set()
+            await release_build.wait()
+        return _result()
+
+    build_conn.execute.side_effect = _slow_execute
+
+    @asynccontextmanager
+    async def _begin() -> AsyncGenerator[AsyncMock]:
+        yield build_conn
+
+    progress_conn = AsyncMock()
+    progress_result = MagicMock()
+    progress_result.first.return_value = ("building index: loading tuples", 0, 0, 5, 10)
+
+    async def _progress(_stmt: Any, *_args: Any) -> MagicMock:
+        release_build.set()
+        return progress_result
+
+    progress_conn.execute.side_effect = _progress
+
+    @asynccontextmanager
+    async def _connect() -> AsyncGenerator[AsyncMock]:
+        yield progress_conn
+
+    engine = MagicMock()
+    engine.begin = _begin
+    engine.connect = _connect
+    reports: list[str] = []
+
+    asyncio.run(rebuild_embedding_index(engine, DbSettings(), reports.append, 0.01))
+
+    statements = [str(call.args[0]) for call in build_conn.execute.await_args_list]
+    drop = statements.index("DROP INDEX IF EXISTS idx_chunks_embedding")
+    assert statements[drop + 1].startswith("CREATE INDEX idx_chunks_embedding")
+    assert statements[drop + 2].startswith("INSERT INTO vector_index_builds")
+    assert reports == ["building index: loading tuples: 5/10 tuples (50.0%)"]
+
+
+@pytest.mark.parametrize(
+    ("rows", "lists"),
+    [(0, 1), (500, 1), (50_000, 50), (1_000_000, 1000), (4_000_000, 2000)],
+)
+def test_compute_ivfflat_lists(rows: int, lists: int) -> None:
+    """Test that lists scale with rows / 1000, then with sqrt(rows)."""
+    assert compute_ivfflat_lists(rows) == lists
+
+
+def test_ddl_concurrently_with_lists() -> None:
+    """Test that a computed list count and CONCURRENTLY are honoured."""
+    settings = DbSettings(index_type="ivfflat")
+    ddl = embedding_index_ddl(settings, "new_idx", lists=7, concurrently=True)
+    assert ddl.startswith("CREATE INDEX CONCURRENTLY new_idx ON document_chunks")
+    assert ddl.endswith("WITH (lists = 7)")
+
+
+def test_rebuild_reason() -> None:
+    """Test the growth and drift thresholds for rebuilding."""
+    assert rebuild_reason(IndexState(0, None, 0), 0.2) is None
+    assert rebuild_reason(IndexState(100, None, 100), 0.2) == "no recorded build (100 rows)"
+    assert rebuild_reason(IndexState(110, 100, 10), 0.2) is None
+    assert rebuild_reason(IndexState(130, 100, 30), 0.2) == "row count changed from 100 to 130"
+    assert rebuild_reason(IndexState(70, 100, 0), 0.2) == "row count changed from 100 to 70"
+    assert (
+        rebuild_reason(IndexState(100, 100, 25), 0.2)
+        == "25 rows added or updated since the last build"
+    )
+
+
+def test_fetch_index_state_counts_updated_rows() -> None:
+    """Test that rows re-embedded in place since the last build count as changed."""
+    last = MagicMock(row_count=100, finished_at="2026-01-01T00:00:00+00:00")
+    conn = AsyncMock()
+    conn.execute.side_effect = [_result(100), _result(first=last), _result(30)]
+
+    state = asyncio.run(fetch_index_state(conn))
+
+    assert state == IndexState(100, 100, 30)
+    assert rebuild_reason(state, 0.2) == "30 rows added or updated since the last build"
+    changed = conn.execute.await_args_list[2].args[0]
+    sql = str(changed.compile(dialect=postgresql.dialect()))
+    assert "document_chunks.updated_at >" in sql
+
+
+def test_rebuild_concurrently_builds_and_swaps() -> None:
+    """Test that the concurrent rebuild builds under a new name, then swaps."""
+    build_conn = AsyncMock()
+
+    async def _execute(stmt: Any, *_args: Any) -> MagicMock:
+        return _result(scalar=5000)
+
+    build_conn.execute.side_effect = _execute
+    conn = AsyncMock()
+    conn.execution_options.return_value = build_conn
+    swap_conn = AsyncMock()
+
+    @asynccontextmanager
+    async def _connect() -> AsyncGenerator[AsyncMock]:
+        yield conn
+
+    @asynccontextmanager
+    async def _begin() -> AsyncGenerator[AsyncMock]:
+        yield swap_conn
+
+    engine = MagicMock()
+    engine.connect = _connect
+    engine.begin = _begin
+    settings = DbSettings(index_type="ivfflat")
+
+    params = asyncio.run(
+        rebuild_embedding_index_concurrently(engine, settings, "test", maintenance_work_mem="2GB")
+    )
+
+    assert params == {"lists": 5}
+    conn.execution_options.assert_awaited_once_with(isolation_level="AUTOCOMMIT")
+    calls = build_conn.execute.await_args_list
+    assert any(c.args[1:] == ({"value": "2GB"},) for c in calls)
+    statements = [str(c.args[0]) for c in calls]
+    assert (
+        "CREATE INDEX CONCURRENTLY idx_chunks_embedding_new ON document_chunks "
+        "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 5)"
+    ) in statements
+    swap = [str(c.args[0]) for c in swap_conn.execute.await_args_list]
+    assert swap[0] == "DROP INDEX IF EXISTS idx_chunks_embedding"
+    assert swap[1] == "ALTER INDEX idx_chunks_embedding_new RENAME TO idx_chunks_embedding"
+    assert swap[2].startswith("INSERT INTO vector_index_builds")
+
+
+def test_rebuild_concurrently_drops_partial_index_on_failure() -> None:
+    """Test that a failed build leaves the old index and removes the new one."""
+    build_conn = AsyncMock()
+
+    async def _execute(stmt: Any, *_args: Any) -> MagicMock:
+        if str(stmt).startswith("CREATE INDEX CONCURRENTLY"):
+            raise RuntimeError("out of memory")
+        return _result(scalar=5000)
+
+    build_conn.execute.side_effect = _execute
+    conn = AsyncMock()
+    conn.execution_options.return_value = build_conn
+
+    @asynccontextmanager
+    async def _connect() -> AsyncGenerator[AsyncMock]:
+        yield conn
+
+    engine = MagicMock()
+    engine.connect = _connect
+    engine.begin = MagicMock(side_effect=AssertionError("must not swap"))
+
+    with pytest.raises(RuntimeError, match="out of memory"):
+        asyncio.run(rebuild_embedding_index_concurrently(engine, DbSettings(), "test"))
+
+    statements = [str(c.args[0]) for c in build_conn.execute.await_args_list]
+    assert statements[-2] == "DROP INDEX CONCURRENTLY IF EXISTS idx_chunks_embedding_new"
+    assert statements[-1] == "RESET maintenance_work_mem"
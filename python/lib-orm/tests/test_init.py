@@ -1,6 +1,16 @@
 """Tests for lib-orm public API."""
 
-from lib_orm import Base, DbSettings, DocumentChunk, get_async_engine
+from lib_orm import (
+    Base,
+    CorpusState,
+    DbSettings,
+    DocumentChunk,
+    bump_corpus_version,
+    dispose_engines,
+    get_async_engine,
+    get_corpus_version,
+    get_engine,
+)
 
 
 def test_exports() -> None:
@@ -9,3 +19,8 @@ def test_exports() -> None:
     assert DocumentChunk is not None
     assert DbSettings is not None
     assert get_async_engine is not None
+    assert CorpusState is not None
+    assert bump_corpus_version is not None
+    assert get_corpus_version is not None
+    assert get_engine is not None
+    assert dispose_engines is not None
@@ -1,6 +1,6 @@
 """Tests for ORM models."""
 
-from lib_orm.models import Base, DocumentChunk
+from lib_orm.models import Base, CorpusState, DocumentChunk, VectorIndexBuild
 
 
 def test_tablename() -> None:
@@ -22,7 +22,11 @@ def test_columns_exist() -> None:
         "content",
         "metadata",
         "embedding",
+        "content_hash",
+        "embedding_model",
+        "content_tsv",
         "created_at",
+        "updated_at",
     }
     assert column_names == expected
 
@@ -40,3 +44,25 @@ def test_unique_constraint() -> None:
 def test_base_registry() -> None:
     """Test that DocumentChunk is registered in the Base metadata."""
     assert "document_chunks" in Base.metadata.tables
+
+
+def test_corpus_state_columns() -> None:
+    """Test that CorpusState maps to the single-row corpus_state table."""
+    assert CorpusState.__tablename__ == "corpus_state"
+    assert {c.name for c in CorpusState.__table__.columns} == {"id", "version", "updated_at"}
+    constraint_names = {c.name for c in CorpusState.__table__.constraints if c.name}
+    assert "ck_corpus_state_single_row" in constraint_names
+
+
+def test_vector_index_builds_columns() -> None:
+    """Test that VectorIndexBuild maps to the vector_index_builds table."""
+    assert VectorIndexBuild.__tablename__ == "vector_index_builds"
+    assert {c.name for c in VectorIndexBuild.__table__.columns} == {
+        "id",
+        "index_type",
+        "parameters",
+        "row_count",
+        "reason",
+        "started_at",
+        "finished_at",
+    }
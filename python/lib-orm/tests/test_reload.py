@@ -0,0 +1,178 @@
+"""Tests for blue/green full reloads."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+from lib_orm.models import DocumentChunk
+from lib_orm.reload import (
+    NEXT_TABLE,
+    add_missing_columns,
+    build_next_indexes,
+    chunks_table,
+    create_next_table,
+    create_secondary_indexes,
+    swap_in_next_table,
+)
+from lib_orm.settings import DbSettings
+
+
+def _conn(scalar: Any = 0) -> AsyncMock:
+    """
+    Create a mock connection whose results return a scalar.
+
+    Parameters
+    ----------
+    scalar : Any
+        Value returned by ``scalar_one``.
+
+    Returns
+    -------
+    AsyncMock
+        Mock connection.
+    """
+    result = MagicMock()
+    result.scalar_one.return_value = scalar
+    conn = AsyncMock()
+    conn.execute.return_value = result
+    return conn
+
+
+def _statements(conn: AsyncMock) -> list[str]:
+    """
+    Return the SQL executed on a mock connection.
+
+    Parameters
+    ----------
+    conn : AsyncMock
+        Mock connection.
+
+    Returns
+    -------
+    list[str]
+        Statements in execution order.
+    """
+    return [str(call.args[0]) for call in conn.execute.await_args_list]
+
+
+def test_chunks_table() -> None:
+    """Test that the next table has the live table's columns under its own name."""
+    assert chunks_table() is DocumentChunk.__table__
+    table = chunks_table(NEXT_TABLE)
+    assert table.name == NEXT_TABLE
+    assert table.c.keys() == DocumentChunk.__table__.c.keys()
+
+
+def test_create_next_table() -> None:
+    """Test that the next table is recreated with suffixed constraints."""
+    conn = _conn()
+    asyncio.run(create_next_table(conn))
+    statements = _statements(conn)
+    assert statements[0] == "DROP TABLE IF EXISTS document_chunks_next"
+    assert statements[1].startswith("CREATE TABLE document_chunks_next (LIKE document_chunks")
+    assert "CONSTRAINT document_chunks_pkey_next PRIMARY KEY (id)" in statements[2]
+    assert "CONSTRAINT uq_document_chunk_next UNIQUE" in statements[3]
+
+
+def test_build_next_indexes_sizes_lists_from_rows() -> None:
+    """Test that the next table's IVFFlat index is sized from its row count."""
+    conn = _conn(scalar=50_000)
+
+    @asynccontextmanager
+    async def _begin() -> AsyncGenerator[AsyncMock]:
+        yield conn
+
+    engine = MagicMock()
+    engine.begin = _begin
+    settings = DbSettings(index_type="ivfflat")
+
+    parameters = asyncio.run(build_next_indexes(engine, settings, poll_interval_s=1.0))
+
+    assert parameters == {"lists": 50}
+    statements = _statements(conn)
+    assert "CREATE INDEX idx_chunks_document_name_next ON document_chunks_next (document_name)" in (
+        statements
+    )
+    assert (
+        "CREATE INDEX idx_chunks_metadata_next ON document_chunks_next "
+        "USING gin (metadata jsonb_path_ops)"
+    ) in statements
+    assert (
+        "CREATE INDEX idx_chunks_content_tsv_next ON document_chunks_next USING gin (content_tsv)"
+        in statements
+    )
+    assert statements[-1] == (
+        "CREATE INDEX idx_chunks_embedding_next ON document_chunks_next "
+        "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 50)"
+    )
+
+
+def test_swap_in_next_table() -> None:
+    """Test that the swap renames both tables and their indexes, then drops the old one."""
+    conn = _conn(scalar=7)
+
+    version = asyncio.run(swap_in_next_table(conn, DbSettings(), {"m": 16}, None))
+
+    assert version == 7
+    statements = _statements(conn)
+    live_out = statements.index("ALTER TABLE document_chunks RENAME TO document_chunks_old")
+    next_in = statements.index("ALTER TABLE document_chunks_next RENAME TO document_chunks")
+    assert live_out < next_in
+    assert "ALTER INDEX IF EXISTS idx_chunks_embedding RENAME TO idx_chunks_embedding_old" in (
+        statements
+    )
+    assert (
+        "ALTER INDEX IF EXISTS idx_chunks_metadata RENAME TO idx_chunks_metadata_old" in statements
+    )
+    assert "ALTER INDEX idx_chunks_embedding_next RENAME TO idx_chunks_embedding" in statements
+    assert "ALTER INDEX document_chunks_pkey_next RENAME TO document_chunks_pkey" in statements
+    assert any(s.startswith("INSERT INTO vector_index_builds") for s in statements)
+    assert statements[-1] == "DROP TABLE document_chunks_old"
+
+
+def test_create_secondary_indexes_builds_missing_concurrently() -> None:
+    """Test that only missing secondary indexes are built, concurrently."""
+    conn = _conn()
+    conn.execute.return_value.scalars.return_value = [
+        "document_chunks_pkey",
+        "idx_chunks_document_name",
+        "idx_chunks_content_tsv",
+    ]
+    index_conn = AsyncMock()
+    index_conn.execution_options.return_value = conn
+
+    @asynccontextmanager
+    async def _connect() -> AsyncGenerator[AsyncMock]:
+        yield index_conn
+
+    engine = MagicMock(connect=_connect)
+
+    created = asyncio.run(create_secondary_indexes(engine))
+
+    assert created == ["idx_chunks_metadata"]
+    index_conn.execution_options.assert_awaited_once_with(isolation_level="AUTOCOMMIT")
+    assert _statements(conn)[1:] == [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_metadata ON document_chunks "
+        "USING gin (metadata jsonb_path_ops)"
+    ]
+
+
+def test_add_missing_columns_adds_only_missing() -> None:
+    """Test that only the columns missing from the live table are added."""
+    conn = _conn()
+    conn.execute.return_value.scalars.return_value = ["id", "content_hash", "updated_at"]
+
+    @asynccontextmanager
+    async def _begin() -> AsyncGenerator[AsyncMock]:
+        yield conn
+
+    engine = MagicMock(begin=_begin)
+
+    added = asyncio.run(add_missing_columns(engine))
+
+    assert added == ["embedding_model"]
+    assert _statements(conn)[1:] == [
+        "ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS embedding_model VARCHAR(255)"
+    ]
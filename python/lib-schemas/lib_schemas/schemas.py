@@ -1,9 +1,17 @@
 """Pydantic schemas for RAG system data exchange."""
 
 import uuid
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
+# Recall/latency trade-off of the approximate nearest-neighbour search.
+SearchEffort = Literal["fast", "balanced", "exhaustive"]
+
+# Ranking of the search endpoint: vector similarity alone, or vector and
+# full-text rankings fused.
+SearchMode = Literal["vector", "hybrid"]
+
 
 class ChunkInput(BaseModel):
     """
@@ -48,6 +56,25 @@ class ChunkWithEmbedding(ChunkInput):
     embedding: list[float]
 
 
+class SearchFilters(BaseModel):
+    """
+    Structured filters restricting a search to matching chunks.
+
+    Filters are combined with AND: a chunk must match every one that is set.
+
+    Attributes
+    ----------
+    document_names : list[str] | None
+        Only search chunks of these documents; None searches every document.
+    metadata : dict[str, str]
+        Only search chunks whose metadata has all of these key/value pairs
+        (e.g. ``{"extension": ".md"}``).
+    """
+
+    document_names: list[str] | None = Field(default=None, min_length=1)
+    metadata: dict[str, str] = Field(default_factory=dict)
+
+
 class SearchRequest(BaseModel):
     """
     Request body for the search endpoint.
@@ -60,11 +87,29 @@ class SearchRequest(BaseModel):
         Maximum number of results to return (1-50).
     similarity_threshold : float
         Minimum similarity score for results (0.0-1.0).
+    search_effort : SearchEffort | None
+        Recall/latency trade-off of the index scan: ``fast``, ``balanced`` or
+        ``exhaustive``, which is exact on an IVFFlat index only. None uses
+        the service default.
+    search_mode : SearchMode | None
+        ``vector`` ranks by cosine similarity; ``hybrid`` fuses the vector
+        and full-text rankings with reciprocal-rank fusion. None uses the
+        service default.
+    rerank : bool | None
+        Whether to rerank the candidates with the cross-encoder. None
+        reranks if the service has a reranker configured.
+    filters : SearchFilters | None
+        Restricts the search to matching chunks before ranking, so up to
+        ``top_k`` matching results are returned. None searches every chunk.
     """
 
     query: str = Field(min_length=1)
     top_k: int = Field(default=5, ge=1, le=50)
     similarity_threshold: float = Field(default=0.0, ge=0.0, le=1.0)
+    search_effort: SearchEffort | None = None
+    search_mode: SearchMode | None = None
+    rerank: bool | None = None
+    filters: SearchFilters | None = None
 
 
 class SearchResult(BaseModel):
@@ -83,6 +128,12 @@ class SearchResult(BaseModel):
         Cosine similarity score.
     metadata : dict[str, str]
         Chunk metadata.
+    fusion_score : float | None
+        Reciprocal-rank fusion score in hybrid search, which orders the
+        results; None in vector search.
+    rerank_score : float | None
+        Cross-encoder relevance score, which orders the results when they
+        were reranked; None otherwise.
     """
 
     chunk_id: uuid.UUID
@@ -90,6 +141,8 @@ class SearchResult(BaseModel):
     content: str
     similarity_score: float
     metadata: dict[str, str] = Field(default_factory=dict)
+    fusion_score: float | None = None
+    rerank_score: float | None = None
 
 
 class SearchResponse(BaseModel):
@@ -106,18 +159,32 @@ class SearchResponse(BaseModel):
         Number of results returned.
     embedding_time_ms : float
         Time spent embedding the query in milliseconds.
+    queue_wait_ms : float
+        Time the query waited for a free encoder worker in milliseconds.
     search_time_ms : float
         Time spent searching the database in milliseconds.
+    rerank_time_ms : float
+        Time spent reranking the candidates in milliseconds, including
+        waiting for a free reranker worker.
+    reranked : bool
+        Whether the results were reranked; False if reranking was off or
+        missed its deadline and the search order was kept.
     query_embedding : list[float] | None
         Embedding vector of the query (for visualization).
+    cached : bool
+        Whether the results were served from the search-result cache.
     """
 
     query: str
     results: list[SearchResult]
     total_results: int
     embedding_time_ms: float
+    queue_wait_ms: float = 0.0
     search_time_ms: float
+    rerank_time_ms: float = 0.0
+    reranked: bool = False
     query_embedding: list[float] | None = None
+    cached: bool = False
 
 
 class StatsResponse(BaseModel):
@@ -8,6 +8,7 @@ from pydantic import ValidationError
 from lib_schemas.schemas import (
     ChunkInput,
     ChunkWithEmbedding,
+    SearchFilters,
     SearchRequest,
     SearchResponse,
     SearchResult,
@@ -78,6 +79,10 @@ class TestSearchRequest:
         assert req.query == "hello"
         assert req.top_k == 5
         assert req.similarity_threshold == 0.0
+        assert req.search_effort is None
+        assert req.search_mode is None
+        assert req.rerank is None
+        assert req.filters is None
 
     def test_custom_values(self) -> None:
         """Test creating a SearchRequest with custom values."""
@@ -105,6 +110,31 @@ class TestSearchRequest:
         with pytest.raises(ValidationError):
             SearchRequest(query="hello", similarity_threshold=1.5)
 
+    def test_search_effort(self) -> None:
+        """Test that only known search effort levels are accepted."""
+        assert SearchRequest(query="hello", search_effort="fast").search_effort == "fast"
+        with pytest.raises(ValidationError):
+            SearchRequest(query="hello", search_effort="instant")  # type: ignore[arg-type]
+
+    def test_search_mode(self) -> None:
+        """Test that only known search modes are accepted."""
+        assert SearchRequest(query="hello", search_mode="hybrid").search_mode == "hybrid"
+        with pytest.raises(ValidationError):
+            SearchRequest(query="hello", search_mode="lexical")  # type: ignore[arg-type]
+
+    def test_filters(self) -> None:
+        """Test that filters parse from JSON and reject an empty document list."""
+        req = SearchRequest.model_validate(
+            {
+                "query": "hello",
+                "filters": {"document_names": ["a.md"], "metadata": {"extension": ".md"}},
+            }
+        )
+        assert req.filters == SearchFilters(document_names=["a.md"], metadata={"extension": ".md"})
+        assert SearchFilters().metadata == {}
+        with pytest.raises(ValidationError):
+            SearchFilters(document_names=[])
+
 
 class TestSearchResult:
     """Tests for SearchResult schema."""
@@ -119,6 +149,8 @@ class TestSearchResult:
         )
         assert result.similarity_score == 0.85
         assert result.metadata == {}
+        assert result.fusion_score is None
+        assert result.rerank_score is None
 
     def test_round_trip(self) -> None:
         """Test JSON serialization round-trip."""
@@ -148,6 +180,10 @@ class TestSearchResponse:
         )
         assert response.total_results == 0
         assert response.results == []
+        assert response.queue_wait_ms == 0.0
+        assert response.cached is False
+        assert response.rerank_time_ms == 0.0
+        assert response.reranked is False
 
     def test_with_results(self) -> None:
         """Test SearchResponse with populated results."""
@@ -0,0 +1,120 @@
+"""Build the HNSW artifact served in-process by rag-retriever."""
+
+import asyncio
+import uuid
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from lib_embedding.hnsw import HnswIndex, open_artifact, publish_artifact
+from lib_orm.corpus import get_corpus_version
+from lib_orm.db import read_only_connection
+from lib_orm.models import DocumentChunk
+from numpy.typing import NDArray
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Rows fetched per round trip when reading the corpus.
+_FETCH_PARTITION_ROWS = 10_000
+
+
+async def fetch_corpus(engine: AsyncEngine) -> tuple[int, list[uuid.UUID], NDArray[np.float32]]:
+    """
+    Read the corpus version and every stored chunk ID and embedding.
+
+    Rows are streamed in partitions and stacked into one matrix at the end.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine connected to the RAG database.
+
+    Returns
+    -------
+    tuple[int, list[uuid.UUID], NDArray[np.float32]]
+        Corpus version, chunk IDs, and their embeddings, one row per ID.
+    """
+    ids: list[uuid.UUID] = []
+    vectors: list[NDArray[np.float32]] = []
+    async with read_only_connection(engine) as conn:
+        version = await get_corpus_version(conn)
+        result = await conn.stream(select(DocumentChunk.id, DocumentChunk.embedding))
+        async for rows in result.partitions(_FETCH_PARTITION_ROWS):
+            for chunk_id, embedding in rows:
+                ids.append(chunk_id)
+                vectors.append(np.asarray(embedding, dtype=np.float32))
+    matrix = np.stack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+    return version, ids, matrix
+
+
+def current_corpus_version(root: str | Path) -> int | None:
+    """
+    Return the corpus version the current artifact was built from.
+
+    Parameters
+    ----------
+    root : str | Path
+        Directory holding the artifact versions.
+
+    Returns
+    -------
+    int | None
+        Corpus version, or None if there is no readable artifact.
+    """
+    try:
+        metadata = open_artifact(root, mmap=True).metadata
+    except (OSError, ValueError):
+        return None
+    version = metadata.get("corpus_version")
+    return version if isinstance(version, int) else None
+
+
+async def build_ann_artifact(
+    engine: AsyncEngine,
+    root: str | Path,
+    m: int,
+    ef_construction: int,
+    embedding_model: str,
+) -> tuple[Path | None, int, int]:
+    """
+    Build an HNSW graph over the stored corpus and publish it as an artifact.
+
+    The whole corpus is indexed, not just the chunks written by this run,
+    so the artifact always matches ``document_chunks`` at one corpus
+    version. Nothing is built when the current artifact already has that
+    version or the corpus is empty.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine connected to the RAG database.
+    root : str | Path
+        Directory holding the artifact versions.
+    m : int
+        Maximum number of links per node on the upper layers.
+    ef_construction : int
+        Candidate list size while inserting.
+    embedding_model : str
+        Model that produced the embeddings, recorded in the manifest.
+
+    Returns
+    -------
+    tuple[Path | None, int, int]
+        Directory of the new version (None if nothing was built), corpus
+        version and number of indexed vectors.
+    """
+    async with read_only_connection(engine) as conn:
+        version = await get_corpus_version(conn)
+    if version == current_corpus_version(root):
+        return None, version, 0
+    version, ids, vectors = await fetch_corpus(engine)
+    if not ids:
+        return None, version, 0
+    graph = await asyncio.to_thread(HnswIndex.build, vectors, m, ef_construction)
+    metadata: dict[str, Any] = {
+        "corpus_version": version,
+        "embedding_model": embedding_model,
+        "ef_construction": ef_construction,
+    }
+    path = await asyncio.to_thread(publish_artifact, root, f"v{version}", graph, ids, metadata)
+    return path, version, len(ids)
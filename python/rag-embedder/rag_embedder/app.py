@@ -1,15 +1,45 @@
 """Application module for rag-embedder."""
 
 import asyncio
-import json
+import itertools
+import time
+from collections.abc import Iterator
+from contextlib import AsyncExitStack
 from pathlib import Path
+from typing import Any
 
+import numpy as np
+from lib_embedding.cache import EmbeddingCache
 from lib_embedding.embedding import EmbeddingClient
-from lib_orm.db import get_async_session
-from lib_schemas.schemas import ChunkInput, ChunkWithEmbedding
+from lib_orm.corpus import bump_corpus_version
+from lib_orm.db import dispose_engines, get_async_session, get_engine
+from lib_orm.indexes import (
+    fetch_index_state,
+    rebuild_embedding_index_concurrently,
+    rebuild_reason,
+)
+from lib_orm.reload import (
+    LIVE_TABLE,
+    NEXT_TABLE,
+    build_next_indexes,
+    create_next_table,
+    swap_in_next_table,
+)
+from lib_orm.settings import DbSettings
+from lib_schemas.schemas import ChunkInput
+from numpy.typing import NDArray
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from rag_embedder.ann import build_ann_artifact
+from rag_embedder.dedup import drop_unchanged, fetch_existing_hashes, fetch_stored_embeddings
+from rag_embedder.json_writer import JsonArrayWriter
+from rag_embedder.reader import iter_chunks, iter_windows
 from rag_embedder.task_inputs import task_inputs
-from rag_embedder.writer import write_chunks
+from rag_embedder.writer import copy_chunks, write_chunks
+
+# Chunks and their float32 embedding matrix, one row per chunk.
+EmbeddedBatch = tuple[list[ChunkInput], NDArray[np.float32]]
 
 
 class App:
@@ -19,68 +49,468 @@ class App:
         """
         Run the batch embedder.
 
-        Read chunks from ``input_dir``, embed them, save to ``output_dir``,
-        and optionally write to the database.
+        Stream chunks from ``input_dir`` in fixed-size windows, then embed
+        them and write them to ``output_dir`` and the database as a pipeline:
+        encoded windows are handed over a bounded queue to an async writer, so
+        model inference and database I/O overlap and memory use is bounded by
+        ``window_size`` and ``queue_depth`` rather than corpus size. With
+        ``skip_unchanged``, chunks already stored with the same content hash
+        and embedding model are neither embedded nor written to the
+        database; their stored embeddings are read back so ``output_dir``
+        still receives the whole corpus.
+
+        With ``rebuild``, every chunk is loaded into an index-free
+        ``document_chunks_next`` table instead, its indexes are built once the
+        load finishes, and it is swapped in for ``document_chunks`` in one
+        transaction, so searches keep using the old corpus until then.
+
+        With ``ann_index_dir``, an HNSW graph over the whole stored corpus is
+        then built and published there for rag-retriever to memory-map.
         """
         print(f"Input directory:   {task_inputs.input_dir}")
         print(f"Output directory:  {task_inputs.output_dir}")
         print(f"Database URL:      {task_inputs.db_url}")
         print(f"Embedding model:   {task_inputs.embedding_model}")
         print(f"Batch size:        {task_inputs.batch_size}")
+        print(f"Window size:       {task_inputs.window_size}")
+        print(f"Write batch size:  {task_inputs.write_batch_size}")
+        print(f"Write mode:        {task_inputs.write_mode}")
+        print(f"Queue depth:       {task_inputs.queue_depth}")
+        print(f"Skip unchanged:    {task_inputs.skip_unchanged}")
+        print(f"Embedding cache:   {task_inputs.embedding_cache_path or 'disabled'}")
+        print(f"Index maintenance: {task_inputs.index_maintenance}")
+        print(f"Rebuild:           {task_inputs.rebuild}")
+        print(f"ANN index:         {task_inputs.ann_index_dir or 'disabled'}")
 
-        # Load chunks
-        input_path = Path(task_inputs.input_dir)
-        chunks: list[ChunkInput] = []
-        for json_file in sorted(input_path.glob("*.json")):
-            data = json.loads(json_file.read_text(encoding="utf-8"))
-            if isinstance(data, list):
-                chunks.extend(ChunkInput(**item) for item in data)
-        print(f"Loaded {len(chunks)} chunks")
-
-        if not chunks:
+        windows = iter_windows(iter_chunks(task_inputs.input_dir), task_inputs.window_size)
+        first = next(windows, None)
+        if first is None:
+            print("Loaded 0 chunks")
             print("No chunks to embed")
             return
 
-        # Embed
-        client = EmbeddingClient(task_inputs.embedding_model)
-        print(f"Model loaded: {task_inputs.embedding_model} ({client.dimension} dims)")
-
-        texts = [c.content for c in chunks]
-        embeddings = client.encode(texts, batch_size=task_inputs.batch_size)
-        print(f"Embedded {len(embeddings)} chunks")
-
-        # Build output
-        results = [
-            ChunkWithEmbedding(**chunk.model_dump(), embedding=emb)
-            for chunk, emb in zip(chunks, embeddings, strict=True)
-        ]
-
-        # Save to output dir
-        output_path = Path(task_inputs.output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        output_file = output_path / "embeddings.json"
-        output_file.write_text(
-            json.dumps([r.model_dump() for r in results], indent=2),
-            encoding="utf-8",
-        )
-        print(f"Saved {len(results)} embeddings to {output_file}")
+        cache = None
+        if task_inputs.embedding_cache_path:
+            cache = EmbeddingCache(
+                task_inputs.embedding_cache_path, task_inputs.embedding_cache_max_entries
+            )
+        client = EmbeddingClient(task_inputs.embedding_model, cache=cache)
+        print(f"Model loaded: {client.model_version} ({client.dimension} dims)")
+
+        output_file = Path(task_inputs.output_dir) / "embeddings.json"
+        try:
+            asyncio.run(self._run_pipeline(itertools.chain([first], windows), client, output_file))
+        finally:
+            if cache is not None:
+                cache.close()
+        if cache is not None:
+            print(f"Embedding cache: {client.cache_hits} hits, {client.cache_misses} misses")
 
-        # Write to database
-        asyncio.run(self._write_to_db(results))
+    async def _run_pipeline(
+        self, windows: Iterator[list[ChunkInput]], client: EmbeddingClient, output_file: Path
+    ) -> None:
+        """
+        Embed chunks and persist them through a bounded producer/consumer queue.
+
+        Parameters
+        ----------
+        windows : Iterator[list[ChunkInput]]
+            Lazily-read windows of chunks to embed.
+        client : EmbeddingClient
+            Loaded embedding client.
+        output_file : Path
+            JSON file receiving every embedded chunk.
+        """
+        # Every stage shares the pooled engine; its connections belong to this loop
+        try:
+            rebuild_started = await self._prepare_rebuild() if task_inputs.rebuild else None
+            table = NEXT_TABLE if task_inputs.rebuild else LIVE_TABLE
+            queue: asyncio.Queue[EmbeddedBatch | None] = asyncio.Queue(
+                maxsize=task_inputs.queue_depth
+            )
+            with JsonArrayWriter(output_file) as sink:
+                producer = asyncio.create_task(self._produce(windows, client, queue, sink))
+                try:
+                    written = await self._consume(queue, sink, client.model_version, table)
+                except BaseException:
+                    producer.cancel()
+                    raise
+                loaded, embedded = await producer
+            print(f"Loaded {loaded} chunks")
+            if loaded > embedded:
+                print(f"Skipped {loaded - embedded} unchanged chunks")
+            print(f"Embedded {embedded} chunks")
+            print(f"Saved {sink.count} embeddings to {output_file}")
+            if task_inputs.rebuild:
+                if written and rebuild_started is not None:
+                    await self._swap_in_rebuild(rebuild_started)
+                else:
+                    print("Rebuild aborted: document_chunks left unchanged")
+            elif written and task_inputs.index_maintenance:
+                await self._maintain_index()
+            if task_inputs.ann_index_dir:
+                await self._build_ann_index(client.model_version)
+        finally:
+            await dispose_engines()
 
     @staticmethod
-    async def _write_to_db(results: list[ChunkWithEmbedding]) -> None:
+    async def _produce(
+        windows: Iterator[list[ChunkInput]],
+        client: EmbeddingClient,
+        queue: asyncio.Queue[EmbeddedBatch | None],
+        sink: JsonArrayWriter,
+    ) -> tuple[int, int]:
         """
-        Write embeddings to the database.
+        Read and encode chunks window by window and hand them to the writer.
+
+        Reading and encoding run in worker threads so the event loop stays
+        free to drive database writes for earlier windows. When
+        ``skip_unchanged`` is set, each window's stored content hashes are
+        fetched in one query and unchanged chunks are dropped before encoding;
+        their stored embeddings are fetched in a second query and saved
+        straight to the output file. Unchanged chunks whose embedding cannot
+        be read back are embedded again.
+
+        Parameters
+        ----------
+        windows : Iterator[list[ChunkInput]]
+            Lazily-read windows of chunks to embed.
+        client : EmbeddingClient
+            Loaded embedding client.
+        queue : asyncio.Queue[EmbeddedBatch | None]
+            Bounded hand-off queue; ``None`` marks the end of the stream.
+        sink : JsonArrayWriter
+            Open writer for the output file, receiving unchanged chunks.
+
+        Returns
+        -------
+        tuple[int, int]
+            Number of chunks read and number of chunks embedded.
+        """
+        loaded = 0
+        embedded = 0
+        try:
+            async with AsyncExitStack() as stack:
+                session = await App._open_lookup_session(stack)
+                while (batch := await asyncio.to_thread(next, windows, None)) is not None:
+                    loaded += len(batch)
+                    if session is not None:
+                        try:
+                            existing = await fetch_existing_hashes(
+                                session, {c.document_name for c in batch}
+                            )
+                        except Exception as exc:  # noqa: BLE001
+                            print(f"Hash lookup skipped: {exc}")
+                            session = None
+                        else:
+                            batch = await App._save_unchanged(
+                                session,
+                                batch,
+                                drop_unchanged(batch, existing, client.model_version),
+                                sink,
+                            )
+                    if not batch:
+                        continue
+                    texts = [c.content for c in batch]
+                    embeddings = await asyncio.to_thread(
+                        client.encode_array, texts, task_inputs.batch_size
+                    )
+                    await queue.put((batch, embeddings))
+                    embedded += len(batch)
+        finally:
+            await queue.put(None)
+        return loaded, embedded
+
+    @staticmethod
+    async def _save_unchanged(
+        session: AsyncSession,
+        window: list[ChunkInput],
+        changed: list[ChunkInput],
+        sink: JsonArrayWriter,
+    ) -> list[ChunkInput]:
+        """
+        Save the unchanged chunks of a window with their stored embeddings.
 
         Parameters
         ----------
-        results : list[ChunkWithEmbedding]
-            Chunks with embeddings to persist.
+        session : AsyncSession
+            Session used to look up stored embeddings.
+        window : list[ChunkInput]
+            Chunks read in this window.
+        changed : list[ChunkInput]
+            Chunks of the window that are new or changed.
+        sink : JsonArrayWriter
+            Open writer for the output file.
+
+        Returns
+        -------
+        list[ChunkInput]
+            Chunks to embed: the changed ones, plus unchanged ones whose
+            stored embedding could not be read, in input order.
         """
+        changed_ids = {id(chunk) for chunk in changed}
+        unchanged = [chunk for chunk in window if id(chunk) not in changed_ids]
+        if not unchanged:
+            return changed
         try:
+            stored = await fetch_stored_embeddings(session, unchanged)
+        except Exception as exc:  # noqa: BLE001
+            print(f"Stored embedding lookup failed: {exc}")
+            stored = {}
+        pending = []
+        for chunk in window:
+            embedding = stored.get((chunk.document_name, chunk.chunk_index))
+            if id(chunk) in changed_ids or embedding is None:
+                pending.append(chunk)
+            else:
+                sink.write({**chunk.model_dump(), "embedding": embedding.tolist()})
+        return pending
+
+    @staticmethod
+    async def _open_lookup_session(stack: AsyncExitStack) -> AsyncSession | None:
+        """
+        Open the session used to look up stored content hashes.
+
+        Parameters
+        ----------
+        stack : AsyncExitStack
+            Exit stack that owns the session.
+
+        Returns
+        -------
+        AsyncSession | None
+            An open session, or None if ``skip_unchanged`` is disabled, a
+            rebuild is running or the database is unreachable, in which case
+            every chunk is embedded.
+        """
+        if not task_inputs.skip_unchanged or task_inputs.rebuild:
+            return None
+        try:
+            return await stack.enter_async_context(get_async_session(task_inputs.db_url))
+        except Exception as exc:  # noqa: BLE001
+            print(f"Hash lookup skipped: {exc}")
+            return None
+
+    async def _consume(
+        self,
+        queue: asyncio.Queue[EmbeddedBatch | None],
+        sink: JsonArrayWriter,
+        embedding_model: str,
+        table: str = LIVE_TABLE,
+    ) -> int:
+        """
+        Save embedded batches to the output file and the database.
+
+        When writing to the live table, the corpus version is bumped in the
+        same transaction as the writes, so readers invalidate their caches
+        once the new rows are visible. If the database is unreachable or a
+        write fails, the remaining batches are still saved to the output file.
+
+        Parameters
+        ----------
+        queue : asyncio.Queue[EmbeddedBatch | None]
+            Hand-off queue filled by the producer.
+        sink : JsonArrayWriter
+            Open writer for the output file.
+        embedding_model : str
+            Model version recorded with the rows.
+        table : str
+            Table the chunks are written to.
+
+        Returns
+        -------
+        int
+            Number of rows committed to the database; 0 if the write failed.
+        """
+        finished = False
+        count = 0
+        try:
+            t0 = time.perf_counter()
             async with get_async_session(task_inputs.db_url) as session:
-                count = await write_chunks(session, results)
-            print(f"Wrote {count} rows to database")
+                while (batch := await queue.get()) is not None:
+                    self._save(batch, sink)
+                    count += await self._write_batch(session, batch, embedding_model, table)
+                finished = True
+                live = count and table == LIVE_TABLE
+                version = await bump_corpus_version(session) if live else None
+            elapsed = time.perf_counter() - t0
+            rate = count / elapsed if elapsed > 0 else 0.0
+            print(f"Wrote {count} rows to database in {elapsed:.2f}s ({rate:.0f} rows/s)")
+            if version is not None:
+                print(f"Corpus version: {version}")
         except Exception as exc:  # noqa: BLE001
             print(f"DB write skipped: {exc}")
+            if not finished:
+                while (batch := await queue.get()) is not None:
+                    self._save(batch, sink)
+            return 0
+        return count
+
+    @staticmethod
+    async def _maintain_index() -> None:
+        """
+        Rebuild the IVFFlat index once the corpus has grown or drifted enough.
+
+        IVFFlat centroids are trained on the rows present at build time, so
+        after enough inserts the lists no longer fit the data. The index is
+        rebuilt concurrently, with a list count computed from the row count,
+        when the change since the last recorded build reaches
+        ``index_rebuild_threshold``. HNSW indexes absorb inserts and are left
+        alone. Failures are reported and do not fail the run.
+        """
+        settings = DbSettings(db_url=task_inputs.db_url)
+        if settings.index_type != "ivfflat":
+            return
+        engine = get_engine(settings.db_url, settings)
+        try:
+            async with engine.connect() as conn:
+                state = await fetch_index_state(conn)
+            reason = rebuild_reason(state, task_inputs.index_rebuild_threshold)
+            if reason is None:
+                print("Index rebuild: not needed")
+                return
+            print(f"Index rebuild: {reason}")
+            t0 = time.perf_counter()
+            params = await rebuild_embedding_index_concurrently(
+                engine, settings, reason, task_inputs.maintenance_work_mem
+            )
+            print(f"Index rebuilt with {params} in {time.perf_counter() - t0:.1f}s")
+        except Exception as exc:  # noqa: BLE001
+            print(f"Index maintenance skipped: {exc}")
+
+    @staticmethod
+    async def _build_ann_index(embedding_model: str) -> None:
+        """
+        Build and publish the HNSW artifact for the stored corpus.
+
+        Skipped when the current artifact was built from the same corpus
+        version. Failures are reported and do not fail the run.
+
+        Parameters
+        ----------
+        embedding_model : str
+            Model version recorded in the artifact metadata.
+        """
+        try:
+            t0 = time.perf_counter()
+            path, version, count = await build_ann_artifact(
+                get_engine(task_inputs.db_url),
+                task_inputs.ann_index_dir,
+                task_inputs.ann_m,
+                task_inputs.ann_ef_construction,
+                embedding_model,
+            )
+        except Exception as exc:  # noqa: BLE001
+            print(f"ANN index build skipped: {exc}")
+            return
+        if path is None:
+            print(f"ANN index: up to date (corpus version {version})")
+            return
+        elapsed = time.perf_counter() - t0
+        print(f"ANN index: {count} vectors published to {path} in {elapsed:.1f}s")
+
+    @staticmethod
+    async def _prepare_rebuild() -> Any:
+        """
+        Create the empty table a rebuild loads into.
+
+        Returns
+        -------
+        Any
+            Database timestamp when the rebuild started, or None if the table
+            could not be created.
+        """
+        engine = get_engine(task_inputs.db_url)
+        try:
+            async with engine.begin() as conn:
+                started_at = (await conn.execute(select(func.now()))).scalar_one()
+                await create_next_table(conn)
+        except Exception as exc:  # noqa: BLE001
+            print(f"Rebuild table setup failed: {exc}")
+            return None
+        return started_at
+
+    @staticmethod
+    async def _swap_in_rebuild(started_at: Any) -> None:
+        """
+        Index the loaded rebuild table and swap it in for ``document_chunks``.
+
+        If an index build or the swap fails, ``document_chunks`` is left as
+        it was and the run does not fail.
+
+        Parameters
+        ----------
+        started_at : Any
+            Database timestamp when the rebuild started.
+        """
+        settings = DbSettings(db_url=task_inputs.db_url)
+        engine = get_engine(settings.db_url, settings)
+        try:
+            t0 = time.perf_counter()
+            params = await build_next_indexes(engine, settings)
+            print(f"Indexes built with {params} in {time.perf_counter() - t0:.1f}s")
+            async with engine.begin() as conn:
+                version = await swap_in_next_table(conn, settings, params, started_at)
+            print(f"Swapped in rebuilt {LIVE_TABLE}; corpus version: {version}")
+        except Exception as exc:  # noqa: BLE001
+            print(f"Rebuild aborted: {exc}")
+
+    @staticmethod
+    def _save(batch: EmbeddedBatch, sink: JsonArrayWriter) -> None:
+        """
+        Append a batch to the output file.
+
+        Parameters
+        ----------
+        batch : EmbeddedBatch
+            Embedded chunks.
+        sink : JsonArrayWriter
+            Open writer for the output file.
+        """
+        chunks, embeddings = batch
+        for chunk, embedding in zip(chunks, embeddings, strict=True):
+            sink.write({**chunk.model_dump(), "embedding": embedding.tolist()})
+
+    @staticmethod
+    async def _write_batch(
+        session: AsyncSession,
+        batch: EmbeddedBatch,
+        embedding_model: str,
+        table: str = LIVE_TABLE,
+    ) -> int:
+        """
+        Write a batch to the database with the configured write path.
+
+        Parameters
+        ----------
+        session : AsyncSession
+            Active async database session.
+        batch : EmbeddedBatch
+            Embedded chunks to persist.
+        embedding_model : str
+            Model version recorded with the rows.
+        table : str
+            Table the chunks are written to.
+
+        Returns
+        -------
+        int
+            Number of rows affected.
+        """
+        chunks, embeddings = batch
+        if task_inputs.write_mode == "copy":
+            return await copy_chunks(
+                session,
+                chunks,
+                embeddings,
+                embedding_model=embedding_model,
+                table=table,
+            )
+        return await write_chunks(
+            session,
+            chunks,
+            embeddings,
+            batch_size=task_inputs.write_batch_size,
+            embedding_model=embedding_model,
+            table=table,
+        )
@@ -0,0 +1,130 @@
+"""Content-hash change detection for re-ingestion."""
+
+import hashlib
+import json
+
+import numpy as np
+from lib_orm.models import DocumentChunk
+from lib_schemas.schemas import ChunkInput
+from numpy.typing import NDArray
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ExistingHashes = dict[tuple[str, int], tuple[str | None, str | None]]
+
+
+def content_hash(chunk: ChunkInput) -> str:
+    """
+    Compute the content hash stored alongside a chunk's embedding.
+
+    The hash covers the chunk content and its metadata serialised as
+    canonical JSON, so a change to either is detected.
+
+    Parameters
+    ----------
+    chunk : ChunkInput
+        Chunk to hash.
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest.
+    """
+    digest = hashlib.sha256(chunk.content.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(json.dumps(chunk.metadata, sort_keys=True, separators=(",", ":")).encode())
+    return digest.hexdigest()
+
+
+async def fetch_existing_hashes(session: AsyncSession, document_names: set[str]) -> ExistingHashes:
+    """
+    Fetch the stored hash and model of every chunk of the given documents.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Active async database session.
+    document_names : set[str]
+        Documents to look up, fetched in a single query.
+
+    Returns
+    -------
+    ExistingHashes
+        ``(content_hash, embedding_model)`` keyed by
+        ``(document_name, chunk_index)``.
+    """
+    if not document_names:
+        return {}
+    stmt = select(
+        DocumentChunk.document_name,
+        DocumentChunk.chunk_index,
+        DocumentChunk.content_hash,
+        DocumentChunk.embedding_model,
+    ).where(DocumentChunk.document_name.in_(sorted(document_names)))
+    result = await session.execute(stmt)
+    return {(name, index): (digest, model) for name, index, digest, model in result}
+
+
+def drop_unchanged(
+    chunks: list[ChunkInput], existing: ExistingHashes, embedding_model: str
+) -> list[ChunkInput]:
+    """
+    Keep only chunks that are new or changed since they were last embedded.
+
+    A chunk is unchanged when a row with the same key exists and was
+    embedded from the same content hash by the same model.
+
+    Parameters
+    ----------
+    chunks : list[ChunkInput]
+        Chunks read from the input files.
+    existing : ExistingHashes
+        Stored hashes from ``fetch_existing_hashes``.
+    embedding_model : str
+        Model the current run embeds with.
+
+    Returns
+    -------
+    list[ChunkInput]
+        Chunks that need to be embedded and written, in input order.
+    """
+    return [
+        chunk
+        for chunk in chunks
+        if existing.get((chunk.document_name, chunk.chunk_index))
+        != (content_hash(chunk), embedding_model)
+    ]
+
+
+async def fetch_stored_embeddings(
+    session: AsyncSession, chunks: list[ChunkInput]
+) -> dict[tuple[str, int], NDArray[np.float32]]:
+    """
+    Fetch the stored embeddings of chunks skipped as unchanged.
+
+    Lets a run that skips unchanged chunks still write every chunk to the
+    output file, without embedding them again.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Active async database session.
+    chunks : list[ChunkInput]
+        Chunks to look up, fetched in a single query.
+
+    Returns
+    -------
+    dict[tuple[str, int], NDArray[np.float32]]
+        Embedding keyed by ``(document_name, chunk_index)``; chunks deleted
+        since their hash was read are missing.
+    """
+    if not chunks:
+        return {}
+    keys = sorted({(chunk.document_name, chunk.chunk_index) for chunk in chunks})
+    stmt = select(
+        DocumentChunk.document_name, DocumentChunk.chunk_index, DocumentChunk.embedding
+    ).where(tuple_(DocumentChunk.document_name, DocumentChunk.chunk_index).in_(keys))
+    result = await session.execute(stmt)
+    return {
+        (name, index): np.asarray(embedding, dtype=np.float32) for name, index, embedding in result
+    }
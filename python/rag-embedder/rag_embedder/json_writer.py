@@ -0,0 +1,94 @@
+"""Incremental writer for JSON array output files."""
+
+import json
+import textwrap
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self, TextIO
+
+
+class JsonArrayWriter:
+    """
+    Write a JSON array to disk one item at a time.
+
+    Produces the same document as ``json.dumps(items, indent=2)`` without
+    holding every item in memory. Use as a context manager; the closing
+    bracket is written on exit.
+
+    Parameters
+    ----------
+    path : Path
+        Output file path. Parent directories are created on open.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initialize the writer.
+
+        Parameters
+        ----------
+        path : Path
+            Output file path.
+        """
+        self.path = path
+        self.count = 0
+        self._file: TextIO | None = None
+
+    def __enter__(self) -> Self:
+        """
+        Open the output file and write the opening bracket.
+
+        Returns
+        -------
+        Self
+            The writer itself.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", encoding="utf-8")
+        self._file.write("[")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """
+        Write the closing bracket and close the file.
+
+        Parameters
+        ----------
+        exc_type : type[BaseException] | None
+            Exception type, if the block raised.
+        exc : BaseException | None
+            Exception instance, if the block raised.
+        tb : TracebackType | None
+            Traceback, if the block raised.
+        """
+        if self._file is None:
+            return
+        self._file.write("\n]" if self.count else "]")
+        self._file.close()
+        self._file = None
+
+    def write(self, item: dict[str, Any]) -> None:
+        """
+        Append one item to the array.
+
+        Parameters
+        ----------
+        item : dict[str, Any]
+            JSON-serialisable item.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer is not open.
+        """
+        if self._file is None:
+            msg = "JsonArrayWriter is not open"
+            raise RuntimeError(msg)
+        separator = ",\n" if self.count else "\n"
+        self._file.write(separator + textwrap.indent(json.dumps(item, indent=2), "  "))
+        self.count += 1
@@ -0,0 +1,142 @@
+"""Encoder for PostgreSQL's binary ``COPY`` format."""
+
+import json
+import struct
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+from lib_schemas.schemas import ChunkInput
+from numpy.typing import NDArray
+
+from rag_embedder.dedup import content_hash
+
+COPY_COLUMNS = (
+    "document_name",
+    "chunk_index",
+    "content",
+    "metadata",
+    "embedding",
+    "content_hash",
+    "embedding_model",
+)
+
+_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_HEADER = _SIGNATURE + struct.pack(">ii", 0, 0)
+_TRAILER = struct.pack(">h", -1)
+_JSONB_VERSION = b"\x01"
+_NULL = struct.pack(">i", -1)
+_WIRE_FLOAT = np.dtype(">f4")
+
+
+def _field(payload: bytes) -> bytes:
+    """
+    Prefix a field payload with its length.
+
+    Parameters
+    ----------
+    payload : bytes
+        Binary representation of the field value.
+
+    Returns
+    -------
+    bytes
+        Length-prefixed field.
+    """
+    return struct.pack(">i", len(payload)) + payload
+
+
+def encode_vector(values: NDArray[np.float32]) -> bytes:
+    """
+    Encode a vector in pgvector's binary wire format.
+
+    The format is a big-endian ``uint16`` dimension, a ``uint16`` reserved
+    field, then one big-endian ``float4`` per component, which is written
+    straight from the array buffer.
+
+    Parameters
+    ----------
+    values : NDArray[np.float32]
+        One-dimensional vector.
+
+    Returns
+    -------
+    bytes
+        Binary ``vector`` value.
+    """
+    return struct.pack(">HH", len(values), 0) + values.astype(_WIRE_FLOAT, copy=False).tobytes()
+
+
+def encode_row(
+    chunk: ChunkInput, embedding: NDArray[np.float32], embedding_model: str | None = None
+) -> bytes:
+    """
+    Encode one chunk as a binary ``COPY`` tuple.
+
+    Fields are written in ``COPY_COLUMNS`` order.
+
+    Parameters
+    ----------
+    chunk : ChunkInput
+        Chunk to encode.
+    embedding : NDArray[np.float32]
+        Embedding vector of the chunk.
+    embedding_model : str | None
+        Model that produced the embedding; written as ``NULL`` if None.
+
+    Returns
+    -------
+    bytes
+        Binary tuple including its field count.
+    """
+    return b"".join(
+        (
+            struct.pack(">h", len(COPY_COLUMNS)),
+            _field(chunk.document_name.encode("utf-8")),
+            _field(struct.pack(">i", chunk.chunk_index)),
+            _field(chunk.content.encode("utf-8")),
+            _field(_JSONB_VERSION + json.dumps(chunk.metadata).encode("utf-8")),
+            _field(encode_vector(embedding)),
+            _field(content_hash(chunk).encode("ascii")),
+            _NULL if embedding_model is None else _field(embedding_model.encode("utf-8")),
+        )
+    )
+
+
+def encode_copy_stream(
+    chunks: Iterable[ChunkInput],
+    embeddings: NDArray[np.float32],
+    buffer_size: int = 1 << 20,
+    embedding_model: str | None = None,
+) -> Iterator[bytes]:
+    """
+    Encode chunks as a binary ``COPY ... FROM STDIN`` stream.
+
+    Rows are grouped into buffers of roughly ``buffer_size`` bytes so the
+    stream can be consumed incrementally without materialising the whole
+    payload.
+
+    Parameters
+    ----------
+    chunks : Iterable[ChunkInput]
+        Chunks to encode.
+    embeddings : NDArray[np.float32]
+        Embedding matrix with one row per chunk, in the same order.
+    buffer_size : int
+        Approximate number of bytes per yielded buffer.
+    embedding_model : str | None
+        Model that produced the embeddings.
+
+    Yields
+    ------
+    bytes
+        Consecutive pieces of the binary ``COPY`` payload, starting with the
+        header and ending with the trailer.
+    """
+    buffer = bytearray(_HEADER)
+    for chunk, embedding in zip(chunks, embeddings, strict=True):
+        buffer += encode_row(chunk, embedding, embedding_model)
+        if len(buffer) >= buffer_size:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += _TRAILER
+    yield bytes(buffer)
@@ -0,0 +1,176 @@
+"""Streaming readers for chunk files produced by rag-loader."""
+
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from lib_schemas.schemas import ChunkInput
+
+_WHITESPACE = " \t\n\r"
+_CHUNK_PATTERNS = ("*.json", "*.jsonl")
+
+# Parser states for ``iter_json_array``
+_START, _FIRST_VALUE, _VALUE, _SEPARATOR = range(4)
+
+
+def iter_json_array(path: Path, read_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Yield the items of a top-level JSON array without loading the whole file.
+
+    The file is read ``read_size`` characters at a time and each item is
+    decoded as soon as it is complete. Files whose top-level value is not an
+    array yield nothing.
+
+    Parameters
+    ----------
+    path : Path
+        JSON file to read.
+    read_size : int
+        Number of characters to read per refill.
+
+    Yields
+    ------
+    Any
+        Each decoded array item, in file order.
+
+    Raises
+    ------
+    ValueError
+        If the array is malformed or truncated.
+    """
+    decoder = json.JSONDecoder()
+    state = _START
+    buffer = ""
+    pos = 0
+    eof = False
+    with path.open("r", encoding="utf-8") as handle:
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    if state == _START:
+                        return
+                    msg = f"Truncated JSON array in {path}"
+                    raise ValueError(msg)
+                data = handle.read(read_size)
+                buffer, pos, eof = data, 0, not data
+                continue
+
+            char = buffer[pos]
+            if state == _START:
+                if char != "[":
+                    return
+                pos += 1
+                state = _FIRST_VALUE
+            elif state == _SEPARATOR:
+                if char == "]":
+                    return
+                if char != ",":
+                    msg = f"Expected ',' or ']' at offset {pos} in {path}"
+                    raise ValueError(msg)
+                pos += 1
+                state = _VALUE
+            elif state == _FIRST_VALUE and char == "]":
+                return
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    item, end = None, -1
+                after = end
+                while 0 <= after < len(buffer) and buffer[after] in _WHITESPACE:
+                    after += 1
+                # A number cut by the buffer edge still decodes (``1`` of
+                # ``1.5``), so a value is only accepted once the next
+                # character that ends it, ``,`` or ``]``, has been read.
+                if end == -1 or (not eof and (after == len(buffer) or buffer[after] not in ",]")):
+                    if eof:
+                        msg = f"Invalid JSON value in {path}"
+                        raise ValueError(msg)
+                    data = handle.read(read_size)
+                    buffer, pos, eof = buffer[pos:] + data, 0, not data
+                    continue
+                yield item
+                pos = end
+                state = _SEPARATOR
+
+
+def iter_jsonl(path: Path) -> Iterator[Any]:
+    """
+    Yield one decoded value per non-empty line of a JSON Lines file.
+
+    Parameters
+    ----------
+    path : Path
+        JSONL file to read.
+
+    Yields
+    ------
+    Any
+        Each decoded line, in file order.
+    """
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_chunks(input_dir: str | Path) -> Iterator[ChunkInput]:
+    """
+    Stream chunks from every ``*.json`` and ``*.jsonl`` file in a directory.
+
+    Files are read in name order. ``*.json`` files must hold a top-level
+    array of chunks; ``*.jsonl`` files hold one chunk per line.
+
+    Parameters
+    ----------
+    input_dir : str | Path
+        Directory containing chunk files.
+
+    Yields
+    ------
+    ChunkInput
+        Each chunk, one at a time.
+    """
+    root = Path(input_dir)
+    paths = sorted({p for pattern in _CHUNK_PATTERNS for p in root.glob(pattern)})
+    for path in paths:
+        items = iter_jsonl(path) if path.suffix == ".jsonl" else iter_json_array(path)
+        for item in items:
+            yield ChunkInput(**item)
+
+
+def iter_windows(chunks: Iterable[ChunkInput], size: int) -> Iterator[list[ChunkInput]]:
+    """
+    Group a chunk stream into consecutive fixed-size windows.
+
+    Parameters
+    ----------
+    chunks : Iterable[ChunkInput]
+        Chunks to group.
+    size : int
+        Maximum window length.
+
+    Yields
+    ------
+    list[ChunkInput]
+        Consecutive windows; only the last one may be shorter than ``size``.
+
+    Raises
+    ------
+    ValueError
+        If ``size`` is not positive.
+    """
+    if size < 1:
+        msg = f"size must be positive, got {size}"
+        raise ValueError(msg)
+    window: list[ChunkInput] = []
+    for chunk in chunks:
+        window.append(chunk)
+        if len(window) == size:
+            yield window
+            window = []
+    if window:
+        yield window
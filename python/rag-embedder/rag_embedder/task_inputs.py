@@ -1,5 +1,7 @@
 """Task inputs module for rag-embedder."""
 
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,7 +13,7 @@ class TaskInputs(BaseSettings):
     Attributes
     ----------
     input_dir : str
-        Directory containing chunk JSON files to embed.
+        Directory containing chunk files (``*.json`` arrays or ``*.jsonl``) to embed.
     output_dir : str
         Directory to save embeddings as JSON.
     db_url : str
@@ -20,13 +22,50 @@ class TaskInputs(BaseSettings):
         Name of the sentence-transformers model.
     batch_size : int
         Number of chunks to embed per batch.
+    window_size : int
+        Number of chunks read, embedded and written per pipeline window.
+    write_batch_size : int
+        Number of rows per bulk ``INSERT ... ON CONFLICT`` statement, at most
+        3000 so a statement stays under PostgreSQL's limit of 32767 bind
+        parameters (about 9 per row).
+    write_mode : str
+        How rows reach the database: ``upsert`` for batched
+        ``INSERT ... ON CONFLICT`` statements, ``copy`` for a binary
+        ``COPY`` into a staging table merged in one statement.
+    queue_depth : int
+        Maximum number of embedded batches waiting to be written.
+    skip_unchanged : bool
+        Skip chunks whose stored content hash and embedding model match,
+        so only new or changed chunks are embedded and written.
+    embedding_cache_path : str
+        SQLite file for the persistent embedding cache; empty disables it.
+    embedding_cache_max_entries : int
+        Maximum number of vectors kept in the embedding cache.
+    index_maintenance : bool
+        After writing, rebuild an IVFFlat vector index once the corpus has
+        grown or drifted past ``index_rebuild_threshold``.
+    index_rebuild_threshold : float
+        Fraction of the last-built row count that must have been added or
+        removed to trigger a rebuild.
+    maintenance_work_mem : str
+        ``maintenance_work_mem`` for the index rebuild session.
+    rebuild : bool
+        Full reload: load every chunk into a fresh table without indexes,
+        build its indexes, then swap it in for ``document_chunks``.
+    ann_index_dir : str
+        Directory receiving the versioned HNSW artifact that rag-retriever
+        serves in-process; empty disables it.
+    ann_m : int
+        Maximum number of links per node on the HNSW upper layers.
+    ann_ef_construction : int
+        HNSW candidate list size while inserting.
     """
 
     model_config = SettingsConfigDict(cli_parse_args=True, cli_ignore_unknown_args=True)
 
     input_dir: str = Field(
         default="data/chunks",
-        description="Directory containing chunk JSON files to embed",
+        description="Directory containing chunk files (*.json arrays or *.jsonl) to embed",
     )
     output_dir: str = Field(
         default="data/embeddings",
@@ -44,6 +83,70 @@ class TaskInputs(BaseSettings):
         default=32,
         description="Number of chunks to embed per batch",
     )
+    window_size: int = Field(
+        default=500,
+        ge=1,
+        description="Number of chunks read, embedded and written per pipeline window",
+    )
+    write_batch_size: int = Field(
+        default=500,
+        ge=1,
+        le=3_000,
+        description="Number of rows per bulk INSERT ... ON CONFLICT statement",
+    )
+    write_mode: Literal["upsert", "copy"] = Field(
+        default="upsert",
+        description="Database write path: batched upserts or binary COPY via a staging table",
+    )
+    queue_depth: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum number of embedded batches waiting to be written",
+    )
+    skip_unchanged: bool = Field(
+        default=True,
+        description="Skip chunks whose stored content hash and embedding model are unchanged",
+    )
+    embedding_cache_path: str = Field(
+        default="",
+        description="SQLite file for the persistent embedding cache (empty disables it)",
+    )
+    embedding_cache_max_entries: int = Field(
+        default=100_000,
+        ge=1,
+        description="Maximum number of vectors kept in the embedding cache",
+    )
+    index_maintenance: bool = Field(
+        default=True,
+        description="Rebuild an IVFFlat index once the corpus has grown or drifted enough",
+    )
+    index_rebuild_threshold: float = Field(
+        default=0.2,
+        gt=0.0,
+        description="Fraction of rows added or removed since the last build to trigger a rebuild",
+    )
+    maintenance_work_mem: str = Field(
+        default="1GB",
+        description="maintenance_work_mem for the index rebuild session",
+    )
+    rebuild: bool = Field(
+        default=False,
+        description="Load into a fresh table, index it, then swap it in for document_chunks",
+    )
+    ann_index_dir: str = Field(
+        default="",
+        description="Directory for the HNSW artifact served by rag-retriever (empty disables it)",
+    )
+    ann_m: int = Field(
+        default=16,
+        ge=2,
+        description="Maximum number of links per node on the HNSW upper layers",
+    )
+    ann_ef_construction: int = Field(
+        default=100,
+        ge=1,
+        description="HNSW candidate list size while inserting",
+    )
 
 
 task_inputs = TaskInputs()  # type: ignore[call-arg, unused-ignore]
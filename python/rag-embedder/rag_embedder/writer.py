@@ -1,58 +1,270 @@
 """Batch writer for inserting chunk embeddings into pgvector."""
 
-from lib_orm.models import DocumentChunk
-from lib_schemas.schemas import ChunkWithEmbedding
-from sqlalchemy import select
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import numpy as np
+from lib_orm.fulltext import content_tsvector
+from lib_orm.reload import LIVE_TABLE, chunks_table
+from lib_schemas.schemas import ChunkInput
+from numpy.typing import NDArray
+from sqlalchemy import column, func, select, text
+from sqlalchemy import table as table_clause
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from rag_embedder.dedup import content_hash
+from rag_embedder.pgcopy import COPY_COLUMNS, encode_copy_stream
+
+_UPSERT_COLUMNS = (
+    "content",
+    "metadata",
+    "embedding",
+    "content_hash",
+    "embedding_model",
+    "content_tsv",
+)
+_STAGING_TABLE = "document_chunks_staging"
+
 
-async def write_chunks(session: AsyncSession, chunks: list[ChunkWithEmbedding]) -> int:
+def _dedupe(chunks: list[ChunkInput]) -> list[int]:
     """
-    Batch-insert chunks with embeddings into the database.
+    Keep only the last chunk for each ``(document_name, chunk_index)`` key.
 
-    Uses upsert semantics: existing rows matching ``(document_name, chunk_index)``
-    are updated; new rows are inserted.
+    PostgreSQL rejects an ``INSERT ... ON CONFLICT DO UPDATE`` statement that
+    touches the same row twice, so duplicates must be collapsed first.
+
+    Parameters
+    ----------
+    chunks : list[ChunkInput]
+        Chunks to deduplicate, in input order.
+
+    Returns
+    -------
+    list[int]
+        Positions of the chunks to keep, in first-seen key order.
+    """
+    unique: dict[tuple[str, int], int] = {}
+    for position, chunk in enumerate(chunks):
+        unique[(chunk.document_name, chunk.chunk_index)] = position
+    return list(unique.values())
+
+
+def _check_shapes(chunks: list[ChunkInput], embeddings: NDArray[np.float32]) -> None:
+    """
+    Check that there is exactly one embedding row per chunk.
+
+    Parameters
+    ----------
+    chunks : list[ChunkInput]
+        Chunks to write.
+    embeddings : NDArray[np.float32]
+        Embedding matrix.
+
+    Raises
+    ------
+    ValueError
+        If the row count does not match the number of chunks.
+    """
+    if embeddings.ndim != 2 or embeddings.shape[0] != len(chunks):
+        msg = f"expected {len(chunks)} embedding rows, got shape {embeddings.shape}"
+        raise ValueError(msg)
+
+
+def _to_row(
+    chunk: ChunkInput, embedding: NDArray[np.float32], embedding_model: str | None
+) -> dict[str, Any]:
+    """
+    Convert a chunk into a Core row keyed by column name.
+
+    Parameters
+    ----------
+    chunk : ChunkInput
+        Chunk to write.
+    embedding : NDArray[np.float32]
+        Embedding vector of the chunk.
+    embedding_model : str | None
+        Model that produced the embedding.
+
+    Returns
+    -------
+    dict[str, Any]
+        Column values for ``document_chunks``; ``content_tsv`` is computed
+        by the server from the content.
+    """
+    return {
+        "document_name": chunk.document_name,
+        "chunk_index": chunk.chunk_index,
+        "content": chunk.content,
+        "metadata": chunk.metadata,
+        "embedding": embedding,
+        "content_hash": content_hash(chunk),
+        "embedding_model": embedding_model,
+        "content_tsv": content_tsvector(chunk.content),
+    }
+
+
+async def write_chunks(
+    session: AsyncSession,
+    chunks: list[ChunkInput],
+    embeddings: NDArray[np.float32],
+    batch_size: int = 500,
+    embedding_model: str | None = None,
+    table: str = LIVE_TABLE,
+) -> int:
+    """
+    Batch-upsert chunks with embeddings into the database.
+
+    Sends one ``INSERT ... ON CONFLICT (document_name, chunk_index) DO UPDATE``
+    statement per batch of ``batch_size`` rows, bypassing ORM object
+    construction. Existing rows are updated in place; new rows are inserted.
 
     Parameters
     ----------
     session : AsyncSession
         Active async database session.
-    chunks : list[ChunkWithEmbedding]
-        Chunks with embeddings to write.
+    chunks : list[ChunkInput]
+        Chunks to write.
+    embeddings : NDArray[np.float32]
+        Embedding matrix with one row per chunk.
+    batch_size : int
+        Maximum number of rows per ``INSERT`` statement.
+    embedding_model : str | None
+        Model that produced the embeddings, stored with the content hash.
+    table : str
+        Table to write to; ``document_chunks_next`` during a full reload.
 
     Returns
     -------
     int
         Number of rows affected (inserted or updated).
+
+    Raises
+    ------
+    ValueError
+        If ``batch_size`` is not positive or the embedding matrix does not
+        have one row per chunk.
     """
+    if batch_size < 1:
+        msg = f"batch_size must be positive, got {batch_size}"
+        raise ValueError(msg)
+    _check_shapes(chunks, embeddings)
     if not chunks:
         return 0
 
+    rows = [_to_row(chunks[i], embeddings[i], embedding_model) for i in _dedupe(chunks)]
+    target = chunks_table(table)
+
     count = 0
-    for chunk in chunks:
-        result = await session.execute(
-            select(DocumentChunk).where(
-                DocumentChunk.document_name == chunk.document_name,
-                DocumentChunk.chunk_index == chunk.chunk_index,
-            )
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        stmt = insert(target).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[target.c.document_name, target.c.chunk_index],
+            set_={
+                **{name: stmt.excluded[name] for name in _UPSERT_COLUMNS},
+                "updated_at": func.now(),
+            },
         )
-        existing = result.scalar_one_or_none()
-
-        if existing is not None:
-            existing.content = chunk.content
-            existing.metadata_ = chunk.metadata
-            existing.embedding = chunk.embedding
-        else:
-            session.add(
-                DocumentChunk(
-                    document_name=chunk.document_name,
-                    chunk_index=chunk.chunk_index,
-                    content=chunk.content,
-                    metadata_=chunk.metadata,
-                    embedding=chunk.embedding,
-                )
-            )
-        count += 1
+        await session.execute(stmt)
+        count += len(batch)
 
-    await session.flush()
     return count
+
+
+async def _aiter_bytes(pieces: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Adapt a synchronous byte iterator for asyncpg's ``copy_to_table``.
+
+    Parameters
+    ----------
+    pieces : Iterator[bytes]
+        Synchronous iterator of payload pieces.
+
+    Yields
+    ------
+    bytes
+        The same pieces, one at a time.
+    """
+    for piece in pieces:
+        yield piece
+
+
+async def copy_chunks(
+    session: AsyncSession,
+    chunks: list[ChunkInput],
+    embeddings: NDArray[np.float32],
+    embedding_model: str | None = None,
+    table: str = LIVE_TABLE,
+) -> int:
+    """
+    Bulk-load chunks with binary ``COPY`` and merge them into the chunks table.
+
+    Rows are streamed into a temporary staging table through asyncpg's
+    ``COPY ... FROM STDIN (FORMAT binary)`` support, with the embedding
+    column encoded in pgvector's binary format. The staging table is then
+    merged into ``table`` with a single
+    ``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` statement.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Active async database session backed by asyncpg.
+    chunks : list[ChunkInput]
+        Chunks to write.
+    embeddings : NDArray[np.float32]
+        Embedding matrix with one row per chunk.
+    embedding_model : str | None
+        Model that produced the embeddings, stored with the content hash.
+    table : str
+        Table to merge into; ``document_chunks_next`` during a full reload.
+
+    Returns
+    -------
+    int
+        Number of rows affected (inserted or updated).
+
+    Raises
+    ------
+    ValueError
+        If the embedding matrix does not have one row per chunk.
+    """
+    _check_shapes(chunks, embeddings)
+    if not chunks:
+        return 0
+
+    await session.execute(
+        text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {_STAGING_TABLE} "
+            "(LIKE document_chunks INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+    )
+
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection: Any = raw_connection.driver_connection
+    keep = _dedupe(chunks)
+    await driver_connection.copy_to_table(
+        _STAGING_TABLE,
+        source=_aiter_bytes(
+            encode_copy_stream(
+                [chunks[i] for i in keep], embeddings[keep], embedding_model=embedding_model
+            )
+        ),
+        columns=list(COPY_COLUMNS),
+        format="binary",
+    )
+
+    target = chunks_table(table)
+    staging = table_clause(_STAGING_TABLE, *(column(name) for name in COPY_COLUMNS))
+    stmt = insert(target).from_select(
+        [*COPY_COLUMNS, "content_tsv"],
+        select(*(staging.c[name] for name in COPY_COLUMNS), content_tsvector(staging.c.content)),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[target.c.document_name, target.c.chunk_index],
+        set_={**{name: stmt.excluded[name] for name in _UPSERT_COLUMNS}, "updated_at": func.now()},
+    )
+    result = await session.execute(stmt)
+    await session.execute(text(f"TRUNCATE {_STAGING_TABLE}"))
+    return int(result.rowcount)  # type: ignore[attr-defined]
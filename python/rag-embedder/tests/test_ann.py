@@ -0,0 +1,79 @@
+"""Tests for the HNSW artifact build step."""
+
+import uuid
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from lib_embedding.hnsw import open_artifact
+
+from rag_embedder.ann import build_ann_artifact
+
+
+def _engine() -> MagicMock:
+    """
+    Build a mock engine whose connections are mocks.
+
+    Returns
+    -------
+    MagicMock
+        The mock engine.
+    """
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+    engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_build_publishes_corpus_version(tmp_path: Path) -> None:
+    """Test that the artifact indexes the fetched corpus under its version."""
+    ids = [uuid.uuid4() for _ in range(20)]
+    vectors = np.random.default_rng(0).standard_normal((20, 8)).astype(np.float32)
+    with (
+        patch("rag_embedder.ann.get_corpus_version", AsyncMock(return_value=5)),
+        patch("rag_embedder.ann.fetch_corpus", AsyncMock(return_value=(5, ids, vectors))),
+    ):
+        path, version, count = await build_ann_artifact(_engine(), tmp_path, 4, 32, "model")
+
+    assert path == tmp_path / "v5"
+    assert (version, count) == (5, 20)
+    artifact = open_artifact(tmp_path)
+    assert artifact.metadata["corpus_version"] == 5
+    assert artifact.metadata["embedding_model"] == "model"
+    assert artifact.chunk_id(3) == ids[3]
+    nodes, _ = artifact.graph.search(vectors[3], k=1)
+    assert nodes.tolist() == [3]
+
+
+@pytest.mark.asyncio
+async def test_build_skipped_when_up_to_date(tmp_path: Path) -> None:
+    """Test that nothing is rebuilt while the corpus version is unchanged."""
+    ids = [uuid.uuid4() for _ in range(5)]
+    vectors = np.eye(5, dtype=np.float32)
+    mock_fetch = AsyncMock(return_value=(2, ids, vectors))
+    with (
+        patch("rag_embedder.ann.get_corpus_version", AsyncMock(return_value=2)),
+        patch("rag_embedder.ann.fetch_corpus", mock_fetch),
+    ):
+        await build_ann_artifact(_engine(), tmp_path, 4, 32, "model")
+        path, version, count = await build_ann_artifact(_engine(), tmp_path, 4, 32, "model")
+
+    assert (path, version, count) == (None, 2, 0)
+    mock_fetch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_build_skipped_for_empty_corpus(tmp_path: Path) -> None:
+    """Test that an empty corpus publishes nothing."""
+    empty = np.empty((0, 0), dtype=np.float32)
+    with (
+        patch("rag_embedder.ann.get_corpus_version", AsyncMock(return_value=0)),
+        patch("rag_embedder.ann.fetch_corpus", AsyncMock(return_value=(0, [], empty))),
+    ):
+        path, _version, count = await build_ann_artifact(_engine(), tmp_path, 4, 32, "model")
+
+    assert path is None
+    assert count == 0
+    assert not (tmp_path / "CURRENT").exists()
@@ -0,0 +1,128 @@
+"""Tests for rag-embedder content-hash change detection."""
+
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+from lib_schemas.schemas import ChunkInput
+from sqlalchemy.dialects import postgresql
+
+from rag_embedder.dedup import (
+    content_hash,
+    drop_unchanged,
+    fetch_existing_hashes,
+    fetch_stored_embeddings,
+)
+
+MODEL = "all-MiniLM-L6-v2"
+
+
+def _make_chunk(
+    index: int, content: str = "Hello", metadata: dict[str, str] | None = None
+) -> ChunkInput:
+    """
+    Create a test ChunkInput.
+
+    Parameters
+    ----------
+    index : int
+        Chunk index.
+    content : str
+        Chunk content.
+    metadata : dict[str, str] | None
+        Chunk metadata. Empty if None.
+
+    Returns
+    -------
+    ChunkInput
+        A test chunk.
+    """
+    return ChunkInput(
+        document_name="doc.md", chunk_index=index, content=content, metadata=metadata or {}
+    )
+
+
+def test_content_hash_is_stable() -> None:
+    """Test that the hash ignores metadata key order and is a SHA-256 digest."""
+    first = _make_chunk(0, metadata={"a": "1", "b": "2"})
+    second = _make_chunk(5, metadata={"b": "2", "a": "1"})
+    assert content_hash(first) == content_hash(second)
+    assert len(content_hash(first)) == 64
+
+
+def test_content_hash_covers_content_and_metadata() -> None:
+    """Test that changing the content or the metadata changes the hash."""
+    base = content_hash(_make_chunk(0))
+    assert content_hash(_make_chunk(0, content="Hello!")) != base
+    assert content_hash(_make_chunk(0, metadata={"extension": ".md"})) != base
+
+
+def test_drop_unchanged() -> None:
+    """Test that only new, changed or re-modelled chunks are kept."""
+    unchanged = _make_chunk(0)
+    changed = _make_chunk(1, content="new text")
+    other_model = _make_chunk(2)
+    new = _make_chunk(3)
+    existing = {
+        ("doc.md", 0): (content_hash(unchanged), MODEL),
+        ("doc.md", 1): (content_hash(_make_chunk(1, content="old text")), MODEL),
+        ("doc.md", 2): (content_hash(other_model), "other-model"),
+    }
+
+    kept = drop_unchanged([unchanged, changed, other_model, new], existing, MODEL)
+
+    assert [c.chunk_index for c in kept] == [1, 2, 3]
+
+
+def test_drop_unchanged_legacy_rows() -> None:
+    """Test that rows written before hashes were stored are re-embedded."""
+    chunk = _make_chunk(0)
+    assert drop_unchanged([chunk], {("doc.md", 0): (None, None)}, MODEL) == [chunk]
+
+
+@pytest.mark.asyncio
+async def test_fetch_existing_hashes_single_query() -> None:
+    """Test that hashes for all documents are fetched in one query."""
+    session = AsyncMock()
+    session.execute.return_value = [("a.md", 0, "h0", MODEL), ("b.md", 3, None, None)]
+
+    existing = await fetch_existing_hashes(session, {"b.md", "a.md"})
+
+    assert existing == {("a.md", 0): ("h0", MODEL), ("b.md", 3): (None, None)}
+    session.execute.assert_awaited_once()
+    stmt = session.execute.await_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "FROM document_chunks" in sql
+    assert "document_name IN" in sql
+    assert "embedding" not in sql.split("FROM", 1)[0].replace("embedding_model", "")
+
+
+@pytest.mark.asyncio
+async def test_fetch_existing_hashes_empty() -> None:
+    """Test that no query is sent when there are no documents."""
+    session = AsyncMock()
+    assert await fetch_existing_hashes(session, set()) == {}
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_fetch_stored_embeddings_by_key() -> None:
+    """Test that stored embeddings are fetched by chunk key in one query."""
+    session = AsyncMock()
+    session.execute.return_value = [("test.md", 1, [0.5, 1.5])]
+
+    stored = await fetch_stored_embeddings(session, [_make_chunk(1), _make_chunk(2)])
+
+    assert list(stored) == [("test.md", 1)]
+    assert stored[("test.md", 1)].dtype == np.float32
+    assert stored[("test.md", 1)].tolist() == [0.5, 1.5]
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "(document_chunks.document_name, document_chunks.chunk_index) IN" in sql
+
+
+@pytest.mark.asyncio
+async def test_fetch_stored_embeddings_empty() -> None:
+    """Test that no query is sent when no chunk was skipped."""
+    session = AsyncMock()
+    assert await fetch_stored_embeddings(session, []) == {}
+    session.execute.assert_not_awaited()
@@ -0,0 +1,57 @@
+"""Tests for the incremental JSON array writer."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from rag_embedder.json_writer import JsonArrayWriter
+
+
+def test_writes_same_document_as_json_dumps(tmp_path: Path) -> None:
+    """
+    Test that the output matches ``json.dumps(items, indent=2)``.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    items = [{"a": 1, "b": [1.0, 2.0]}, {"a": 2, "b": []}]
+    path = tmp_path / "out" / "items.json"
+    with JsonArrayWriter(path) as writer:
+        for item in items:
+            writer.write(item)
+
+    assert writer.count == 2
+    assert path.read_text(encoding="utf-8") == json.dumps(items, indent=2)
+
+
+def test_empty_array(tmp_path: Path) -> None:
+    """
+    Test that writing no items produces an empty JSON array.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    path = tmp_path / "empty.json"
+    with JsonArrayWriter(path):
+        pass
+
+    assert json.loads(path.read_text(encoding="utf-8")) == []
+
+
+def test_write_requires_open(tmp_path: Path) -> None:
+    """
+    Test that writing outside the context manager raises.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    writer = JsonArrayWriter(tmp_path / "closed.json")
+    with pytest.raises(RuntimeError, match="not open"):
+        writer.write({"a": 1})
@@ -0,0 +1,138 @@
+"""Tests for the binary COPY encoder."""
+
+import json
+import struct
+
+import numpy as np
+from lib_schemas.schemas import ChunkInput
+from numpy.typing import NDArray
+
+from rag_embedder.dedup import content_hash
+from rag_embedder.pgcopy import COPY_COLUMNS, encode_copy_stream, encode_row, encode_vector
+
+
+def _make_chunk(index: int) -> ChunkInput:
+    """
+    Create a test ChunkInput.
+
+    Parameters
+    ----------
+    index : int
+        Chunk index.
+
+    Returns
+    -------
+    ChunkInput
+        A test chunk.
+    """
+    return ChunkInput(
+        document_name="doc.md",
+        chunk_index=index,
+        content=f"Pokémon chunk {index}",
+        metadata={"extension": ".md"},
+    )
+
+
+def _embeddings(count: int) -> NDArray[np.float32]:
+    """
+    Create a small embedding matrix with identical rows.
+
+    Parameters
+    ----------
+    count : int
+        Number of rows.
+
+    Returns
+    -------
+    NDArray[np.float32]
+        Matrix of shape ``(count, 3)``.
+    """
+    return np.tile(np.array([0.5, -1.0, 2.0], dtype=np.float32), (count, 1))
+
+
+def _read_fields(payload: bytes, offset: int) -> tuple[list[bytes | None], int]:
+    """
+    Decode one binary COPY tuple.
+
+    Parameters
+    ----------
+    payload : bytes
+        Binary COPY payload.
+    offset : int
+        Offset of the tuple's field count.
+
+    Returns
+    -------
+    tuple[list[bytes | None], int]
+        The raw field payloads (None for NULL) and the offset just past the tuple.
+    """
+    (count,) = struct.unpack_from(">h", payload, offset)
+    offset += 2
+    fields: list[bytes | None] = []
+    for _ in range(count):
+        (length,) = struct.unpack_from(">i", payload, offset)
+        offset += 4
+        if length == -1:
+            fields.append(None)
+            continue
+        fields.append(payload[offset : offset + length])
+        offset += length
+    return fields, offset
+
+
+def test_encode_vector_layout() -> None:
+    """Test that vectors use pgvector's dim/unused/float4 big-endian layout."""
+    encoded = encode_vector(np.array([1.0, 2.5], dtype=np.float32))
+    assert encoded == struct.pack(">HH2f", 2, 0, 1.0, 2.5)
+
+
+def test_encode_row_fields() -> None:
+    """Test that a row round-trips through the binary tuple layout."""
+    fields, _ = _read_fields(encode_row(_make_chunk(3), _embeddings(1)[0], "all-MiniLM-L6-v2"), 0)
+
+    assert len(fields) == len(COPY_COLUMNS)
+    assert fields[0].decode("utf-8") == "doc.md"
+    assert struct.unpack(">i", fields[1]) == (3,)
+    assert fields[2].decode("utf-8") == "Pokémon chunk 3"
+    assert fields[3][:1] == b"\x01"
+    assert json.loads(fields[3][1:]) == {"extension": ".md"}
+    assert struct.unpack(">HH3f", fields[4]) == (3, 0, 0.5, -1.0, 2.0)
+    assert fields[5].decode("ascii") == content_hash(_make_chunk(3))
+    assert fields[6] == b"all-MiniLM-L6-v2"
+
+
+def test_encode_row_null_model() -> None:
+    """Test that a missing embedding model is encoded as NULL."""
+    row = encode_row(_make_chunk(0), _embeddings(1)[0])
+    fields, end = _read_fields(row, 0)
+    assert fields[6] is None
+    assert end == len(row)
+
+
+def test_encode_copy_stream_framing() -> None:
+    """Test that the stream has a header, every tuple, and a trailer."""
+    payload = b"".join(encode_copy_stream([_make_chunk(0), _make_chunk(1)], _embeddings(2)))
+
+    assert payload.startswith(b"PGCOPY\n\xff\r\n\x00")
+    offset = 11 + 8
+    indexes = []
+    for _ in range(2):
+        fields, offset = _read_fields(payload, offset)
+        indexes.append(struct.unpack(">i", fields[1])[0])
+    assert indexes == [0, 1]
+    assert payload[offset:] == struct.pack(">h", -1)
+
+
+def test_encode_copy_stream_buffers() -> None:
+    """Test that a small buffer size splits the payload into several pieces."""
+    chunks = [_make_chunk(i) for i in range(4)]
+    pieces = list(encode_copy_stream(chunks, _embeddings(4), buffer_size=1))
+
+    assert len(pieces) == 5
+    assert b"".join(pieces) == b"".join(encode_copy_stream(chunks, _embeddings(4)))
+
+
+def test_encode_copy_stream_empty() -> None:
+    """Test that an empty input still produces a valid header and trailer."""
+    payload = b"".join(encode_copy_stream([], _embeddings(0)))
+    assert payload == b"PGCOPY\n\xff\r\n\x00" + struct.pack(">iih", 0, 0, -1)
@@ -0,0 +1,163 @@
+"""Tests for rag-embedder streaming chunk readers."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from rag_embedder.reader import iter_chunks, iter_json_array, iter_jsonl, iter_windows
+
+
+def _chunk(index: int) -> dict[str, object]:
+    """
+    Build a raw chunk dict as written by rag-loader.
+
+    Parameters
+    ----------
+    index : int
+        Chunk index.
+
+    Returns
+    -------
+    dict[str, object]
+        A chunk record.
+    """
+    return {
+        "document_name": "doc.md",
+        "chunk_index": index,
+        "content": f"Contenu {index} [avec, des] {{accolades}}",
+        "metadata": {"extension": ".md"},
+    }
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 7, 64, 1 << 16])
+def test_iter_json_array_matches_json_loads(tmp_path: Path, read_size: int) -> None:
+    """
+    Test that incremental parsing yields the same items as ``json.loads``.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    read_size : int
+        Number of characters read per refill.
+    """
+    items = [_chunk(0), 12345, 1.5, -0.25, 6.02e23, 1e-07, "tail", [1.5, 2], None, _chunk(1)]
+    path = tmp_path / "chunks.json"
+    path.write_text(json.dumps(items, indent=2), encoding="utf-8")
+
+    assert list(iter_json_array(path, read_size=read_size)) == items
+
+
+def test_iter_json_array_empty_and_non_array(tmp_path: Path) -> None:
+    """
+    Test that empty arrays and non-array documents yield nothing.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    empty = tmp_path / "empty.json"
+    empty.write_text(" [ ] ", encoding="utf-8")
+    obj = tmp_path / "object.json"
+    obj.write_text('{"chunks": []}', encoding="utf-8")
+    blank = tmp_path / "blank.json"
+    blank.write_text("", encoding="utf-8")
+
+    assert list(iter_json_array(empty)) == []
+    assert list(iter_json_array(obj)) == []
+    assert list(iter_json_array(blank)) == []
+
+
+@pytest.mark.parametrize("text", ['[{"a": 1}', '[{"a": 1} {"b": 2}]', '[{"a": }]'])
+def test_iter_json_array_malformed(tmp_path: Path, text: str) -> None:
+    """
+    Test that truncated or malformed arrays raise ValueError.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    text : str
+        Malformed file content.
+    """
+    path = tmp_path / "bad.json"
+    path.write_text(text, encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(path, read_size=4))
+
+
+def test_iter_jsonl_skips_blank_lines(tmp_path: Path) -> None:
+    """
+    Test that JSONL files yield one item per non-empty line.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    path = tmp_path / "chunks.jsonl"
+    path.write_text(json.dumps(_chunk(0)) + "\n\n" + json.dumps(_chunk(1)) + "\n", encoding="utf-8")
+
+    assert [item["chunk_index"] for item in iter_jsonl(path)] == [0, 1]
+
+
+def test_iter_chunks_reads_both_formats_in_name_order(tmp_path: Path) -> None:
+    """
+    Test that JSON and JSONL files are streamed in file name order.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    (tmp_path / "a.json").write_text(json.dumps([_chunk(0), _chunk(1)]), encoding="utf-8")
+    (tmp_path / "b.jsonl").write_text(json.dumps(_chunk(2)) + "\n", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    chunks = list(iter_chunks(tmp_path))
+
+    assert [c.chunk_index for c in chunks] == [0, 1, 2]
+    assert chunks[0].metadata == {"extension": ".md"}
+
+
+def test_iter_chunks_is_lazy(tmp_path: Path) -> None:
+    """
+    Test that chunks are produced before a later malformed file is reached.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    (tmp_path / "a.json").write_text(json.dumps([_chunk(0)]), encoding="utf-8")
+    (tmp_path / "b.json").write_text("[{", encoding="utf-8")
+
+    stream = iter_chunks(tmp_path)
+    assert next(stream).chunk_index == 0
+    with pytest.raises(ValueError):
+        next(stream)
+
+
+def test_iter_windows(tmp_path: Path) -> None:
+    """
+    Test that chunks are grouped into fixed-size windows.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    (tmp_path / "a.json").write_text(json.dumps([_chunk(i) for i in range(5)]), encoding="utf-8")
+
+    windows = list(iter_windows(iter_chunks(tmp_path), 2))
+
+    assert [[c.chunk_index for c in w] for w in windows] == [[0, 1], [2, 3], [4]]
+
+
+def test_iter_windows_invalid_size() -> None:
+    """Test that a non-positive window size is rejected."""
+    with pytest.raises(ValueError, match="size must be positive"):
+        list(iter_windows([], 0))
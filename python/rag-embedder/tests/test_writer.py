@@ -2,15 +2,19 @@
 
 from unittest.mock import AsyncMock, MagicMock
 
+import numpy as np
 import pytest
-from lib_schemas.schemas import ChunkWithEmbedding
+from lib_schemas.schemas import ChunkInput
+from numpy.typing import NDArray
+from sqlalchemy.dialects import postgresql
 
-from rag_embedder.writer import write_chunks
+from rag_embedder.dedup import content_hash
+from rag_embedder.writer import copy_chunks, write_chunks
 
 
-def _make_chunk(name: str, index: int) -> ChunkWithEmbedding:
+def _make_chunk(name: str, index: int, content: str | None = None) -> ChunkInput:
     """
-    Create a test ChunkWithEmbedding.
+    Create a test ChunkInput.
 
     Parameters
     ----------
@@ -18,104 +22,262 @@ def _make_chunk(name: str, index: int) -> ChunkWithEmbedding:
         Document name.
     index : int
         Chunk index.
+    content : str | None
+        Optional chunk content. Generated if None.
 
     Returns
     -------
-    ChunkWithEmbedding
-        A test chunk with a dummy embedding.
+    ChunkInput
+        A test chunk.
     """
-    return ChunkWithEmbedding(
+    return ChunkInput(
         document_name=name,
         chunk_index=index,
-        content=f"Content for {name} chunk {index}",
+        content=content or f"Content for {name} chunk {index}",
         metadata={},
-        embedding=[0.1] * 384,
     )
 
 
+def _embeddings(count: int) -> NDArray[np.float32]:
+    """
+    Create a dummy embedding matrix whose rows hold their own position.
+
+    Parameters
+    ----------
+    count : int
+        Number of rows.
+
+    Returns
+    -------
+    NDArray[np.float32]
+        Matrix of shape ``(count, 384)``.
+    """
+    return np.repeat(np.arange(count, dtype=np.float32)[:, None], 384, axis=1)
+
+
+def _executed_sql(session: AsyncMock, call: int = 0) -> str:
+    """
+    Compile the statement passed to ``session.execute`` to PostgreSQL SQL.
+
+    Parameters
+    ----------
+    session : AsyncMock
+        Mock session that received the statement.
+    call : int
+        Index of the ``execute`` call to inspect.
+
+    Returns
+    -------
+    str
+        The compiled SQL string.
+    """
+    stmt = session.execute.await_args_list[call].args[0]
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
 @pytest.mark.asyncio
 async def test_write_empty_list() -> None:
-    """Test that writing an empty list returns 0."""
+    """Test that writing an empty list returns 0 without touching the DB."""
     session = AsyncMock()
-    result = await write_chunks(session, [])
+    result = await write_chunks(session, [], _embeddings(0))
     assert result == 0
-    session.flush.assert_not_awaited()
+    session.execute.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_write_inserts_new_chunks() -> None:
-    """Test that new chunks are inserted via session.add."""
+async def test_write_uses_single_bulk_upsert() -> None:
+    """Test that a small write is sent as one INSERT ... ON CONFLICT statement."""
     session = AsyncMock()
-    # scalar_one_or_none returns None -> new row
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
-    session.execute.return_value = mock_result
 
-    chunks = [_make_chunk("doc.md", 0), _make_chunk("doc.md", 1)]
-    count = await write_chunks(session, chunks)
+    chunks = [_make_chunk("doc.md", i) for i in range(5)]
+    count = await write_chunks(session, chunks, _embeddings(len(chunks)))
 
-    assert count == 2
-    assert session.add.call_count == 2
-    session.flush.assert_awaited_once()
+    assert count == 5
+    session.execute.assert_awaited_once()
+    session.add.assert_not_called()
+    sql = _executed_sql(session)
+    assert "INSERT INTO document_chunks" in sql
+    assert "ON CONFLICT (document_name, chunk_index) DO UPDATE" in sql
+    assert "SELECT" not in sql
 
 
 @pytest.mark.asyncio
-async def test_write_updates_existing_chunks() -> None:
-    """Test that existing chunks are updated in place."""
-    existing_row = MagicMock()
-    existing_row.content = "old content"
-    existing_row.metadata_ = {}
-    existing_row.embedding = [0.0] * 384
+async def test_write_targets_given_table() -> None:
+    """Test that rows can be upserted into the rebuild table."""
+    session = AsyncMock()
+
+    await write_chunks(
+        session, [_make_chunk("doc.md", 0)], _embeddings(1), table="document_chunks_next"
+    )
+
+    sql = _executed_sql(session)
+    assert "INSERT INTO document_chunks_next" in sql
+    assert "ON CONFLICT (document_name, chunk_index) DO UPDATE" in sql
 
+
+@pytest.mark.asyncio
+async def test_write_updates_mutable_columns_only() -> None:
+    """Test that conflicting rows update content, metadata, embedding and hash."""
     session = AsyncMock()
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = existing_row
-    session.execute.return_value = mock_result
 
-    chunks = [_make_chunk("doc.md", 0)]
-    count = await write_chunks(session, chunks)
+    await write_chunks(session, [_make_chunk("doc.md", 0)], _embeddings(1))
 
-    assert count == 1
-    assert existing_row.content == "Content for doc.md chunk 0"
-    assert existing_row.embedding == [0.1] * 384
-    # Should NOT call session.add for updates
-    session.add.assert_not_called()
-    session.flush.assert_awaited_once()
+    sql = _executed_sql(session)
+    update_clause = sql.split("DO UPDATE SET", 1)[1]
+    assert "content = excluded.content" in update_clause
+    assert "metadata = excluded.metadata" in update_clause
+    assert "embedding = excluded.embedding" in update_clause
+    assert "content_hash = excluded.content_hash" in update_clause
+    assert "embedding_model = excluded.embedding_model" in update_clause
+    assert "content_tsv = excluded.content_tsv" in update_clause
+    assert "document_name" not in update_clause
 
 
 @pytest.mark.asyncio
-async def test_write_five_chunks() -> None:
-    """Test inserting 5 chunks returns count of 5."""
+async def test_write_stores_hash_and_model() -> None:
+    """Test that each row carries its content hash and embedding model."""
     session = AsyncMock()
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
-    session.execute.return_value = mock_result
 
-    chunks = [_make_chunk("doc.md", i) for i in range(5)]
-    count = await write_chunks(session, chunks)
+    chunk = _make_chunk("doc.md", 0)
+    await write_chunks(session, [chunk], _embeddings(1), embedding_model="all-MiniLM-L6-v2")
 
-    assert count == 5
-    assert session.add.call_count == 5
+    params = session.execute.await_args.args[0].compile(dialect=postgresql.dialect()).params
+    assert params["content_hash_m0"] == content_hash(chunk)
+    assert params["embedding_model_m0"] == "all-MiniLM-L6-v2"
+
+
+@pytest.mark.asyncio
+async def test_write_computes_tsvector_from_content() -> None:
+    """Test that each row's full-text vector is computed from its content."""
+    session = AsyncMock()
+
+    await write_chunks(session, [_make_chunk("doc.md", 0)], _embeddings(1))
+
+    sql = _executed_sql(session)
+    assert "to_tsvector('english'::regconfig, " in sql
+
+
+@pytest.mark.asyncio
+async def test_write_splits_into_batches() -> None:
+    """Test that rows are sent in batches of ``batch_size``."""
+    session = AsyncMock()
+
+    chunks = [_make_chunk("doc.md", i) for i in range(7)]
+    count = await write_chunks(session, chunks, _embeddings(7), batch_size=3)
+
+    assert count == 7
+    assert session.execute.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_write_deduplicates_keys() -> None:
+    """Test that duplicate keys collapse to the last occurrence."""
+    session = AsyncMock()
+
+    chunks = [
+        _make_chunk("doc.md", 0, "old"),
+        _make_chunk("doc.md", 1),
+        _make_chunk("doc.md", 0, "new"),
+    ]
+    count = await write_chunks(session, chunks, _embeddings(len(chunks)))
+
+    assert count == 2
+    params = session.execute.await_args.args[0].compile(dialect=postgresql.dialect()).params
+    contents = [value for key, value in params.items() if key.startswith("content")]
+    assert "new" in contents
+    assert "old" not in contents
+    assert params["embedding_m0"][0] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_write_invalid_batch_size() -> None:
+    """Test that a non-positive batch size is rejected."""
+    session = AsyncMock()
+    with pytest.raises(ValueError, match="batch_size must be positive"):
+        await write_chunks(session, [_make_chunk("doc.md", 0)], _embeddings(1), batch_size=0)
 
 
 @pytest.mark.asyncio
-async def test_write_mixed_insert_and_update() -> None:
-    """Test a mix of new and existing chunks."""
-    existing_row = MagicMock()
-    existing_row.content = "old"
-    existing_row.metadata_ = {}
-    existing_row.embedding = [0.0] * 384
+async def test_write_rejects_mismatched_embeddings() -> None:
+    """Test that the embedding matrix must have one row per chunk."""
+    session = AsyncMock()
+    with pytest.raises(ValueError, match="expected 2 embedding rows"):
+        await write_chunks(
+            session, [_make_chunk("doc.md", 0), _make_chunk("doc.md", 1)], _embeddings(1)
+        )
+    with pytest.raises(ValueError, match="expected 1 embedding rows"):
+        await copy_chunks(session, [_make_chunk("doc.md", 0)], _embeddings(2))
+
 
+def _copy_session() -> tuple[AsyncMock, AsyncMock]:
+    """
+    Create a mock session whose raw asyncpg connection records COPY calls.
+
+    Returns
+    -------
+    tuple[AsyncMock, AsyncMock]
+        The mock session and the mock asyncpg driver connection.
+    """
+    driver = AsyncMock()
+    raw = MagicMock()
+    raw.driver_connection = driver
+    connection = AsyncMock()
+    connection.get_raw_connection.return_value = raw
     session = AsyncMock()
-    # First call: existing, second call: new
-    result_existing = MagicMock()
-    result_existing.scalar_one_or_none.return_value = existing_row
-    result_new = MagicMock()
-    result_new.scalar_one_or_none.return_value = None
-    session.execute.side_effect = [result_existing, result_new]
+    session.connection.return_value = connection
+    merge_result = MagicMock()
+    merge_result.rowcount = 2
+    session.execute.side_effect = [MagicMock(), merge_result, MagicMock()]
+    return session, driver
+
+
+@pytest.mark.asyncio
+async def test_copy_empty_list() -> None:
+    """Test that copying an empty list returns 0 without touching the DB."""
+    session = AsyncMock()
+    assert await copy_chunks(session, [], _embeddings(0)) == 0
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_copy_streams_binary_into_staging() -> None:
+    """Test that rows are sent through a binary COPY into the staging table."""
+    session, driver = _copy_session()
 
     chunks = [_make_chunk("doc.md", 0), _make_chunk("doc.md", 1)]
-    count = await write_chunks(session, chunks)
+    count = await copy_chunks(session, chunks, _embeddings(2))
 
     assert count == 2
-    assert session.add.call_count == 1  # only the new one
+    driver.copy_to_table.assert_awaited_once()
+    call = driver.copy_to_table.await_args
+    assert call.args[0] == "document_chunks_staging"
+    assert call.kwargs["format"] == "binary"
+    assert call.kwargs["columns"] == [
+        "document_name",
+        "chunk_index",
+        "content",
+        "metadata",
+        "embedding",
+        "content_hash",
+        "embedding_model",
+    ]
+    payload = b"".join([piece async for piece in call.kwargs["source"]])
+    assert payload.startswith(b"PGCOPY\n\xff\r\n\x00")
+
+
+@pytest.mark.asyncio
+async def test_copy_merges_staging_with_upsert() -> None:
+    """Test that the staging table is merged with one ON CONFLICT statement."""
+    session, _driver = _copy_session()
+
+    await copy_chunks(session, [_make_chunk("doc.md", 0)], _embeddings(1))
+
+    create_sql = str(session.execute.await_args_list[0].args[0])
+    assert "CREATE TEMP TABLE IF NOT EXISTS document_chunks_staging" in create_sql
+    merge_sql = _executed_sql(session, call=1)
+    assert "INSERT INTO document_chunks" in merge_sql
+    assert "FROM document_chunks_staging" in merge_sql
+    assert "to_tsvector('english'::regconfig, document_chunks_staging.content)" in merge_sql
+    assert "ON CONFLICT (document_name, chunk_index) DO UPDATE" in merge_sql
+    truncate_sql = str(session.execute.await_args_list[2].args[0])
+    assert truncate_sql == "TRUNCATE document_chunks_staging"
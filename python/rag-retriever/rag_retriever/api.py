@@ -6,6 +6,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from rag_retriever.dependencies import init_dependencies, shutdown_dependencies
+from rag_retriever.routes.cache import router as cache_router
 from rag_retriever.routes.documents import router as documents_router
 from rag_retriever.routes.health import router as health_router
 from rag_retriever.routes.search import router as search_router
@@ -53,4 +54,5 @@ def create_app() -> FastAPI:
     app.include_router(health_router)
     app.include_router(search_router)
     app.include_router(documents_router)
+    app.include_router(cache_router)
     return app
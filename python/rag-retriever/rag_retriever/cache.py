@@ -0,0 +1,178 @@
+"""In-process LRU cache with entry, byte and time-to-live bounds."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by entries, bytes and age.
+
+    Entries older than ``ttl_s`` are treated as missing. When inserting
+    pushes the cache over ``max_entries`` or ``max_bytes``, the least
+    recently used entries are evicted. The cache is meant to be used from the
+    event loop and is not thread-safe.
+
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of entries.
+    max_bytes : int
+        Maximum total size of the cached values, as measured by ``sizeof``.
+    ttl_s : float
+        Time-to-live of an entry in seconds.
+    sizeof : Callable[[Any], int]
+        Function returning the size in bytes of a cached value.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_s: float,
+        sizeof: Callable[[Any], int],
+    ) -> None:
+        """
+        Initialize an empty cache.
+
+        Parameters
+        ----------
+        max_entries : int
+            Maximum number of entries.
+        max_bytes : int
+            Maximum total size of the cached values in bytes.
+        ttl_s : float
+            Time-to-live of an entry in seconds.
+        sizeof : Callable[[Any], int]
+            Function returning the size in bytes of a cached value.
+
+        Raises
+        ------
+        ValueError
+            If any bound is not positive.
+        """
+        if max_entries < 1 or max_bytes < 1 or ttl_s <= 0:
+            msg = "max_entries, max_bytes and ttl_s must be positive"
+            raise ValueError(msg)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._sizeof = sizeof
+        self._entries: OrderedDict[Any, tuple[Any, int, float]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached entries, including expired ones.
+
+        Returns
+        -------
+        int
+            Number of entries.
+        """
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Return the fraction of lookups served from the cache.
+
+        Returns
+        -------
+        float
+            Hits divided by lookups, or 0.0 before the first lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Any) -> Any | None:
+        """
+        Look up a value and mark it as recently used.
+
+        Parameters
+        ----------
+        key : Any
+            Hashable cache key.
+
+        Returns
+        -------
+        Any | None
+            The cached value, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, _size, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        """
+        Store a value, evicting least recently used entries over the bounds.
+
+        Values larger than ``max_bytes`` on their own are not cached.
+
+        Parameters
+        ----------
+        key : Any
+            Hashable cache key.
+        value : Any
+            Value to cache.
+        """
+        size = self._sizeof(value)
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size, time.monotonic() + self.ttl_s)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry, keeping the hit and miss counters."""
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return cache size and effectiveness counters.
+
+        Returns
+        -------
+        dict[str, float]
+            Entries, bytes, hits, misses, evictions and hit ratio.
+        """
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+    def _remove(self, key: Any) -> None:
+        """
+        Remove an entry and release its bytes.
+
+        Parameters
+        ----------
+        key : Any
+            Key of the entry to remove.
+        """
+        _value, size, _expires_at = self._entries.pop(key)
+        self.bytes -= size
@@ -1,64 +1,206 @@
-"""FastAPI dependency injection for database sessions and embedding client."""
-
-from collections.abc import AsyncGenerator
+"""FastAPI dependency injection for the database engine, embedding client and vector store."""
 
+from lib_embedding.cross_encoder import CrossEncoderClient
 from lib_embedding.embedding import EmbeddingClient
-from lib_orm.db import get_async_engine, get_async_session_factory
+from lib_orm.db import dispose_engines, get_engine
+from lib_orm.settings import DbSettings
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine
 
+from rag_retriever.cache import LRUCache
+from rag_retriever.query_encoder import QueryEncoder
+from rag_retriever.reranker import Reranker
+from rag_retriever.result_cache import SearchResultCache, cached_search_nbytes
+from rag_retriever.stores import HnswVectorStore, MemoryVectorStore, PgVectorStore, VectorStore
 from rag_retriever.task_inputs import task_inputs
 
 _engine: AsyncEngine | None = None
 _embedding_client: EmbeddingClient | None = None
+_query_encoder: QueryEncoder | None = None
+_query_cache: LRUCache | None = None
+_result_cache: SearchResultCache | None = None
+_vector_store: VectorStore | None = None
+_reranker: Reranker | None = None
+_uses_database = True
 
 
 async def init_dependencies() -> None:
     """
     Initialize shared resources at application startup.
 
-    Creates the async database engine and loads the embedding model.
+    Takes the shared async database engine, with its pool configured from
+    the ``RAG_`` database settings, loads the embedding model, opens the
+    configured vector store, starts the micro-batching query encoder with
+    its query embedding cache, loads the cross-encoder reranker if
+    ``rerank_model`` is set, and starts the search-result cache with its
+    corpus version poller.
+
+    A memory store loaded from ``memory_store_path`` runs without a
+    database. The memory store also runs without the search-result cache:
+    its writes stay in process and never bump the database corpus version
+    the cache is keyed on.
     """
-    global _engine, _embedding_client  # noqa: PLW0603
-    _engine = get_async_engine(task_inputs.db_url)
+    global _engine, _embedding_client, _query_encoder, _query_cache, _result_cache  # noqa: PLW0603
+    global _vector_store, _reranker, _uses_database  # noqa: PLW0603
+    memory = task_inputs.vector_store == "memory"
+    _uses_database = not (memory and task_inputs.memory_store_path)
+    _engine = None
+    if _uses_database:
+        _engine = get_engine(task_inputs.db_url, DbSettings(db_url=task_inputs.db_url))
     _embedding_client = EmbeddingClient(task_inputs.embedding_model)
+    _vector_store = await _open_vector_store(_engine, _embedding_client)
+    _query_cache = None
+    if task_inputs.query_cache_max_entries > 0:
+        _query_cache = LRUCache(
+            max_entries=task_inputs.query_cache_max_entries,
+            max_bytes=task_inputs.query_cache_max_bytes,
+            ttl_s=task_inputs.query_cache_ttl_s,
+            sizeof=lambda embedding: int(embedding.nbytes),
+        )
+    _query_encoder = QueryEncoder(
+        _embedding_client,
+        max_workers=task_inputs.embedding_workers,
+        batch_window_ms=task_inputs.embedding_batch_window_ms,
+        max_batch_size=task_inputs.embedding_max_batch_size,
+        cache=_query_cache,
+    )
+    _reranker = None
+    if task_inputs.rerank_model:
+        _reranker = Reranker(
+            CrossEncoderClient(task_inputs.rerank_model),
+            max_workers=task_inputs.rerank_workers,
+            batch_size=task_inputs.rerank_batch_size,
+            timeout_ms=task_inputs.rerank_timeout_ms,
+        )
+    _result_cache = None
+    if _engine is not None and not memory and task_inputs.result_cache_max_entries > 0:
+        _result_cache = SearchResultCache(
+            LRUCache(
+                max_entries=task_inputs.result_cache_max_entries,
+                max_bytes=task_inputs.result_cache_max_bytes,
+                ttl_s=task_inputs.result_cache_ttl_s,
+                sizeof=cached_search_nbytes,
+            ),
+            fetch_k=task_inputs.result_cache_fetch_k,
+            poll_interval_s=task_inputs.corpus_version_poll_s,
+        )
+        await _result_cache.refresh(_engine)
+        _result_cache.start(_engine)
+
+
+async def _open_vector_store(engine: AsyncEngine | None, client: EmbeddingClient) -> VectorStore:
+    """
+    Open the vector store selected by ``vector_store``.
+
+    Parameters
+    ----------
+    engine : AsyncEngine | None
+        Engine connected to the RAG database; None only for a memory store
+        loaded from ``memory_store_path``.
+    client : EmbeddingClient
+        Loaded embedding model, whose dimension and version the store's
+        vectors must match.
+
+    Returns
+    -------
+    VectorStore
+        The pgvector store, the HNSW store mapped from ``ann_index_dir``, or
+        a memory store loaded from ``memory_store_path`` or the database.
+
+    Raises
+    ------
+    ValueError
+        If the HNSW store is selected without ``ann_index_dir``, or its
+        artifact does not match the loaded model.
+    RuntimeError
+        If the selected store needs the database and ``engine`` is None.
+    """
+    if task_inputs.vector_store == "memory" and task_inputs.memory_store_path:
+        store = MemoryVectorStore.from_embeddings_file(
+            task_inputs.memory_store_path, client.dimension
+        )
+        return await _report_memory_store(store)
+    if engine is None:
+        msg = "Database engine not initialized"
+        raise RuntimeError(msg)
+    if task_inputs.vector_store == "pgvector":
+        return PgVectorStore(engine)
+    if task_inputs.vector_store == "hnsw":
+        if not task_inputs.ann_index_dir:
+            msg = "ann_index_dir is required by the hnsw vector store"
+            raise ValueError(msg)
+        hnsw = HnswVectorStore.open(
+            engine, task_inputs.ann_index_dir, client.dimension, client.model_version
+        )
+        artifact = hnsw.artifact
+        print(f"HNSW vector store: {len(artifact.graph)} vectors mapped from {artifact.version}")
+        return hnsw
+    return await _report_memory_store(
+        await MemoryVectorStore.from_database(engine, client.dimension)
+    )
+
+
+async def _report_memory_store(store: MemoryVectorStore) -> MemoryVectorStore:
+    """
+    Print the size of a loaded memory store.
+
+    Parameters
+    ----------
+    store : MemoryVectorStore
+        Loaded store.
+
+    Returns
+    -------
+    MemoryVectorStore
+        ``store`` itself.
+    """
+    stats = await store.stats()
+    print(f"Memory vector store: {stats.total_chunks} chunks loaded")
+    return store
 
 
 async def shutdown_dependencies() -> None:
     """Dispose of shared resources at application shutdown."""
-    global _engine, _embedding_client  # noqa: PLW0603
+    global _engine, _embedding_client, _query_encoder, _query_cache, _result_cache  # noqa: PLW0603
+    global _vector_store, _reranker, _uses_database  # noqa: PLW0603
+    if _result_cache is not None:
+        await _result_cache.stop()
+        _result_cache = None
+    if _vector_store is not None:
+        await _vector_store.close()
+        _vector_store = None
     if _engine is not None:
-        await _engine.dispose()
+        await dispose_engines()
         _engine = None
+    if _query_encoder is not None:
+        _query_encoder.shutdown()
+        _query_encoder = None
+    if _reranker is not None:
+        _reranker.shutdown()
+        _reranker = None
+    _query_cache = None
     _embedding_client = None
+    _uses_database = True
 
 
-async def get_db_session() -> AsyncGenerator[AsyncSession]:
+def get_vector_store() -> VectorStore:
     """
-    Yield an async database session for a single request.
+    Return the shared vector store.
 
-    Yields
-    ------
-    AsyncSession
-        An active async session that is committed on success and rolled back
-        on error.
+    Returns
+    -------
+    VectorStore
+        The store searches and stats are served from.
 
     Raises
     ------
     RuntimeError
         If called before ``init_dependencies``.
     """
-    if _engine is None:
-        msg = "Database engine not initialized"
+    if _vector_store is None:
+        msg = "Vector store not initialized"
         raise RuntimeError(msg)
-    factory = get_async_session_factory(_engine)
-    async with factory() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+    return _vector_store
 
 
 def get_embedding_client() -> EmbeddingClient:
@@ -81,15 +223,74 @@ def get_embedding_client() -> EmbeddingClient:
     return _embedding_client
 
 
-async def check_db_health() -> bool:
+def get_query_encoder() -> QueryEncoder:
+    """
+    Return the shared query encoder.
+
+    Returns
+    -------
+    QueryEncoder
+        The encoder running query embedding off the event loop.
+
+    Raises
+    ------
+    RuntimeError
+        If called before ``init_dependencies``.
+    """
+    if _query_encoder is None:
+        msg = "Query encoder not initialized"
+        raise RuntimeError(msg)
+    return _query_encoder
+
+
+def get_reranker() -> Reranker | None:
+    """
+    Return the shared cross-encoder reranker.
+
+    Returns
+    -------
+    Reranker | None
+        The reranker, or None if reranking is disabled or not initialized.
+    """
+    return _reranker
+
+
+def get_query_cache() -> LRUCache | None:
+    """
+    Return the shared query embedding cache.
+
+    Returns
+    -------
+    LRUCache | None
+        The cache, or None if it is disabled or not initialized.
+    """
+    return _query_cache
+
+
+def get_result_cache() -> SearchResultCache | None:
+    """
+    Return the shared search-result cache.
+
+    Returns
+    -------
+    SearchResultCache | None
+        The cache, or None if it is disabled or not initialized.
+    """
+    return _result_cache
+
+
+async def check_db_health() -> bool | None:
     """
     Check whether the database is reachable.
 
     Returns
     -------
-    bool
-        True if ``SELECT 1`` succeeds, False otherwise.
+    bool | None
+        True if ``SELECT 1`` succeeds, False otherwise; None if the service
+        runs without a database.
     """
+    if not _uses_database:
+        return None
     if _engine is None:
         return False
     try:
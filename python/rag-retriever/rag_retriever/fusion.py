@@ -0,0 +1,34 @@
+"""Reciprocal-rank fusion of ranked result lists."""
+
+import uuid
+from collections.abc import Sequence
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[uuid.UUID]], k: int = 60
+) -> list[tuple[uuid.UUID, float]]:
+    """
+    Fuse rankings by summing ``1 / (k + rank)`` over the lists of each item.
+
+    Only ranks are used, so rankings on incomparable scales (cosine
+    similarity, ``ts_rank_cd``) combine without normalisation. Matches the
+    fusion done in SQL by ``build_hybrid_search_stmt``.
+
+    Parameters
+    ----------
+    rankings : Sequence[Sequence[uuid.UUID]]
+        Ranked lists of chunk IDs, best first; ranks start at 1.
+    k : int
+        Rank offset damping the weight of top ranks.
+
+    Returns
+    -------
+    list[tuple[uuid.UUID, float]]
+        Every chunk ID with its fused score, highest first; ties keep the
+        order in which IDs were first seen.
+    """
+    scores: dict[uuid.UUID, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda entry: entry[1], reverse=True)
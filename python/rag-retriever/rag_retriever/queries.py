@@ -0,0 +1,356 @@
+"""SQL statements for the search endpoint."""
+
+import uuid
+from collections.abc import Collection
+from typing import NamedTuple
+
+import numpy as np
+from lib_orm.fulltext import any_terms_tsquery
+from lib_orm.models import DocumentChunk
+from lib_schemas.schemas import SearchEffort, SearchFilters
+from numpy.typing import NDArray
+from sqlalchemy import ColumnElement, Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+
+class IndexScanParams(NamedTuple):
+    """
+    pgvector index scan settings for one search effort level.
+
+    Attributes
+    ----------
+    ivfflat_probes : int
+        Number of IVFFlat lists probed (``ivfflat.probes``).
+    hnsw_ef_search : int
+        Size of the HNSW candidate list (``hnsw.ef_search``).
+    """
+
+    ivfflat_probes: int
+    hnsw_ef_search: int
+
+
+# Upper bound pgvector accepts for ``ivfflat.probes``, equal to its maximum
+# list count. pgvector caps probes at the index's list count, so this probes
+# every list whatever ``lists`` the last rebuild computed from the row count.
+_MAX_IVFFLAT_PROBES = 32_768
+
+# ``balanced``, the service default, probes more than pgvector's own defaults
+# (``ivfflat.probes = 1``, ``hnsw.ef_search = 40``), trading latency for
+# recall; ``fast`` stays close to them. ``exhaustive`` makes an IVFFlat scan
+# exact; an HNSW scan stays approximate, with a wide candidate list.
+SEARCH_EFFORT_PARAMS: dict[SearchEffort, IndexScanParams] = {
+    "fast": IndexScanParams(ivfflat_probes=1, hnsw_ef_search=20),
+    "balanced": IndexScanParams(ivfflat_probes=10, hnsw_ef_search=64),
+    "exhaustive": IndexScanParams(ivfflat_probes=_MAX_IVFFLAT_PROBES, hnsw_ef_search=400),
+}
+
+# Upper bound pgvector accepts for ``hnsw.ef_search``.
+_MAX_EF_SEARCH = 1000
+
+
+async def set_search_effort(
+    session: AsyncSession | AsyncConnection,
+    effort: SearchEffort,
+    limit: int,
+    filtered: bool = False,
+) -> None:
+    """
+    Apply index scan settings for the rest of the current transaction.
+
+    Uses ``set_config(..., true)``, the function form of ``SET LOCAL``, so
+    the settings revert when the transaction ends and never leak to other
+    requests sharing the pooled connection. ``hnsw.ef_search`` is raised to
+    at least ``limit``, since HNSW cannot return more rows than candidates.
+
+    A filtered search that the planner serves from the vector index drops
+    candidates failing the filter after the scan, which could leave fewer
+    than ``limit`` rows. ``filtered`` turns on pgvector's iterative index
+    scans (``relaxed_order``), which keep scanning until ``limit`` rows pass
+    the filter; the search statements re-sort by exact distance, so the
+    relaxed order never reaches the caller. Iterative scans need pgvector
+    0.8.0 or later; older versions reject the settings.
+
+    Parameters
+    ----------
+    session : AsyncSession | AsyncConnection
+        Session or connection the search will run in.
+    effort : SearchEffort
+        Requested recall/latency trade-off.
+    limit : int
+        Number of rows the search fetches.
+    filtered : bool
+        Whether the search filters chunks.
+    """
+    params = SEARCH_EFFORT_PARAMS[effort]
+    ef_search = min(max(params.hnsw_ef_search, limit), _MAX_EF_SEARCH)
+    sql = (
+        "SELECT set_config('ivfflat.probes', :probes, true), "
+        "set_config('hnsw.ef_search', :ef_search, true)"
+    )
+    if filtered:
+        sql += (
+            ", set_config('ivfflat.iterative_scan', 'relaxed_order', true)"
+            ", set_config('hnsw.iterative_scan', 'relaxed_order', true)"
+        )
+    await session.execute(
+        text(sql),
+        {"probes": str(params.ivfflat_probes), "ef_search": str(ef_search)},
+    )
+
+
+def build_filter_clauses(filters: SearchFilters | None) -> list[ColumnElement[bool]]:
+    """
+    Build the ``WHERE`` clauses of search filters.
+
+    Document names are matched through the ``document_name`` btree index and
+    metadata by containment (``metadata @> :filter``), which the
+    ``jsonb_path_ops`` GIN index serves. Given these clauses inside the
+    nearest-neighbour query, the planner chooses per query between
+    pre-filtering through those indexes and sorting the matches by exact
+    distance, or scanning the vector index and filtering as it goes.
+
+    Parameters
+    ----------
+    filters : SearchFilters | None
+        Requested filters.
+
+    Returns
+    -------
+    list[ColumnElement[bool]]
+        Clauses all matching chunks satisfy; empty if nothing is filtered.
+    """
+    if filters is None:
+        return []
+    clauses: list[ColumnElement[bool]] = []
+    if filters.document_names is not None:
+        clauses.append(DocumentChunk.document_name.in_(filters.document_names))
+    if filters.metadata:
+        clauses.append(DocumentChunk.metadata_.contains(filters.metadata))
+    return clauses
+
+
+def build_search_stmt(
+    query_embedding: NDArray[np.float32],
+    similarity_threshold: float,
+    limit: int,
+    filters: SearchFilters | None = None,
+) -> Select[tuple[object, ...]]:
+    """
+    Build the nearest-neighbour query over document chunks.
+
+    The inner query orders by the raw cosine distance ``embedding <=> :q``
+    with a ``LIMIT``, the shape pgvector's ANN indexes can serve directly.
+    The similarity threshold is applied by the outer query to those
+    candidates: since similarity decreases with distance, rows passing the
+    threshold are a prefix of the nearest neighbours, so filtering after the
+    limit returns the same rows without putting the computed expression in
+    the index scan's ``WHERE`` clause. Filters, unlike the threshold, go in
+    the inner query, so the ``LIMIT`` counts only matching chunks.
+
+    Only the columns a ``SearchResult`` needs are projected, so rows come
+    back as plain tuples ``(id, document_name, content, metadata,
+    similarity)`` without hydrating ORM entities or decoding the stored
+    embedding of every hit.
+
+    Parameters
+    ----------
+    query_embedding : NDArray[np.float32]
+        Query vector.
+    similarity_threshold : float
+        Minimum cosine similarity of returned chunks.
+    limit : int
+        Maximum number of rows.
+    filters : SearchFilters | None
+        Restricts the search to matching chunks.
+
+    Returns
+    -------
+    Select[tuple[object, ...]]
+        Statement returning rows ordered by descending similarity.
+    """
+    distance = DocumentChunk.embedding.cosine_distance(query_embedding).label("distance")
+    nearest = (
+        select(
+            DocumentChunk.id,
+            DocumentChunk.document_name,
+            DocumentChunk.content,
+            DocumentChunk.metadata_.label("metadata"),
+            distance,
+        )
+        .where(*build_filter_clauses(filters))
+        .order_by(distance)
+        .limit(limit)
+        .subquery("nearest")
+    )
+    similarity = (1 - nearest.c.distance).label("similarity")
+    return (
+        select(
+            nearest.c.id,
+            nearest.c.document_name,
+            nearest.c.content,
+            nearest.c.metadata,
+            similarity,
+        )
+        .where(similarity >= similarity_threshold)
+        .order_by(nearest.c.distance)
+    )
+
+
+def build_fetch_chunks_stmt(
+    chunk_ids: Collection[uuid.UUID], query_embedding: NDArray[np.float32] | None = None
+) -> Select[tuple[object, ...]]:
+    """
+    Build the query loading the result columns of chunks by ID.
+
+    Used to hydrate the hits of an in-process index, which only knows chunk
+    IDs. Rows come back as plain tuples ``(id, document_name, content,
+    metadata)``, followed by ``similarity`` if a query vector is given, in
+    no particular order.
+
+    Parameters
+    ----------
+    chunk_ids : Collection[uuid.UUID]
+        IDs of the chunks to load.
+    query_embedding : NDArray[np.float32] | None
+        Query vector to compute the cosine similarity of each chunk with.
+
+    Returns
+    -------
+    Select[tuple[object, ...]]
+        Statement returning one row per stored chunk among ``chunk_ids``.
+    """
+    columns = [
+        DocumentChunk.id,
+        DocumentChunk.document_name,
+        DocumentChunk.content,
+        DocumentChunk.metadata_.label("metadata"),
+    ]
+    if query_embedding is not None:
+        distance = DocumentChunk.embedding.cosine_distance(query_embedding)
+        columns.append((1 - distance).label("similarity"))
+    return select(*columns).where(DocumentChunk.id.in_(list(chunk_ids)))
+
+
+def build_lexical_search_stmt(
+    query_text: str, limit: int, filters: SearchFilters | None = None
+) -> Select[tuple[object, ...]]:
+    """
+    Build the full-text query ranking chunks that contain the query's terms.
+
+    Matches ``content_tsv`` through its GIN index against a query accepting
+    any of the terms, ranked by ``ts_rank_cd``.
+
+    Parameters
+    ----------
+    query_text : str
+        Raw query text.
+    limit : int
+        Maximum number of rows.
+    filters : SearchFilters | None
+        Restricts the search to matching chunks.
+
+    Returns
+    -------
+    Select[tuple[object, ...]]
+        Statement returning ``(id, rank_score)`` rows, best match first.
+    """
+    tsquery = any_terms_tsquery(query_text)
+    score = func.ts_rank_cd(DocumentChunk.content_tsv, tsquery).label("rank_score")
+    return (
+        select(DocumentChunk.id, score)
+        .where(DocumentChunk.content_tsv.op("@@")(tsquery), *build_filter_clauses(filters))
+        .order_by(score.desc(), DocumentChunk.id)
+        .limit(limit)
+    )
+
+
+def build_hybrid_search_stmt(
+    query_embedding: NDArray[np.float32],
+    query_text: str,
+    similarity_threshold: float,
+    limit: int,
+    candidates: int,
+    rrf_k: int,
+    filters: SearchFilters | None = None,
+) -> Select[tuple[object, ...]]:
+    """
+    Build the hybrid query fusing vector and full-text rankings in one statement.
+
+    Two candidate lists of ``candidates`` rows are ranked independently: the
+    nearest neighbours by cosine distance, in the index-friendly shape of
+    ``build_search_stmt``, and the full-text matches of
+    ``build_lexical_search_stmt``. A full outer join sums each chunk's
+    reciprocal-rank fusion score ``1 / (rrf_k + rank)`` over the lists it
+    appears in, so chunks ranked well by both come first without either
+    score scale dominating. The similarity threshold applies to the fused
+    rows, so lexical-only hits below it are dropped like vector hits are.
+
+    Parameters
+    ----------
+    query_embedding : NDArray[np.float32]
+        Query vector.
+    query_text : str
+        Raw query text.
+    similarity_threshold : float
+        Minimum cosine similarity of returned rows.
+    limit : int
+        Maximum number of rows.
+    candidates : int
+        Rows taken from each ranking before fusion.
+    rrf_k : int
+        Rank offset damping the weight of top ranks.
+    filters : SearchFilters | None
+        Restricts both rankings to matching chunks.
+
+    Returns
+    -------
+    Select[tuple[object, ...]]
+        Statement returning ``(id, document_name, content, metadata,
+        similarity, fusion)`` rows ordered by descending fusion score.
+    """
+    distance = DocumentChunk.embedding.cosine_distance(query_embedding).label("distance")
+    nearest = (
+        select(DocumentChunk.id, distance)
+        .where(*build_filter_clauses(filters))
+        .order_by(distance)
+        .limit(candidates)
+        .subquery("nearest")
+    )
+    vector_ranked = select(
+        nearest.c.id,
+        func.row_number().over(order_by=nearest.c.distance).label("rank"),
+    ).cte("vector_ranked")
+    lexical = build_lexical_search_stmt(query_text, candidates, filters).subquery("lexical")
+    lexical_ranked = select(
+        lexical.c.id,
+        func.row_number().over(order_by=(lexical.c.rank_score.desc(), lexical.c.id)).label("rank"),
+    ).cte("lexical_ranked")
+
+    fusion = (
+        func.coalesce(1.0 / (rrf_k + vector_ranked.c.rank), 0.0)
+        + func.coalesce(1.0 / (rrf_k + lexical_ranked.c.rank), 0.0)
+    ).label("fusion")
+    # At most 2 * candidates rows, so the threshold and limit are applied
+    # after joining back to the chunks
+    fused = (
+        select(func.coalesce(vector_ranked.c.id, lexical_ranked.c.id).label("id"), fusion)
+        .select_from(
+            vector_ranked.join(lexical_ranked, vector_ranked.c.id == lexical_ranked.c.id, full=True)
+        )
+        .subquery("fused")
+    )
+    similarity = (1 - DocumentChunk.embedding.cosine_distance(query_embedding)).label("similarity")
+    return (
+        select(
+            DocumentChunk.id,
+            DocumentChunk.document_name,
+            DocumentChunk.content,
+            DocumentChunk.metadata_.label("metadata"),
+            similarity,
+            fused.c.fusion,
+        )
+        .join(fused, fused.c.id == DocumentChunk.id)
+        .where(similarity >= similarity_threshold)
+        .order_by(fused.c.fusion.desc(), similarity.desc())
+        .limit(limit)
+    )
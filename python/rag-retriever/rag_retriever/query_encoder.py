@@ -0,0 +1,262 @@
+"""Off-event-loop, micro-batched query encoding for the search endpoint."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+from lib_embedding.cache import cache_key
+from lib_embedding.embedding import EmbeddingClient
+from numpy.typing import NDArray
+
+from rag_retriever.cache import LRUCache
+
+
+class EncodedQuery(NamedTuple):
+    """
+    A query embedding with its timing breakdown.
+
+    Attributes
+    ----------
+    embedding : NDArray[np.float32]
+        Query embedding vector.
+    queue_wait_ms : float
+        Time between submission and the start of inference, in milliseconds,
+        including the batching window and waiting for a free worker.
+    embedding_time_ms : float
+        Time spent running the model on the query's batch, in milliseconds.
+    batch_size : int
+        Number of queries encoded in the same forward pass; 0 for cache hits.
+    cached : bool
+        Whether the embedding was served from the query cache.
+    """
+
+    embedding: NDArray[np.float32]
+    queue_wait_ms: float
+    embedding_time_ms: float
+    batch_size: int
+    cached: bool = False
+
+
+class _PendingQuery(NamedTuple):
+    """A query waiting for its batch to be encoded."""
+
+    text: str
+    future: asyncio.Future[EncodedQuery]
+    submitted: float
+
+
+def query_cache_key(model_name: str, query: str) -> str:
+    """
+    Build the query cache key for a query embedded by a given model.
+
+    Runs of whitespace are collapsed before hashing, on top of the
+    normalisation applied by ``lib_embedding.cache.cache_key``.
+
+    Parameters
+    ----------
+    model_name : str
+        Model identity.
+    query : str
+        Raw query text.
+
+    Returns
+    -------
+    str
+        Cache key.
+    """
+    key: str = cache_key(model_name, " ".join(query.split()))
+    return key
+
+
+class QueryEncoder:
+    """
+    Encode search queries in micro-batches on a dedicated thread pool.
+
+    Model inference is CPU-bound; running it on the event loop would stall
+    every other in-flight request. Queries arriving within
+    ``batch_window_ms`` of each other, up to ``max_batch_size``, are encoded
+    together in one forward pass on the pool, and each caller receives its
+    own row of the result. With a ``cache``, repeated queries are answered
+    from memory without touching the model.
+
+    Parameters
+    ----------
+    client : EmbeddingClient
+        Loaded embedding client shared by all workers.
+    max_workers : int
+        Number of encoder threads.
+    batch_window_ms : float
+        How long the first query of a batch waits for others to join.
+    max_batch_size : int
+        Maximum number of queries per forward pass; a full batch is sent
+        without waiting for the window to close.
+    cache : LRUCache | None
+        Optional cache of query embeddings keyed by ``query_cache_key``.
+    """
+
+    def __init__(
+        self,
+        client: EmbeddingClient,
+        max_workers: int = 1,
+        batch_window_ms: float = 0.0,
+        max_batch_size: int = 1,
+        cache: LRUCache | None = None,
+    ) -> None:
+        """
+        Initialize the encoder and its thread pool.
+
+        Parameters
+        ----------
+        client : EmbeddingClient
+            Loaded embedding client.
+        max_workers : int
+            Number of encoder threads.
+        batch_window_ms : float
+            Batching window in milliseconds.
+        max_batch_size : int
+            Maximum number of queries per forward pass.
+        cache : LRUCache | None
+            Optional query embedding cache.
+
+        Raises
+        ------
+        ValueError
+            If ``max_workers`` or ``max_batch_size`` is not positive, or
+            ``batch_window_ms`` is negative.
+        """
+        if max_workers < 1:
+            msg = f"max_workers must be positive, got {max_workers}"
+            raise ValueError(msg)
+        if max_batch_size < 1:
+            msg = f"max_batch_size must be positive, got {max_batch_size}"
+            raise ValueError(msg)
+        if batch_window_ms < 0:
+            msg = f"batch_window_ms must not be negative, got {batch_window_ms}"
+            raise ValueError(msg)
+        self.client = client
+        self.max_workers = max_workers
+        self.batch_window_ms = batch_window_ms
+        self.max_batch_size = max_batch_size
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="query-encoder")
+        self._pending: list[_PendingQuery] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def encode(self, query: str) -> EncodedQuery:
+        """
+        Encode one query without blocking the event loop.
+
+        Parameters
+        ----------
+        query : str
+            Query text.
+
+        Returns
+        -------
+        EncodedQuery
+            The embedding with queue-wait and inference times.
+        """
+        key = None
+        if self.cache is not None:
+            t0 = time.perf_counter()
+            key = query_cache_key(self.client.model_name, query)
+            embedding = self.cache.get(key)
+            if embedding is not None:
+                return EncodedQuery(
+                    embedding=embedding,
+                    queue_wait_ms=0.0,
+                    embedding_time_ms=(time.perf_counter() - t0) * 1000,
+                    batch_size=0,
+                    cached=True,
+                )
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[EncodedQuery] = loop.create_future()
+        self._pending.append(_PendingQuery(query, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_window_ms / 1000, self._flush)
+        encoded = await future
+
+        if self.cache is not None and key is not None:
+            # Copy the row so the cache does not pin the whole batch matrix
+            embedding = encoded.embedding.copy()
+            embedding.flags.writeable = False
+            self.cache.put(key, embedding)
+        return encoded
+
+    def _flush(self) -> None:
+        """Send the pending queries to the pool as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[_PendingQuery]) -> None:
+        """
+        Encode a batch on the pool and resolve each caller's future.
+
+        Parameters
+        ----------
+        batch : list[_PendingQuery]
+            Queries to encode together.
+        """
+        texts = [pending.text for pending in batch]
+
+        def run() -> tuple[NDArray[np.float32], float, float]:
+            """
+            Encode the batch on a worker thread.
+
+            Returns
+            -------
+            tuple[NDArray[np.float32], float, float]
+                The embedding matrix and the start and end times of inference.
+            """
+            started = time.perf_counter()
+            embeddings = self.client.encode_array(texts)
+            return embeddings, started, time.perf_counter()
+
+        loop = asyncio.get_running_loop()
+        try:
+            embeddings, started, finished = await loop.run_in_executor(self._executor, run)
+        except Exception as exc:  # noqa: BLE001
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(exc)
+            return
+        except asyncio.CancelledError:
+            for pending in batch:
+                pending.future.cancel()
+            raise
+
+        embedding_time_ms = (finished - started) * 1000
+        for row, pending in enumerate(batch):
+            if not pending.future.done():
+                pending.future.set_result(
+                    EncodedQuery(
+                        embedding=embeddings[row],
+                        queue_wait_ms=(started - pending.submitted) * 1000,
+                        embedding_time_ms=embedding_time_ms,
+                        batch_size=len(batch),
+                    )
+                )
+
+    def shutdown(self) -> None:
+        """Stop the worker threads and fail queries that have not started."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        for pending in batch:
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError("Query encoder shut down"))
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,172 @@
+"""Cross-encoder reranking of search candidates under a latency budget."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+from lib_embedding.cross_encoder import CrossEncoderClient
+from lib_schemas.schemas import SearchResult
+from numpy.typing import NDArray
+
+
+class RerankOutcome(NamedTuple):
+    """
+    Candidates after the rerank stage.
+
+    Attributes
+    ----------
+    results : list[SearchResult]
+        Candidates ordered by cross-encoder score, or in their original
+        order if reranking did not finish in time.
+    rerank_time_ms : float
+        Time from submission to the end of the stage, in milliseconds.
+    reranked : bool
+        Whether ``results`` were reordered by the cross-encoder.
+    """
+
+    results: list[SearchResult]
+    rerank_time_ms: float
+    reranked: bool
+
+
+class Reranker:
+    """
+    Rerank search candidates with a cross-encoder on a dedicated thread pool.
+
+    Cross-encoder inference is CPU-bound and much slower than the vector
+    search, so it runs off the event loop on its own pool, separate from the
+    query encoder's. Each call has a deadline: if the scores are not ready
+    in ``timeout_ms``, the candidates are returned in their original order.
+    Candidates are scored in batches of ``batch_size`` pairs and the worker
+    checks the deadline between batches, so a request that has already
+    fallen back does not keep a worker busy.
+
+    Parameters
+    ----------
+    client : CrossEncoderClient
+        Loaded cross-encoder shared by all workers.
+    max_workers : int
+        Number of reranker threads.
+    batch_size : int
+        Number of query/passage pairs per forward pass.
+    timeout_ms : float
+        Latency budget of one rerank call, in milliseconds.
+    """
+
+    def __init__(
+        self,
+        client: CrossEncoderClient,
+        max_workers: int = 1,
+        batch_size: int = 32,
+        timeout_ms: float = 200.0,
+    ) -> None:
+        """
+        Initialize the reranker and its thread pool.
+
+        Parameters
+        ----------
+        client : CrossEncoderClient
+            Loaded cross-encoder.
+        max_workers : int
+            Number of reranker threads.
+        batch_size : int
+            Number of pairs per forward pass.
+        timeout_ms : float
+            Latency budget in milliseconds.
+
+        Raises
+        ------
+        ValueError
+            If ``max_workers``, ``batch_size`` or ``timeout_ms`` is not
+            positive.
+        """
+        if max_workers < 1:
+            msg = f"max_workers must be positive, got {max_workers}"
+            raise ValueError(msg)
+        if batch_size < 1:
+            msg = f"batch_size must be positive, got {batch_size}"
+            raise ValueError(msg)
+        if timeout_ms <= 0:
+            msg = f"timeout_ms must be positive, got {timeout_ms}"
+            raise ValueError(msg)
+        self.client = client
+        self.batch_size = batch_size
+        self.timeout_ms = timeout_ms
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="reranker")
+
+    async def rerank(self, query: str, candidates: list[SearchResult]) -> RerankOutcome:
+        """
+        Order candidates by cross-encoder score within the latency budget.
+
+        Parameters
+        ----------
+        query : str
+            Query text.
+        candidates : list[SearchResult]
+            Candidates from the vector store, best first.
+
+        Returns
+        -------
+        RerankOutcome
+            Reranked candidates with their ``rerank_score`` set, or the
+            candidates unchanged if the deadline passed first.
+        """
+        t0 = time.perf_counter()
+        if not candidates:
+            return RerankOutcome([], 0.0, reranked=False)
+        deadline = t0 + self.timeout_ms / 1000
+        passages = [candidate.content for candidate in candidates]
+        loop = asyncio.get_running_loop()
+        scores: NDArray[np.float32] | None
+        try:
+            scores = await asyncio.wait_for(
+                loop.run_in_executor(self._executor, self._score, query, passages, deadline),
+                timeout=max(deadline - time.perf_counter(), 0.0),
+            )
+        except TimeoutError:
+            scores = None
+        rerank_time_ms = (time.perf_counter() - t0) * 1000
+        if scores is None:
+            return RerankOutcome(candidates, rerank_time_ms, reranked=False)
+
+        # Stable sort, so equal scores keep the vector store's order
+        order = np.argsort(-scores, kind="stable")
+        results = [
+            candidates[row].model_copy(update={"rerank_score": float(scores[row])})
+            for row in order.tolist()
+        ]
+        return RerankOutcome(results, rerank_time_ms, reranked=True)
+
+    def _score(
+        self, query: str, passages: list[str], deadline: float
+    ) -> NDArray[np.float32] | None:
+        """
+        Score passages batch by batch on a worker thread.
+
+        Parameters
+        ----------
+        query : str
+            Query text.
+        passages : list[str]
+            Candidate passages.
+        deadline : float
+            ``time.perf_counter()`` value after which scoring is abandoned.
+
+        Returns
+        -------
+        NDArray[np.float32] | None
+            One score per passage, or None if the deadline passed.
+        """
+        scores = np.empty(len(passages), dtype=np.float32)
+        for start in range(0, len(passages), self.batch_size):
+            if time.perf_counter() >= deadline:
+                return None
+            batch = passages[start : start + self.batch_size]
+            scores[start : start + len(batch)] = self.client.score(query, batch, self.batch_size)
+        return scores
+
+    def shutdown(self) -> None:
+        """Stop the worker threads and drop calls that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
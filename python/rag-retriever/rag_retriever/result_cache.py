@@ -0,0 +1,248 @@
+"""Search-result cache invalidated by the corpus version."""
+
+import asyncio
+import contextlib
+import json
+from typing import Any, NamedTuple
+
+import numpy as np
+from lib_orm.corpus import get_corpus_version
+from lib_schemas.schemas import SearchRequest, SearchResult
+from numpy.typing import NDArray
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from rag_retriever.cache import LRUCache
+from rag_retriever.query_encoder import query_cache_key
+
+# Rough per-result overhead of the pydantic model and its fields, in bytes.
+_RESULT_OVERHEAD_BYTES = 256
+
+
+class CachedSearch(NamedTuple):
+    """
+    Ranked results of one search, fetched deep enough to serve smaller ``top_k``.
+
+    Attributes
+    ----------
+    results : list[SearchResult]
+        Results ranked by similarity, at most ``limit`` of them.
+    query_embedding : NDArray[np.float32]
+        Embedding of the query.
+    limit : int
+        ``LIMIT`` the results were fetched with.
+    """
+
+    results: list[SearchResult]
+    query_embedding: NDArray[np.float32]
+    limit: int
+
+    def covers(self, top_k: int) -> bool:
+        """
+        Check whether the entry holds the full answer for ``top_k``.
+
+        Parameters
+        ----------
+        top_k : int
+            Number of results requested.
+
+        Returns
+        -------
+        bool
+            True if ``top_k`` fits in the fetched limit, or if fewer rows than
+            the limit matched, so no more exist.
+        """
+        return top_k <= self.limit or len(self.results) < self.limit
+
+
+def cached_search_nbytes(entry: CachedSearch) -> int:
+    """
+    Estimate the memory held by a cached search.
+
+    Parameters
+    ----------
+    entry : CachedSearch
+        Cached search.
+
+    Returns
+    -------
+    int
+        Approximate size in bytes.
+    """
+    size = int(entry.query_embedding.nbytes)
+    for result in entry.results:
+        size += _RESULT_OVERHEAD_BYTES + len(result.content) + len(result.document_name)
+        size += sum(len(key) + len(str(value)) for key, value in result.metadata.items())
+    return size
+
+
+class SearchResultCache:
+    """
+    Cache of ranked search results keyed by request and corpus version.
+
+    Entries are keyed on the normalised query and every request parameter
+    except ``top_k``: results are fetched ``fetch_k`` deep and sliced, so
+    requests differing only in ``top_k`` share an entry. The key also holds
+    the corpus version, which writers bump in ``corpus_state`` whenever they
+    change ``document_chunks``; a background task polls it and drops every
+    entry when it moves. Until the version has been read once, nothing is
+    cached.
+
+    Parameters
+    ----------
+    cache : LRUCache
+        Underlying bounded cache.
+    fetch_k : int
+        Minimum number of results fetched per search.
+    poll_interval_s : float
+        Seconds between corpus version polls.
+    """
+
+    def __init__(self, cache: LRUCache, fetch_k: int, poll_interval_s: float) -> None:
+        """
+        Initialize the cache.
+
+        Parameters
+        ----------
+        cache : LRUCache
+            Underlying bounded cache.
+        fetch_k : int
+            Minimum number of results fetched per search.
+        poll_interval_s : float
+            Seconds between corpus version polls.
+
+        Raises
+        ------
+        ValueError
+            If ``fetch_k`` or ``poll_interval_s`` is not positive.
+        """
+        if fetch_k < 1 or poll_interval_s <= 0:
+            msg = "fetch_k and poll_interval_s must be positive"
+            raise ValueError(msg)
+        self.cache = cache
+        self.fetch_k = fetch_k
+        self.poll_interval_s = poll_interval_s
+        self.version: int | None = None
+        self._poller: asyncio.Task[None] | None = None
+
+    def fetch_limit(self, top_k: int) -> int:
+        """
+        Return how many results to fetch for a request.
+
+        Parameters
+        ----------
+        top_k : int
+            Number of results requested.
+
+        Returns
+        -------
+        int
+            The larger of ``top_k`` and ``fetch_k``.
+        """
+        return max(top_k, self.fetch_k)
+
+    def key(self, model_name: str, request: SearchRequest) -> tuple[Any, ...] | None:
+        """
+        Build the cache key for a request at the current corpus version.
+
+        Parameters
+        ----------
+        model_name : str
+            Model the query is embedded with.
+        request : SearchRequest
+            Search request.
+
+        Returns
+        -------
+        tuple[Any, ...] | None
+            Cache key, or None while the corpus version is unknown.
+        """
+        if self.version is None:
+            return None
+        params = request.model_dump(mode="json", exclude={"query", "top_k"})
+        return (
+            self.version,
+            query_cache_key(model_name, request.query),
+            json.dumps(params, sort_keys=True),
+        )
+
+    def get(self, key: tuple[Any, ...], top_k: int) -> CachedSearch | None:
+        """
+        Look up the cached search for a key if it can answer ``top_k``.
+
+        Parameters
+        ----------
+        key : tuple[Any, ...]
+            Key from ``key``.
+        top_k : int
+            Number of results requested.
+
+        Returns
+        -------
+        CachedSearch | None
+            The cached search, or None on a miss.
+        """
+        entry: CachedSearch | None = self.cache.get(key)
+        if entry is None or not entry.covers(top_k):
+            return None
+        return entry
+
+    def put(self, key: tuple[Any, ...], entry: CachedSearch) -> None:
+        """
+        Store a search, unless the corpus has changed since its key was built.
+
+        Parameters
+        ----------
+        key : tuple[Any, ...]
+            Key from ``key``.
+        entry : CachedSearch
+            Search to cache.
+        """
+        if key[0] == self.version:
+            self.cache.put(key, entry)
+
+    async def refresh(self, engine: AsyncEngine) -> None:
+        """
+        Read the corpus version and drop every entry if it changed.
+
+        Read errors leave the known version unchanged.
+
+        Parameters
+        ----------
+        engine : AsyncEngine
+            Engine to read ``corpus_state`` with.
+        """
+        try:
+            async with engine.connect() as conn:
+                version = await get_corpus_version(conn)
+        except Exception as exc:  # noqa: BLE001
+            print(f"Corpus version poll failed: {exc}")
+            return
+        if version != self.version:
+            self.cache.clear()
+            self.version = version
+
+    def start(self, engine: AsyncEngine) -> None:
+        """
+        Start polling the corpus version in the background.
+
+        Parameters
+        ----------
+        engine : AsyncEngine
+            Engine to read ``corpus_state`` with.
+        """
+
+        async def poll() -> None:
+            """Refresh the corpus version every ``poll_interval_s`` seconds."""
+            while True:
+                await asyncio.sleep(self.poll_interval_s)
+                await self.refresh(engine)
+
+        self._poller = asyncio.get_running_loop().create_task(poll())
+
+    async def stop(self) -> None:
+        """Stop the background poller."""
+        if self._poller is not None:
+            self._poller.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._poller
+            self._poller = None
@@ -0,0 +1,25 @@
+"""Cache statistics endpoint."""
+
+from fastapi import APIRouter
+
+from rag_retriever.dependencies import get_query_cache, get_result_cache
+
+router = APIRouter(prefix="/cache")
+
+
+@router.get("/stats")
+async def cache_stats() -> dict[str, dict[str, float] | None]:
+    """
+    Return size and hit-ratio counters of the in-process caches.
+
+    Returns
+    -------
+    dict[str, dict[str, float] | None]
+        Statistics per cache; None for a disabled cache.
+    """
+    query_cache = get_query_cache()
+    result_cache = get_result_cache()
+    return {
+        "query_embeddings": query_cache.stats() if query_cache is not None else None,
+        "search_results": result_cache.cache.stats() if result_cache is not None else None,
+    }
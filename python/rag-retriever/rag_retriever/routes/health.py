@@ -35,11 +35,12 @@ async def ready(response: Response) -> dict[str, Any]:
     Returns
     -------
     dict[str, Any]
-        Readiness status including database and model health.
+        Readiness status including database and model health; ``db`` is
+        None when the service runs without a database.
     """
     db_ok = await check_db_health()
     model_ok = check_model_health()
-    is_ready = db_ok and model_ok
+    is_ready = db_ok is not False and model_ok
 
     if not is_ready:
         response.status_code = 503
@@ -2,14 +2,20 @@
 
 import time
 
-from fastapi import APIRouter, Depends
-from lib_embedding.embedding import EmbeddingClient
-from lib_orm.models import DocumentChunk
-from lib_schemas.schemas import SearchRequest, SearchResponse, SearchResult
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException
+from lib_schemas.schemas import SearchRequest, SearchResponse
 
-from rag_retriever.dependencies import get_db_session, get_embedding_client
+from rag_retriever.dependencies import (
+    get_query_encoder,
+    get_reranker,
+    get_result_cache,
+    get_vector_store,
+)
+from rag_retriever.query_encoder import QueryEncoder
+from rag_retriever.reranker import Reranker
+from rag_retriever.result_cache import CachedSearch, SearchResultCache
+from rag_retriever.stores import SearchQuery, VectorStore
+from rag_retriever.task_inputs import task_inputs
 
 router = APIRouter()
 
@@ -17,66 +23,120 @@ router = APIRouter()
 @router.post("/search")
 async def search(
     body: SearchRequest,
-    session: AsyncSession = Depends(get_db_session),  # noqa: B008
-    client: EmbeddingClient = Depends(get_embedding_client),  # noqa: B008
+    store: VectorStore = Depends(get_vector_store),  # noqa: B008
+    encoder: QueryEncoder = Depends(get_query_encoder),  # noqa: B008
+    result_cache: SearchResultCache | None = Depends(get_result_cache),  # noqa: B008
+    reranker: Reranker | None = Depends(get_reranker),  # noqa: B008
 ) -> SearchResponse:
     """
-    Perform semantic search over document chunks.
+    Perform semantic or hybrid search over document chunks.
 
-    Embeds the query, searches pgvector using cosine distance, and returns
-    ranked results filtered by similarity threshold.
+    Serves repeated searches from the result cache when the corpus has not
+    changed. Otherwise embeds the query on the encoder thread pool, searches
+    the vector store by cosine similarity with the requested search effort,
+    and returns ranked results filtered by similarity threshold. Filters
+    restrict the chunks searched before ranking. In hybrid mode the vector
+    ranking is fused with a full-text ranking of the query text by
+    reciprocal-rank fusion. With reranking, ``rerank_candidates`` are
+    fetched and reordered by the cross-encoder within its latency budget;
+    if the budget runs out the search order is kept, and the response is
+    not cached so a later request can try again.
 
     Parameters
     ----------
     body : SearchRequest
-        The search request with query, top_k, and similarity_threshold.
-    session : AsyncSession
-        Injected database session.
-    client : EmbeddingClient
-        Injected embedding client.
+        The search request with query, top_k, similarity_threshold,
+        search_effort, search_mode, rerank and filters.
+    store : VectorStore
+        Injected vector store.
+    encoder : QueryEncoder
+        Injected query encoder.
+    result_cache : SearchResultCache | None
+        Injected search-result cache, or None if disabled.
+    reranker : Reranker | None
+        Injected cross-encoder reranker, or None if disabled.
 
     Returns
     -------
     SearchResponse
         Ranked search results with timing information.
+
+    Raises
+    ------
+    HTTPException
+        400 if the vector store does not support the search mode, or
+        reranking is requested without a reranker.
     """
-    # Embed the query
+    mode = body.search_mode or task_inputs.search_mode
+    if mode not in store.search_modes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Search mode {mode!r} is not supported by the {task_inputs.vector_store} store",
+        )
+    rerank = body.rerank if body.rerank is not None else reranker is not None
+    if rerank and reranker is None:
+        raise HTTPException(status_code=400, detail="Reranking is not enabled on this service")
     t0 = time.perf_counter()
-    vectors = client.encode([body.query])
-    embedding_time_ms = (time.perf_counter() - t0) * 1000
-    query_embedding = vectors[0]
+    key = result_cache.key(encoder.client.model_name, body) if result_cache is not None else None
+    if result_cache is not None and key is not None:
+        hit = result_cache.get(key, body.top_k)
+        if hit is not None:
+            results = hit.results[: body.top_k]
+            return SearchResponse(
+                query=body.query,
+                results=results,
+                total_results=len(results),
+                embedding_time_ms=0.0,
+                search_time_ms=round((time.perf_counter() - t0) * 1000, 2),
+                query_embedding=hit.query_embedding.tolist(),
+                reranked=rerank,
+                cached=True,
+            )
 
-    # Search pgvector using cosine distance
-    t1 = time.perf_counter()
-    similarity = (1 - DocumentChunk.embedding.cosine_distance(query_embedding)).label("similarity")
+    # Embed the query off the event loop
+    encoded = await encoder.encode(body.query)
+    query_embedding = encoded.embedding
 
-    stmt = (
-        select(DocumentChunk, similarity)
-        .where(similarity >= body.similarity_threshold)
-        .order_by(similarity.desc())
-        .limit(body.top_k)
+    # Search by cosine similarity, deep enough to serve smaller top_k
+    limit = body.top_k
+    if result_cache is not None and key is not None:
+        limit = result_cache.fetch_limit(body.top_k)
+    if rerank:
+        limit = max(limit, task_inputs.rerank_candidates)
+    t1 = time.perf_counter()
+    results = await store.search(
+        SearchQuery(
+            embedding=query_embedding,
+            limit=limit,
+            similarity_threshold=body.similarity_threshold,
+            search_effort=body.search_effort or task_inputs.search_effort,
+            text=body.query,
+            search_mode=mode,
+            hybrid_candidates=task_inputs.hybrid_candidates,
+            rrf_k=task_inputs.rrf_k,
+            filters=body.filters,
+        )
     )
-
-    result = await session.execute(stmt)
-    rows = result.all()
     search_time_ms = (time.perf_counter() - t1) * 1000
 
-    results = [
-        SearchResult(
-            chunk_id=row.DocumentChunk.id,
-            document_name=row.DocumentChunk.document_name,
-            content=row.DocumentChunk.content,
-            similarity_score=float(row.similarity),
-            metadata=row.DocumentChunk.metadata_,
-        )
-        for row in rows
-    ]
+    # Rerank the candidates, keeping the search order past the deadline
+    rerank_time_ms = 0.0
+    reranked = False
+    if rerank and reranker is not None:
+        results, rerank_time_ms, reranked = await reranker.rerank(body.query, results)
+
+    if result_cache is not None and key is not None and reranked == rerank:
+        result_cache.put(key, CachedSearch(results, query_embedding, limit))
+    results = results[: body.top_k]
 
     return SearchResponse(
         query=body.query,
         results=results,
         total_results=len(results),
-        embedding_time_ms=round(embedding_time_ms, 2),
+        embedding_time_ms=round(encoded.embedding_time_ms, 2),
+        queue_wait_ms=round(encoded.queue_wait_ms, 2),
         search_time_ms=round(search_time_ms, 2),
-        query_embedding=query_embedding,
+        rerank_time_ms=round(rerank_time_ms, 2),
+        reranked=reranked,
+        query_embedding=query_embedding.tolist(),
     )
@@ -0,0 +1,16 @@
+"""Vector store backends for the search endpoint."""
+
+from rag_retriever.stores.base import SearchQuery, StoredChunk, StoreStats, VectorStore
+from rag_retriever.stores.hnsw import HnswVectorStore
+from rag_retriever.stores.memory import MemoryVectorStore
+from rag_retriever.stores.pgvector import PgVectorStore
+
+__all__ = [
+    "HnswVectorStore",
+    "MemoryVectorStore",
+    "PgVectorStore",
+    "SearchQuery",
+    "StoreStats",
+    "StoredChunk",
+    "VectorStore",
+]
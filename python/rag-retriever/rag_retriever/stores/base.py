@@ -0,0 +1,210 @@
+"""Vector store interface for the search endpoint."""
+
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Collection, Sequence
+from typing import NamedTuple
+
+import numpy as np
+from lib_schemas.schemas import SearchEffort, SearchFilters, SearchMode, SearchResult
+from numpy.typing import NDArray
+
+# Namespace of the chunk IDs derived for chunks that have no stored ID.
+_CHUNK_ID_NAMESPACE = uuid.UUID("6f1c2a9e-3b8d-4f57-9a0e-2d6c1b7e4f10")
+
+
+def chunk_id_for(document_name: str, chunk_index: int) -> uuid.UUID:
+    """
+    Derive a stable chunk ID from its document name and position.
+
+    Parameters
+    ----------
+    document_name : str
+        Name of the source document.
+    chunk_index : int
+        Index of the chunk within the document.
+
+    Returns
+    -------
+    uuid.UUID
+        Name-based UUID, identical across loads of the same chunk.
+    """
+    return uuid.uuid5(_CHUNK_ID_NAMESPACE, f"{document_name}\x00{chunk_index}")
+
+
+class SearchQuery(NamedTuple):
+    """
+    A nearest-neighbour search over the store.
+
+    Attributes
+    ----------
+    embedding : NDArray[np.float32]
+        Query vector.
+    limit : int
+        Maximum number of results.
+    similarity_threshold : float
+        Minimum cosine similarity of returned chunks.
+    search_effort : SearchEffort
+        Recall/latency trade-off for approximate indexes; exact stores
+        ignore it.
+    text : str
+        Raw query text, matched against chunk content in hybrid search.
+    search_mode : SearchMode
+        ``vector`` ranks by cosine similarity; ``hybrid`` fuses the vector
+        and full-text rankings.
+    hybrid_candidates : int
+        Rows taken from each ranking before fusion, at least ``limit``.
+    rrf_k : int
+        Rank offset of reciprocal-rank fusion.
+    filters : SearchFilters | None
+        Restricts the search to matching chunks; ``limit`` counts matching
+        chunks only.
+    """
+
+    embedding: NDArray[np.float32]
+    limit: int
+    similarity_threshold: float = 0.0
+    search_effort: SearchEffort = "balanced"
+    text: str = ""
+    search_mode: SearchMode = "vector"
+    hybrid_candidates: int = 20
+    rrf_k: int = 60
+    filters: SearchFilters | None = None
+
+    @property
+    def filtered(self) -> bool:
+        """
+        Whether the query restricts the chunks searched.
+
+        Returns
+        -------
+        bool
+            True if any filter is set.
+        """
+        filters = self.filters
+        return filters is not None and (
+            filters.document_names is not None or bool(filters.metadata)
+        )
+
+
+class StoredChunk(NamedTuple):
+    """
+    A chunk with its embedding, as written to a store.
+
+    Attributes
+    ----------
+    document_name : str
+        Name of the source document.
+    chunk_index : int
+        Index of the chunk within the document.
+    content : str
+        Text content of the chunk.
+    metadata : dict[str, str]
+        Chunk metadata.
+    embedding : NDArray[np.float32]
+        Embedding vector.
+    chunk_id : uuid.UUID | None
+        Stored ID, or None to let the store assign one.
+    """
+
+    document_name: str
+    chunk_index: int
+    content: str
+    metadata: dict[str, str]
+    embedding: NDArray[np.float32]
+    chunk_id: uuid.UUID | None = None
+
+
+class StoreStats(NamedTuple):
+    """
+    Size of the corpus held by a store.
+
+    Attributes
+    ----------
+    total_documents : int
+        Number of distinct documents.
+    total_chunks : int
+        Number of chunks.
+    """
+
+    total_documents: int
+    total_chunks: int
+
+
+class VectorStore(ABC):
+    """
+    Storage and nearest-neighbour search of embedded chunks.
+
+    Chunks are keyed by ``(document_name, chunk_index)``: upserting an
+    existing key replaces the chunk. Similarity is cosine similarity, and
+    vector results are ranked from most to least similar.
+
+    Attributes
+    ----------
+    search_modes : frozenset[SearchMode]
+        Search modes the store can serve.
+    """
+
+    search_modes: frozenset[SearchMode] = frozenset({"vector"})
+
+    @abstractmethod
+    async def search(self, query: SearchQuery) -> list[SearchResult]:
+        """
+        Return the chunks nearest to a query vector.
+
+        Parameters
+        ----------
+        query : SearchQuery
+            Query vector, limit, threshold and search effort.
+
+        Returns
+        -------
+        list[SearchResult]
+            At most ``query.limit`` results at or above the threshold.
+        """
+
+    @abstractmethod
+    async def upsert(self, chunks: Sequence[StoredChunk]) -> int:
+        """
+        Insert chunks, replacing those with the same key.
+
+        Parameters
+        ----------
+        chunks : Sequence[StoredChunk]
+            Chunks to write.
+
+        Returns
+        -------
+        int
+            Number of chunks written.
+        """
+
+    @abstractmethod
+    async def delete(self, document_names: Collection[str]) -> int:
+        """
+        Delete every chunk of the given documents.
+
+        Parameters
+        ----------
+        document_names : Collection[str]
+            Documents to remove.
+
+        Returns
+        -------
+        int
+            Number of chunks deleted.
+        """
+
+    @abstractmethod
+    async def stats(self) -> StoreStats:
+        """
+        Count the documents and chunks in the store.
+
+        Returns
+        -------
+        StoreStats
+            Document and chunk counts.
+        """
+
+    async def close(self) -> None:  # noqa: B027
+        """Release resources held by the store."""
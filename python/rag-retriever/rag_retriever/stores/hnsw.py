@@ -0,0 +1,307 @@
+"""Vector store searching an in-process HNSW graph mapped from disk."""
+
+import asyncio
+import uuid
+from pathlib import Path
+
+from lib_embedding.hnsw import HnswArtifact, current_version, open_artifact
+from lib_orm.corpus import get_corpus_version
+from lib_orm.db import read_only_connection
+from lib_schemas.schemas import SearchResult
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from rag_retriever.fusion import reciprocal_rank_fusion
+from rag_retriever.queries import (
+    SEARCH_EFFORT_PARAMS,
+    build_fetch_chunks_stmt,
+    build_lexical_search_stmt,
+)
+from rag_retriever.stores.base import SearchQuery
+from rag_retriever.stores.pgvector import PgVectorStore
+
+
+class HnswVectorStore(PgVectorStore):
+    """
+    Search an HNSW artifact in-process and hydrate the hits from PostgreSQL.
+
+    The artifact built by rag-embedder is memory-mapped read-only, so it
+    loads without copying and uvicorn workers on one host share its pages.
+    A search walks the graph on a worker thread, then loads the content of
+    the hits by primary key in one query, so the database never scans
+    vectors. Writes and stats go to ``document_chunks`` as in the pgvector
+    store. Hybrid searches run the full-text ranking in PostgreSQL and fuse
+    it with the graph's ranking in-process. The graph cannot skip chunks
+    while it walks, so filtered searches are served by the pgvector store
+    instead of filtering the graph's hits afterwards, which would return
+    fewer results than asked for.
+
+    The artifact records the corpus version it was built from, and every
+    search first reads the database's: once they differ, the graph may hold
+    deleted chunks or miss new ones (a rebuild even replaces every chunk
+    ID), so the store maps the newly published version if rag-embedder has
+    caught up, and serves the search from pgvector until then.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine connected to the RAG database.
+    artifact : HnswArtifact
+        Opened HNSW artifact.
+    root : str | Path
+        Directory holding the artifact versions, reopened when a new
+        version is published.
+    dimension : int
+        Embedding dimension of the loaded model.
+    embedding_model : str
+        Version of the loaded model, as ``EmbeddingClient.model_version``.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        artifact: HnswArtifact,
+        root: str | Path,
+        dimension: int,
+        embedding_model: str,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Parameters
+        ----------
+        engine : AsyncEngine
+            Engine connected to the RAG database.
+        artifact : HnswArtifact
+            Opened HNSW artifact.
+        root : str | Path
+            Directory holding the artifact versions.
+        dimension : int
+            Embedding dimension of the loaded model.
+        embedding_model : str
+            Version of the loaded model.
+        """
+        super().__init__(engine)
+        self.artifact = artifact
+        self.root = Path(root)
+        self.dimension = dimension
+        self.embedding_model = embedding_model
+        # Last published version that could not be used, so it is not reopened
+        # on every search.
+        self._rejected_version: str | None = None
+
+    @classmethod
+    def open(
+        cls, engine: AsyncEngine, root: str | Path, dimension: int, embedding_model: str
+    ) -> "HnswVectorStore":
+        """
+        Map the current artifact version.
+
+        Parameters
+        ----------
+        engine : AsyncEngine
+            Engine connected to the RAG database.
+        root : str | Path
+            Directory holding the artifact versions.
+        dimension : int
+            Embedding dimension of the loaded model.
+        embedding_model : str
+            Version of the loaded model, as ``EmbeddingClient.model_version``.
+
+        Returns
+        -------
+        HnswVectorStore
+            Store searching the artifact.
+
+        Raises
+        ------
+        ValueError
+            If the artifact was built for another embedding dimension or by
+            another model, whose vectors are not comparable to the queries.
+        """
+        artifact = open_artifact(root)
+        _check_artifact(artifact, dimension, embedding_model)
+        return cls(engine, artifact, root, dimension, embedding_model)
+
+    async def search(self, query: SearchQuery) -> list[SearchResult]:
+        """
+        Return the chunks nearest to a query vector.
+
+        The search effort sets the graph's candidate list size, as
+        ``hnsw.ef_search`` does for pgvector. In hybrid mode the graph's
+        ranking is fused with the full-text ranking. Filtered searches, and
+        searches while the artifact is behind the corpus, run in pgvector.
+
+        Parameters
+        ----------
+        query : SearchQuery
+            Query vector and text, limit, threshold, search effort and mode.
+
+        Returns
+        -------
+        list[SearchResult]
+            At most ``query.limit`` results at or above the threshold, or
+            highest fusion score first in hybrid mode.
+        """
+        if query.filtered or not await self._sync_artifact():
+            return await super().search(query)
+        if query.search_mode == "hybrid":
+            return await self._search_graph_hybrid(query)
+        hits = await self._nearest(query, query.limit)
+        if not hits:
+            return []
+        async with read_only_connection(self.engine) as conn:
+            rows = (await conn.execute(build_fetch_chunks_stmt(hits))).all()
+        found = {row[0]: row for row in rows}
+        if not found.keys() >= hits.keys():
+            # Chunks deleted since the version check; never return a short list
+            return await super().search(query)
+        return [
+            SearchResult(
+                chunk_id=chunk_id,
+                document_name=row[1],
+                content=row[2],
+                similarity_score=score,
+                metadata=row[3],
+            )
+            for chunk_id, score in hits.items()
+            if (row := found.get(chunk_id)) is not None
+        ]
+
+    async def _sync_artifact(self) -> bool:
+        """
+        Make sure the mapped artifact matches the stored corpus.
+
+        Reads the corpus version and, if the mapped artifact was built from
+        another one, maps the current published version when it was built
+        from this corpus version by the loaded model.
+
+        Returns
+        -------
+        bool
+            Whether the mapped artifact matches the stored corpus.
+        """
+        async with read_only_connection(self.engine) as conn:
+            corpus_version = await get_corpus_version(conn)
+        if self.artifact.metadata.get("corpus_version") == corpus_version:
+            return True
+        try:
+            published = await asyncio.to_thread(current_version, self.root)
+            if published in (self.artifact.version, self._rejected_version):
+                return False
+            artifact = await asyncio.to_thread(open_artifact, self.root)
+            _check_artifact(artifact, self.dimension, self.embedding_model)
+        except (OSError, ValueError) as exc:
+            print(f"HNSW artifact not reloaded: {exc}")
+            return False
+        if artifact.metadata.get("corpus_version") != corpus_version:
+            # Built from another corpus version; retried once a newer one is published
+            self._rejected_version = artifact.version
+            return False
+        self.artifact = artifact
+        print(f"HNSW vector store: {len(artifact.graph)} vectors mapped from {artifact.version}")
+        return True
+
+    async def _nearest(self, query: SearchQuery, k: int) -> dict[uuid.UUID, float]:
+        """
+        Walk the graph for the nearest chunks at or above the threshold.
+
+        Parameters
+        ----------
+        query : SearchQuery
+            Query vector, threshold and search effort.
+        k : int
+            Number of neighbours searched for.
+
+        Returns
+        -------
+        dict[uuid.UUID, float]
+            Cosine similarity by chunk ID, most similar first.
+        """
+        ef = SEARCH_EFFORT_PARAMS[query.search_effort].hnsw_ef_search
+        nodes, scores = await asyncio.to_thread(self.artifact.graph.search, query.embedding, k, ef)
+        return {
+            self.artifact.chunk_id(node): score
+            for node, score in zip(nodes.tolist(), scores.tolist(), strict=True)
+            if score >= query.similarity_threshold
+        }
+
+    async def _search_graph_hybrid(self, query: SearchQuery) -> list[SearchResult]:
+        """
+        Fuse the graph's ranking with the full-text ranking from PostgreSQL.
+
+        Every fused candidate is hydrated with its cosine similarity, so the
+        threshold drops lexical-only hits below it before the limit applies,
+        as in ``build_hybrid_search_stmt``.
+
+        Parameters
+        ----------
+        query : SearchQuery
+            Query vector and text, limit, threshold and fusion settings.
+
+        Returns
+        -------
+        list[SearchResult]
+            At most ``query.limit`` results at or above the threshold, highest
+            fusion score first.
+        """
+        candidates = max(query.hybrid_candidates, query.limit)
+        nearest = await self._nearest(query, candidates)
+        async with read_only_connection(self.engine) as conn:
+            lexical = await conn.execute(build_lexical_search_stmt(query.text, candidates))
+            fused = reciprocal_rank_fusion(
+                [list(nearest), [row[0] for row in lexical.all()]], query.rrf_k
+            )
+            if not fused:
+                return []
+            stmt = build_fetch_chunks_stmt([chunk_id for chunk_id, _ in fused], query.embedding)
+            rows = (await conn.execute(stmt)).all()
+        found = {row[0]: row for row in rows}
+        if not found.keys() >= {chunk_id for chunk_id, _ in fused}:
+            return await super().search(query)
+        return [
+            SearchResult(
+                chunk_id=chunk_id,
+                document_name=row[1],
+                content=row[2],
+                similarity_score=float(row[4]),
+                metadata=row[3],
+                fusion_score=fusion,
+            )
+            for chunk_id, fusion in fused
+            if (row := found.get(chunk_id)) is not None
+            and float(row[4]) >= query.similarity_threshold
+        ][: query.limit]
+
+
+def _check_artifact(artifact: HnswArtifact, dimension: int, embedding_model: str) -> None:
+    """
+    Check that an artifact's vectors are comparable to the query embeddings.
+
+    Parameters
+    ----------
+    artifact : HnswArtifact
+        Opened artifact.
+    dimension : int
+        Embedding dimension of the loaded model.
+    embedding_model : str
+        Version of the loaded model.
+
+    Raises
+    ------
+    ValueError
+        If the artifact was built for another embedding dimension or by
+        another model.
+    """
+    if len(artifact.graph) and artifact.graph.dimension != dimension:
+        msg = (
+            f"HNSW artifact {artifact.version} has {artifact.graph.dimension}-dimensional "
+            f"vectors, expected {dimension}"
+        )
+        raise ValueError(msg)
+    built_with = artifact.metadata.get("embedding_model")
+    if built_with != embedding_model:
+        msg = (
+            f"HNSW artifact {artifact.version} was built with embedding model "
+            f"{built_with!r}, expected {embedding_model!r}"
+        )
+        raise ValueError(msg)
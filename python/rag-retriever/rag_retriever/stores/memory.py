@@ -0,0 +1,387 @@
+"""In-process exact vector store over a NumPy matrix."""
+
+import asyncio
+import json
+import uuid
+from collections.abc import Collection, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from lib_orm.models import DocumentChunk
+from lib_schemas.schemas import SearchResult
+from numpy.typing import NDArray
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from rag_retriever.stores.base import (
+    SearchQuery,
+    StoredChunk,
+    StoreStats,
+    VectorStore,
+    chunk_id_for,
+)
+
+# Rows fetched per round trip when loading the corpus from the database.
+_LOAD_PARTITION_ROWS = 10_000
+
+
+class _Corpus(NamedTuple):
+    """Immutable snapshot of the stored chunks, one matrix row per chunk."""
+
+    matrix: NDArray[np.float32]
+    ids: list[uuid.UUID]
+    keys: list[tuple[str, int]]
+    contents: list[str]
+    metadata: list[dict[str, str]]
+
+
+def _normalize(vectors: NDArray[np.float32]) -> NDArray[np.float32]:
+    """
+    Scale vectors to unit length so dot products are cosine similarities.
+
+    Parameters
+    ----------
+    vectors : NDArray[np.float32]
+        Vectors along the last axis; zero vectors are left as is.
+
+    Returns
+    -------
+    NDArray[np.float32]
+        Unit-length float32 vectors.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    normalized: NDArray[np.float32] = np.divide(
+        vectors, norms, out=np.zeros_like(vectors), where=norms > 0
+    )
+    return normalized
+
+
+class MemoryVectorStore(VectorStore):
+    """
+    Exact cosine search over a contiguous float32 matrix held in memory.
+
+    Each search is one matrix-vector product over the unit-normalised corpus
+    followed by ``argpartition`` for the top ``limit`` rows, run on a worker
+    thread so the event loop stays free; NumPy releases the GIL for both.
+    Writes build a new snapshot and swap it in, so searches in flight keep
+    a consistent view. Suited to corpora up to a few million chunks, and to
+    tests and local runs without a database.
+
+    Parameters
+    ----------
+    dimension : int
+        Embedding dimension.
+    """
+
+    def __init__(self, dimension: int) -> None:
+        """
+        Initialize an empty store.
+
+        Parameters
+        ----------
+        dimension : int
+            Embedding dimension.
+        """
+        self.dimension = dimension
+        self._corpus = _Corpus(np.empty((0, dimension), dtype=np.float32), [], [], [], [])
+
+    @classmethod
+    def from_embeddings_file(cls, path: str | Path, dimension: int) -> "MemoryVectorStore":
+        """
+        Load a store from the JSON array written by rag-embedder.
+
+        Parameters
+        ----------
+        path : str | Path
+            ``embeddings.json`` file of chunk objects with an ``embedding``.
+        dimension : int
+            Embedding dimension.
+
+        Returns
+        -------
+        MemoryVectorStore
+            Store holding every chunk in the file.
+        """
+        with Path(path).open(encoding="utf-8") as f:
+            records = json.load(f)
+        store = cls(dimension)
+        store._corpus = store._merge(
+            [
+                StoredChunk(
+                    document_name=record["document_name"],
+                    chunk_index=record["chunk_index"],
+                    content=record["content"],
+                    metadata=record.get("metadata", {}),
+                    embedding=np.asarray(record["embedding"], dtype=np.float32),
+                )
+                for record in records
+            ]
+        )
+        return store
+
+    @classmethod
+    async def from_database(cls, engine: AsyncEngine, dimension: int) -> "MemoryVectorStore":
+        """
+        Load a store from ``document_chunks``.
+
+        Rows are streamed in partitions rather than buffered as one result,
+        and the matrix is built once at the end.
+
+        Parameters
+        ----------
+        engine : AsyncEngine
+            Engine connected to the RAG database.
+        dimension : int
+            Embedding dimension.
+
+        Returns
+        -------
+        MemoryVectorStore
+            Store holding every stored chunk.
+        """
+        chunks: list[StoredChunk] = []
+        stmt = select(
+            DocumentChunk.id,
+            DocumentChunk.document_name,
+            DocumentChunk.chunk_index,
+            DocumentChunk.content,
+            DocumentChunk.metadata_,
+            DocumentChunk.embedding,
+        )
+        async with engine.connect() as conn:
+            result = await conn.stream(stmt)
+            async for rows in result.partitions(_LOAD_PARTITION_ROWS):
+                chunks.extend(
+                    StoredChunk(
+                        document_name=row.document_name,
+                        chunk_index=row.chunk_index,
+                        content=row.content,
+                        metadata=row.metadata_,
+                        embedding=np.asarray(row.embedding, dtype=np.float32),
+                        chunk_id=row.id,
+                    )
+                    for row in rows
+                )
+        store = cls(dimension)
+        store._corpus = store._merge(chunks)
+        return store
+
+    async def search(self, query: SearchQuery) -> list[SearchResult]:
+        """
+        Return the chunks nearest to a query vector.
+
+        Filters are applied before ranking, so up to ``query.limit``
+        matching chunks are returned.
+
+        Parameters
+        ----------
+        query : SearchQuery
+            Query vector, limit, threshold and filters; the search effort is
+            ignored since the search is exact.
+
+        Returns
+        -------
+        list[SearchResult]
+            At most ``query.limit`` results at or above the threshold.
+        """
+        corpus = self._corpus
+        if not corpus.ids or query.limit < 1:
+            return []
+        rows, scores = await asyncio.to_thread(self._top_k, corpus, query)
+        return [
+            SearchResult(
+                chunk_id=corpus.ids[row],
+                document_name=corpus.keys[row][0],
+                content=corpus.contents[row],
+                similarity_score=float(score),
+                metadata=corpus.metadata[row],
+            )
+            for row, score in zip(rows.tolist(), scores.tolist(), strict=True)
+        ]
+
+    @staticmethod
+    def _top_k(corpus: _Corpus, query: SearchQuery) -> tuple[NDArray[np.intp], NDArray[np.float32]]:
+        """
+        Rank the matching rows most similar to the query.
+
+        Parameters
+        ----------
+        corpus : _Corpus
+            Corpus snapshot with its unit-normalised matrix.
+        query : SearchQuery
+            Query vector, limit, threshold and filters.
+
+        Returns
+        -------
+        tuple[NDArray[np.intp], NDArray[np.float32]]
+            Row indices and similarities, most similar first, filtered by
+            the threshold.
+        """
+        scores = corpus.matrix @ _normalize(query.embedding.reshape(-1))
+        rows = np.arange(len(scores))
+        if query.filtered:
+            rows = rows[MemoryVectorStore._matches(corpus, query)]
+            scores = scores[rows]
+        k = min(query.limit, len(scores))
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        top = top[scores[top] >= query.similarity_threshold]
+        return rows[top], scores[top]
+
+    @staticmethod
+    def _matches(corpus: _Corpus, query: SearchQuery) -> NDArray[np.bool_]:
+        """
+        Flag the rows matching the query's filters.
+
+        Parameters
+        ----------
+        corpus : _Corpus
+            Corpus snapshot.
+        query : SearchQuery
+            Query with filters.
+
+        Returns
+        -------
+        NDArray[np.bool_]
+            One flag per row.
+        """
+        mask = np.ones(len(corpus.ids), dtype=np.bool_)
+        filters = query.filters
+        if filters is None:
+            return mask
+        if filters.document_names is not None:
+            names = set(filters.document_names)
+            mask &= np.fromiter((name in names for name, _ in corpus.keys), np.bool_, len(mask))
+        if filters.metadata:
+            wanted = filters.metadata.items()
+            mask &= np.fromiter(
+                (wanted <= meta.items() for meta in corpus.metadata), np.bool_, len(mask)
+            )
+        return mask
+
+    async def upsert(self, chunks: Sequence[StoredChunk]) -> int:
+        """
+        Insert chunks, replacing those with the same key.
+
+        Parameters
+        ----------
+        chunks : Sequence[StoredChunk]
+            Chunks to write.
+
+        Returns
+        -------
+        int
+            Number of chunks written.
+
+        Raises
+        ------
+        ValueError
+            If an embedding does not have the store's dimension.
+        """
+        unique = {(chunk.document_name, chunk.chunk_index): chunk for chunk in chunks}
+        if unique:
+            self._corpus = self._merge(list(unique.values()))
+        return len(unique)
+
+    def _merge(self, chunks: list[StoredChunk]) -> _Corpus:
+        """
+        Build a snapshot with chunks added or replaced.
+
+        Parameters
+        ----------
+        chunks : list[StoredChunk]
+            Chunks to write; the last one wins for a repeated key.
+
+        Returns
+        -------
+        _Corpus
+            New snapshot; the current one is left untouched.
+
+        Raises
+        ------
+        ValueError
+            If an embedding does not have the store's dimension.
+        """
+        if not chunks:
+            return self._corpus
+        vectors = np.stack([chunk.embedding for chunk in chunks]).astype(np.float32, copy=False)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimension:
+            msg = f"expected {self.dimension}-dimensional embeddings, got shape {vectors.shape}"
+            raise ValueError(msg)
+        vectors = _normalize(vectors)
+
+        corpus = self._corpus
+        ids, keys = list(corpus.ids), list(corpus.keys)
+        contents, metadata = list(corpus.contents), list(corpus.metadata)
+        positions = {key: row for row, key in enumerate(keys)}
+        replaced: list[int] = []
+        replacing: list[int] = []
+        appended: list[int] = []
+        for i, chunk in enumerate(chunks):
+            key = (chunk.document_name, chunk.chunk_index)
+            chunk_id = chunk.chunk_id or chunk_id_for(*key)
+            row = positions.get(key)
+            if row is None:
+                positions[key] = len(keys)
+                ids.append(chunk_id)
+                keys.append(key)
+                contents.append(chunk.content)
+                metadata.append(dict(chunk.metadata))
+                appended.append(i)
+            else:
+                ids[row] = chunk_id
+                contents[row] = chunk.content
+                metadata[row] = dict(chunk.metadata)
+                replaced.append(row)
+                replacing.append(i)
+
+        matrix = np.concatenate([corpus.matrix, vectors[appended]])
+        matrix[replaced] = vectors[replacing]
+        return _Corpus(matrix, ids, keys, contents, metadata)
+
+    async def delete(self, document_names: Collection[str]) -> int:
+        """
+        Delete every chunk of the given documents.
+
+        Parameters
+        ----------
+        document_names : Collection[str]
+            Documents to remove.
+
+        Returns
+        -------
+        int
+            Number of chunks deleted.
+        """
+        names = set(document_names)
+        corpus = self._corpus
+        keep = [row for row, (name, _index) in enumerate(corpus.keys) if name not in names]
+        deleted = len(corpus.keys) - len(keep)
+        if deleted:
+            self._corpus = _Corpus(
+                corpus.matrix[keep],
+                [corpus.ids[row] for row in keep],
+                [corpus.keys[row] for row in keep],
+                [corpus.contents[row] for row in keep],
+                [corpus.metadata[row] for row in keep],
+            )
+        return deleted
+
+    async def stats(self) -> StoreStats:
+        """
+        Count the documents and chunks held in memory.
+
+        Returns
+        -------
+        StoreStats
+            Document and chunk counts.
+        """
+        keys = self._corpus.keys
+        return StoreStats(
+            total_documents=len({name for name, _index in keys}), total_chunks=len(keys)
+        )
@@ -0,0 +1,217 @@
+"""Vector store backed by PostgreSQL and pgvector."""
+
+from collections.abc import Collection, Sequence
+
+from lib_orm.corpus import bump_corpus_version
+from lib_orm.db import read_only_connection
+from lib_orm.fulltext import content_tsvector
+from lib_orm.models import DocumentChunk
+from lib_orm.reload import chunks_table
+from lib_schemas.schemas import SearchMode, SearchResult
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from rag_retriever.queries import build_hybrid_search_stmt, build_search_stmt, set_search_effort
+from rag_retriever.stores.base import SearchQuery, StoredChunk, StoreStats, VectorStore
+
+_UPSERT_COLUMNS = (
+    "content",
+    "metadata",
+    "embedding",
+    "content_hash",
+    "embedding_model",
+    "content_tsv",
+)
+
+
+class PgVectorStore(VectorStore):
+    """
+    Store chunks in ``document_chunks`` and search them with pgvector.
+
+    Searches and stats run on a read-only pooled connection; writes run in
+    their own transaction and bump the corpus version, so search-result
+    caches are invalidated once they commit. Hybrid searches fuse the
+    vector and full-text rankings in a single statement.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        Engine connected to the RAG database.
+    """
+
+    search_modes: frozenset[SearchMode] = frozenset({"vector", "hybrid"})
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        """
+        Initialize the store.
+
+        Parameters
+        ----------
+        engine : AsyncEngine
+            Engine connected to the RAG database.
+        """
+        self.engine = engine
+
+    async def search(self, query: SearchQuery) -> list[SearchResult]:
+        """
+        Return the chunks nearest to a query vector.
+
+        Applies the index scan settings of the query's search effort, then
+        runs the nearest-neighbour query built by ``build_search_stmt``, or
+        in hybrid mode the fused query built by ``build_hybrid_search_stmt``.
+        Filters run inside the query, with iterative index scans enabled so
+        the vector index keeps scanning until enough chunks match.
+
+        Parameters
+        ----------
+        query : SearchQuery
+            Query vector, limit, threshold, search effort and filters.
+
+        Returns
+        -------
+        list[SearchResult]
+            At most ``query.limit`` results at or above the threshold.
+        """
+        if query.search_mode == "hybrid":
+            return await self._search_hybrid(query)
+        async with read_only_connection(self.engine) as conn:
+            await set_search_effort(conn, query.search_effort, query.limit, query.filtered)
+            stmt = build_search_stmt(
+                query.embedding, query.similarity_threshold, query.limit, query.filters
+            )
+            rows = (await conn.execute(stmt)).all()
+        return [
+            SearchResult(
+                chunk_id=chunk_id,
+                document_name=document_name,
+                content=content,
+                similarity_score=float(score),
+                metadata=metadata,
+            )
+            for chunk_id, document_name, content, metadata, score in rows
+        ]
+
+    async def _search_hybrid(self, query: SearchQuery) -> list[SearchResult]:
+        """
+        Return the chunks ranked best by fused vector and full-text search.
+
+        Parameters
+        ----------
+        query : SearchQuery
+            Query vector and text, limit, threshold and fusion settings.
+
+        Returns
+        -------
+        list[SearchResult]
+            At most ``query.limit`` results, highest fusion score first.
+        """
+        candidates = max(query.hybrid_candidates, query.limit)
+        async with read_only_connection(self.engine) as conn:
+            await set_search_effort(conn, query.search_effort, candidates, query.filtered)
+            stmt = build_hybrid_search_stmt(
+                query.embedding,
+                query.text,
+                query.similarity_threshold,
+                query.limit,
+                candidates,
+                query.rrf_k,
+                query.filters,
+            )
+            rows = (await conn.execute(stmt)).all()
+        return [
+            SearchResult(
+                chunk_id=chunk_id,
+                document_name=document_name,
+                content=content,
+                similarity_score=float(score),
+                metadata=metadata,
+                fusion_score=float(fusion),
+            )
+            for chunk_id, document_name, content, metadata, score, fusion in rows
+        ]
+
+    async def upsert(self, chunks: Sequence[StoredChunk]) -> int:
+        """
+        Insert chunks, replacing those with the same key.
+
+        Replaced chunks lose their content hash and embedding model, so the
+        embedder re-embeds them on its next run.
+
+        Parameters
+        ----------
+        chunks : Sequence[StoredChunk]
+            Chunks to write.
+
+        Returns
+        -------
+        int
+            Number of chunks written.
+        """
+        rows = {
+            (chunk.document_name, chunk.chunk_index): {
+                "document_name": chunk.document_name,
+                "chunk_index": chunk.chunk_index,
+                "content": chunk.content,
+                "metadata": chunk.metadata,
+                "embedding": chunk.embedding,
+                "content_hash": None,
+                "embedding_model": None,
+                "content_tsv": content_tsvector(chunk.content),
+            }
+            for chunk in chunks
+        }
+        if not rows:
+            return 0
+        target = chunks_table()
+        stmt = insert(target).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[target.c.document_name, target.c.chunk_index],
+            set_={
+                **{name: stmt.excluded[name] for name in _UPSERT_COLUMNS},
+                "updated_at": func.now(),
+            },
+        )
+        async with self.engine.begin() as conn:
+            await conn.execute(stmt)
+            await bump_corpus_version(conn)
+        return len(rows)
+
+    async def delete(self, document_names: Collection[str]) -> int:
+        """
+        Delete every chunk of the given documents.
+
+        Parameters
+        ----------
+        document_names : Collection[str]
+            Documents to remove.
+
+        Returns
+        -------
+        int
+            Number of chunks deleted.
+        """
+        if not document_names:
+            return 0
+        stmt = delete(DocumentChunk).where(DocumentChunk.document_name.in_(list(document_names)))
+        async with self.engine.begin() as conn:
+            count = int((await conn.execute(stmt)).rowcount)
+            if count:
+                await bump_corpus_version(conn)
+        return count
+
+    async def stats(self) -> StoreStats:
+        """
+        Count the documents and chunks in ``document_chunks``.
+
+        Returns
+        -------
+        StoreStats
+            Document and chunk counts.
+        """
+        async with read_only_connection(self.engine) as conn:
+            result = await conn.execute(
+                select(func.count(func.distinct(DocumentChunk.document_name)), func.count())
+            )
+            total_documents, total_chunks = result.one()
+        return StoreStats(total_documents=total_documents, total_chunks=total_chunks)
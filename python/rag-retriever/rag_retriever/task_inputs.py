@@ -1,5 +1,8 @@
 """Task inputs module for rag-retriever."""
 
+from typing import Literal
+
+from lib_schemas.schemas import SearchEffort, SearchMode
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -20,6 +23,66 @@ class TaskInputs(BaseSettings):
         Name of the sentence-transformers model for query embedding.
     top_k : int
         Default number of results to return from search.
+    embedding_workers : int
+        Number of threads encoding queries off the event loop.
+    embedding_batch_window_ms : float
+        How long a query waits for concurrent queries to share its forward pass.
+    embedding_max_batch_size : int
+        Maximum number of queries encoded in one forward pass.
+    query_cache_max_entries : int
+        Maximum number of cached query embeddings; 0 disables the cache.
+    query_cache_max_bytes : int
+        Maximum memory used by cached query embeddings, in bytes.
+    query_cache_ttl_s : float
+        Time-to-live of a cached query embedding, in seconds.
+    result_cache_max_entries : int
+        Maximum number of cached search results (0 disables the cache). The
+        memory store always runs without the cache.
+    result_cache_max_bytes : int
+        Maximum memory used by cached search results, in bytes.
+    result_cache_ttl_s : float
+        Time-to-live of cached search results, in seconds.
+    result_cache_fetch_k : int
+        Number of results fetched per cached search, so that smaller
+        ``top_k`` requests share an entry.
+    corpus_version_poll_s : float
+        Seconds between corpus version polls that invalidate the result cache.
+    search_effort : SearchEffort
+        Default recall/latency trade-off of the index scan for requests that
+        do not set one. ``balanced`` probes 10 IVFFlat lists and 64 HNSW
+        candidates, more than pgvector's defaults of 1 and 40; ``fast``
+        restores latency close to those defaults.
+    search_mode : SearchMode
+        Default search mode for requests that do not set one.
+    hybrid_candidates : int
+        Rows taken from each of the vector and full-text rankings before
+        reciprocal-rank fusion.
+    rrf_k : int
+        Rank offset of reciprocal-rank fusion; larger values flatten the
+        advantage of top ranks.
+    vector_store : Literal["pgvector", "memory", "hnsw"]
+        Search backend: pgvector queries in PostgreSQL, exact search over
+        an in-process NumPy matrix, or an in-process HNSW graph mapped from
+        the artifact built by rag-embedder.
+    memory_store_path : str
+        ``embeddings.json`` file the memory store is loaded from, in which
+        case the service runs without a database; empty loads it from the
+        database.
+    ann_index_dir : str
+        Directory holding the HNSW artifact versions written by
+        rag-embedder; required by the ``hnsw`` store.
+    rerank_model : str
+        Cross-encoder model reranking search candidates; empty disables
+        reranking.
+    rerank_candidates : int
+        Number of candidates fetched from the vector store and reranked.
+    rerank_batch_size : int
+        Number of query/passage pairs per cross-encoder forward pass.
+    rerank_workers : int
+        Number of threads running the cross-encoder off the event loop.
+    rerank_timeout_ms : float
+        Latency budget of reranking per request; past it the vector
+        store's order is returned.
     """
 
     model_config = SettingsConfigDict(cli_parse_args=True, cli_ignore_unknown_args=True)
@@ -44,6 +107,115 @@ class TaskInputs(BaseSettings):
         default=5,
         description="Default number of results to return from search",
     )
+    embedding_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of threads encoding queries off the event loop",
+    )
+    embedding_batch_window_ms: float = Field(
+        default=2.0,
+        ge=0.0,
+        description="How long a query waits for concurrent queries to share its forward pass",
+    )
+    embedding_max_batch_size: int = Field(
+        default=32,
+        ge=1,
+        description="Maximum number of queries encoded in one forward pass",
+    )
+    query_cache_max_entries: int = Field(
+        default=10_000,
+        ge=0,
+        description="Maximum number of cached query embeddings (0 disables the cache)",
+    )
+    query_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=1,
+        description="Maximum memory used by cached query embeddings, in bytes",
+    )
+    query_cache_ttl_s: float = Field(
+        default=3600.0,
+        gt=0.0,
+        description="Time-to-live of a cached query embedding, in seconds",
+    )
+    result_cache_max_entries: int = Field(
+        default=10_000,
+        ge=0,
+        description="Maximum number of cached search results (0 disables the cache)",
+    )
+    result_cache_max_bytes: int = Field(
+        default=128 * 1024 * 1024,
+        ge=1,
+        description="Maximum memory used by cached search results, in bytes",
+    )
+    result_cache_ttl_s: float = Field(
+        default=300.0,
+        gt=0.0,
+        description="Time-to-live of cached search results, in seconds",
+    )
+    result_cache_fetch_k: int = Field(
+        default=50,
+        ge=1,
+        description="Number of results fetched per cached search, shared across smaller top_k",
+    )
+    corpus_version_poll_s: float = Field(
+        default=5.0,
+        gt=0.0,
+        description="Seconds between corpus version polls that invalidate the result cache",
+    )
+    search_effort: SearchEffort = Field(
+        default="balanced",
+        description="Default index scan effort: fast, balanced or exhaustive",
+    )
+    search_mode: SearchMode = Field(
+        default="vector",
+        description="Default search mode: vector, or hybrid full-text and vector",
+    )
+    hybrid_candidates: int = Field(
+        default=20,
+        ge=1,
+        description="Rows taken from each ranking before reciprocal-rank fusion",
+    )
+    rrf_k: int = Field(
+        default=60,
+        ge=1,
+        description="Rank offset of reciprocal-rank fusion",
+    )
+    vector_store: Literal["pgvector", "memory", "hnsw"] = Field(
+        default="pgvector",
+        description="Search backend: pgvector, an in-process NumPy matrix or an HNSW artifact",
+    )
+    memory_store_path: str = Field(
+        default="",
+        description="embeddings.json to load the memory store from (empty loads the database)",
+    )
+    ann_index_dir: str = Field(
+        default="",
+        description="Directory holding the HNSW artifact written by rag-embedder",
+    )
+    rerank_model: str = Field(
+        default="",
+        description="Cross-encoder model reranking search candidates (empty disables reranking)",
+    )
+    rerank_candidates: int = Field(
+        default=50,
+        ge=1,
+        description="Number of candidates fetched from the vector store and reranked",
+    )
+    rerank_batch_size: int = Field(
+        default=32,
+        ge=1,
+        description="Number of query/passage pairs per cross-encoder forward pass",
+    )
+    rerank_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of threads running the cross-encoder off the event loop",
+    )
+    rerank_timeout_ms: float = Field(
+        default=200.0,
+        gt=0.0,
+        description="Reranking latency budget per request, in milliseconds",
+    )
 
 
 task_inputs = TaskInputs()  # type: ignore[call-arg, unused-ignore]
@@ -0,0 +1,108 @@
+"""Tests for the in-process LRU cache."""
+
+from unittest.mock import patch
+
+import pytest
+
+from rag_retriever.cache import LRUCache
+
+
+def _cache(max_entries: int = 10, max_bytes: int = 1000, ttl_s: float = 60.0) -> LRUCache:
+    """
+    Create a cache of byte strings sized by their length.
+
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of entries.
+    max_bytes : int
+        Maximum total size in bytes.
+    ttl_s : float
+        Time-to-live in seconds.
+
+    Returns
+    -------
+    LRUCache
+        An empty cache.
+    """
+    return LRUCache(max_entries=max_entries, max_bytes=max_bytes, ttl_s=ttl_s, sizeof=len)
+
+
+def test_get_and_hit_ratio() -> None:
+    """Test that lookups are counted and the hit ratio is computed."""
+    cache = _cache()
+    assert cache.hit_ratio == 0.0
+    assert cache.get("a") is None
+    cache.put("a", b"xyz")
+    assert cache.get("a") == b"xyz"
+    assert cache.get("a") == b"xyz"
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == pytest.approx(0.6667)
+    assert stats["bytes"] == 3
+
+
+def test_evicts_least_recently_used_entry() -> None:
+    """Test that the entry count bound evicts the least recently used key."""
+    cache = _cache(max_entries=2)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    cache.get("a")
+    cache.put("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert cache.evictions == 1
+
+
+def test_byte_bound() -> None:
+    """Test that the byte bound evicts entries and rejects oversized values."""
+    cache = _cache(max_bytes=10)
+    cache.put("a", b"x" * 6)
+    cache.put("b", b"x" * 6)
+
+    assert len(cache) == 1
+    assert cache.bytes == 6
+    cache.put("big", b"x" * 11)
+    assert cache.get("big") is None
+
+
+def test_replacing_a_key_updates_bytes() -> None:
+    """Test that overwriting a key does not double-count its size."""
+    cache = _cache()
+    cache.put("a", b"x" * 5)
+    cache.put("a", b"x" * 2)
+    assert cache.bytes == 2
+    assert len(cache) == 1
+
+
+def test_expired_entries_are_misses() -> None:
+    """Test that entries older than the TTL are dropped on lookup."""
+    cache = _cache(ttl_s=10.0)
+    with patch("rag_retriever.cache.time.monotonic", return_value=100.0):
+        cache.put("a", b"x")
+    with patch("rag_retriever.cache.time.monotonic", return_value=105.0):
+        assert cache.get("a") == b"x"
+    with patch("rag_retriever.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.bytes == 0
+
+
+def test_clear() -> None:
+    """Test that clear drops entries but keeps counters."""
+    cache = _cache()
+    cache.put("a", b"x")
+    cache.get("a")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 1
+
+
+def test_invalid_bounds() -> None:
+    """Test that non-positive bounds are rejected."""
+    with pytest.raises(ValueError, match="must be positive"):
+        _cache(max_entries=0)
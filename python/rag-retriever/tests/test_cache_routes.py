@@ -0,0 +1,74 @@
+"""Tests for the cache statistics endpoint."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from rag_retriever.api import create_app
+from rag_retriever.cache import LRUCache
+from rag_retriever.result_cache import SearchResultCache
+
+
+def _make_app() -> FastAPI:
+    """
+    Create a test app without running the lifespan.
+
+    Returns
+    -------
+    FastAPI
+        App instance.
+    """
+    with patch("rag_retriever.api.lifespan") as mock_lifespan:
+
+        @asynccontextmanager
+        async def _noop(app):  # type: ignore[no-untyped-def]  # noqa: ANN001
+            yield
+
+        mock_lifespan.side_effect = _noop
+        return create_app()
+
+
+@pytest.mark.asyncio
+async def test_cache_stats() -> None:
+    """Test that GET /cache/stats reports the query and result cache counters."""
+    cache = LRUCache(max_entries=10, max_bytes=100, ttl_s=60, sizeof=len)
+    cache.put("q", b"abcd")
+    cache.get("q")
+    cache.get("missing")
+    result_cache = SearchResultCache(
+        LRUCache(max_entries=10, max_bytes=100, ttl_s=60, sizeof=len),
+        fetch_k=50,
+        poll_interval_s=5.0,
+    )
+
+    transport = ASGITransport(app=_make_app())  # type: ignore[arg-type]
+    with (
+        patch("rag_retriever.routes.cache.get_query_cache", return_value=cache),
+        patch("rag_retriever.routes.cache.get_result_cache", return_value=result_cache),
+    ):
+        async with AsyncClient(transport=transport, base_url="http://test") as http:
+            resp = await http.get("/cache/stats")
+
+    assert resp.status_code == 200
+    assert resp.json()["search_results"]["entries"] == 0
+    stats = resp.json()["query_embeddings"]
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 4
+    assert stats["hit_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_disabled() -> None:
+    """Test that a disabled query cache is reported as null."""
+    transport = ASGITransport(app=_make_app())  # type: ignore[arg-type]
+    with (
+        patch("rag_retriever.routes.cache.get_query_cache", return_value=None),
+        patch("rag_retriever.routes.cache.get_result_cache", return_value=None),
+    ):
+        async with AsyncClient(transport=transport, base_url="http://test") as http:
+            resp = await http.get("/cache/stats")
+
+    assert resp.json() == {"query_embeddings": None, "search_results": None}
@@ -1,10 +1,13 @@
 """Tests for dependency injection module."""
 
+import json
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from rag_retriever import dependencies
+from rag_retriever.stores import MemoryVectorStore, PgVectorStore
 
 
 @pytest.fixture(autouse=True)
@@ -12,6 +15,11 @@ def _reset_dependencies() -> None:
     """Reset module-level state before each test."""
     dependencies._engine = None
     dependencies._embedding_client = None
+    dependencies._query_encoder = None
+    dependencies._query_cache = None
+    dependencies._result_cache = None
+    dependencies._vector_store = None
+    dependencies._uses_database = True
 
 
 def test_get_embedding_client_not_initialized() -> None:
@@ -20,12 +28,44 @@ def test_get_embedding_client_not_initialized() -> None:
         dependencies.get_embedding_client()
 
 
+def test_get_query_encoder_not_initialized() -> None:
+    """Test that get_query_encoder raises when not initialized."""
+    with pytest.raises(RuntimeError, match="Query encoder not initialized"):
+        dependencies.get_query_encoder()
+
+
+def test_get_vector_store_not_initialized() -> None:
+    """Test that get_vector_store raises when not initialized."""
+    with pytest.raises(RuntimeError, match="Vector store not initialized"):
+        dependencies.get_vector_store()
+
+
+@pytest.mark.asyncio
+async def test_open_vector_store_memory_from_file(tmp_path: Path) -> None:
+    """Test that the memory store is loaded from the configured embeddings file."""
+    path = tmp_path / "embeddings.json"
+    record = {"document_name": "a.txt", "chunk_index": 0, "content": "x", "embedding": [1.0, 0.0]}
+    path.write_text(json.dumps([record]))
+
+    with (
+        patch.object(dependencies.task_inputs, "vector_store", "memory"),
+        patch.object(dependencies.task_inputs, "memory_store_path", str(path)),
+    ):
+        store = await dependencies._open_vector_store(MagicMock(), MagicMock(dimension=2))
+
+    assert isinstance(store, MemoryVectorStore)
+    assert (await store.stats()).total_chunks == 1
+
+
 @pytest.mark.asyncio
-async def test_get_db_session_not_initialized() -> None:
-    """Test that get_db_session raises when engine is not initialized."""
-    with pytest.raises(RuntimeError, match="Database engine not initialized"):
-        async for _session in dependencies.get_db_session():
-            pass  # pragma: no cover
+async def test_open_vector_store_hnsw_requires_directory() -> None:
+    """Test that the HNSW store needs an artifact directory."""
+    with (
+        patch.object(dependencies.task_inputs, "vector_store", "hnsw"),
+        patch.object(dependencies.task_inputs, "ann_index_dir", ""),
+        pytest.raises(ValueError, match="ann_index_dir is required"),
+    ):
+        await dependencies._open_vector_store(MagicMock(), MagicMock(dimension=384))
 
 
 def test_check_model_health_no_client() -> None:
@@ -64,19 +104,111 @@ async def test_check_db_health_connection_error() -> None:
 async def test_init_and_shutdown() -> None:
     """Test that init and shutdown manage resources correctly."""
     mock_engine = MagicMock()
-    mock_engine.dispose = AsyncMock()
     mock_client = MagicMock()
+    mock_dispose = AsyncMock()
 
     with (
-        patch("rag_retriever.dependencies.get_async_engine", return_value=mock_engine),
+        patch("rag_retriever.dependencies.get_engine", return_value=mock_engine) as mock_get,
         patch("rag_retriever.dependencies.EmbeddingClient", return_value=mock_client),
     ):
         await dependencies.init_dependencies()
 
     assert dependencies._engine is mock_engine
+    assert mock_get.call_args.args[0] == dependencies.task_inputs.db_url
     assert dependencies._embedding_client is mock_client
-
-    await dependencies.shutdown_dependencies()
-    mock_engine.dispose.assert_awaited_once()
+    assert dependencies.get_query_encoder().client is mock_client
+    assert dependencies.get_query_encoder().cache is dependencies.get_query_cache()
+    assert dependencies.get_query_cache() is not None
+    assert dependencies.get_result_cache() is not None
+    store = dependencies.get_vector_store()
+    assert isinstance(store, PgVectorStore)
+    assert store.engine is mock_engine
+    assert dependencies.get_reranker() is None
+
+    with patch("rag_retriever.dependencies.dispose_engines", mock_dispose):
+        await dependencies.shutdown_dependencies()
+    mock_dispose.assert_awaited_once()
     assert dependencies._engine is None
     assert dependencies._embedding_client is None
+    assert dependencies._query_encoder is None
+    assert dependencies.get_query_cache() is None
+    assert dependencies.get_result_cache() is None
+    assert dependencies._vector_store is None
+
+
+@pytest.mark.asyncio
+async def test_init_memory_store_from_file_skips_database(tmp_path: Path) -> None:
+    """
+    Test that a memory store loaded from a file runs without a database or result cache.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+    """
+    path = tmp_path / "embeddings.json"
+    record = {"document_name": "a.txt", "chunk_index": 0, "content": "x", "embedding": [1.0, 0.0]}
+    path.write_text(json.dumps([record]))
+    client = MagicMock()
+    client.dimension = 2
+
+    with (
+        patch("rag_retriever.dependencies.get_engine") as mock_get,
+        patch("rag_retriever.dependencies.EmbeddingClient", return_value=client),
+        patch.object(dependencies.task_inputs, "vector_store", "memory"),
+        patch.object(dependencies.task_inputs, "memory_store_path", str(path)),
+    ):
+        await dependencies.init_dependencies()
+
+    mock_get.assert_not_called()
+    assert dependencies._engine is None
+    assert isinstance(dependencies.get_vector_store(), MemoryVectorStore)
+    assert dependencies.get_result_cache() is None
+    assert await dependencies.check_db_health() is None
+
+    await dependencies.shutdown_dependencies()
+    assert await dependencies.check_db_health() is False
+
+
+@pytest.mark.asyncio
+async def test_init_memory_store_from_database_skips_result_cache() -> None:
+    """Test that a memory store loaded from the database runs without the result cache."""
+    store = MemoryVectorStore(2)
+
+    with (
+        patch("rag_retriever.dependencies.get_engine", return_value=MagicMock()),
+        patch("rag_retriever.dependencies.EmbeddingClient", return_value=MagicMock(dimension=2)),
+        patch.object(MemoryVectorStore, "from_database", AsyncMock(return_value=store)),
+        patch.object(dependencies.task_inputs, "vector_store", "memory"),
+        patch.object(dependencies.task_inputs, "memory_store_path", ""),
+    ):
+        await dependencies.init_dependencies()
+
+    assert dependencies.get_vector_store() is store
+    assert dependencies.get_result_cache() is None
+
+    with patch("rag_retriever.dependencies.dispose_engines", AsyncMock()):
+        await dependencies.shutdown_dependencies()
+
+
+@pytest.mark.asyncio
+async def test_init_loads_reranker() -> None:
+    """Test that a configured rerank model starts the reranker."""
+    with (
+        patch("rag_retriever.dependencies.get_engine", return_value=MagicMock()),
+        patch("rag_retriever.dependencies.EmbeddingClient", return_value=MagicMock()),
+        patch("rag_retriever.dependencies.CrossEncoderClient") as mock_cross_encoder,
+        patch.object(dependencies.task_inputs, "rerank_model", "fake-cross-encoder"),
+        patch.object(dependencies.task_inputs, "result_cache_max_entries", 0),
+    ):
+        await dependencies.init_dependencies()
+
+    mock_cross_encoder.assert_called_once_with("fake-cross-encoder")
+    reranker = dependencies.get_reranker()
+    assert reranker is not None
+    assert reranker.client is mock_cross_encoder.return_value
+    assert reranker.timeout_ms == dependencies.task_inputs.rerank_timeout_ms
+
+    with patch("rag_retriever.dependencies.dispose_engines", AsyncMock()):
+        await dependencies.shutdown_dependencies()
+    assert dependencies.get_reranker() is None
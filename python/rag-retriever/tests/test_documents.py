@@ -1,6 +1,5 @@
 """Tests for GET /documents/stats endpoint."""
 
-from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -8,17 +7,18 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 
 from rag_retriever.api import create_app
-from rag_retriever.dependencies import get_db_session
+from rag_retriever.dependencies import get_vector_store
+from rag_retriever.stores import PgVectorStore
 
 
 def _make_app(session: AsyncMock) -> object:
     """
-    Create a test app with overridden DB session dependency.
+    Create a test app whose pgvector store reads from a mock connection.
 
     Parameters
     ----------
     session : AsyncMock
-        Mock database session.
+        Mock database connection.
 
     Returns
     -------
@@ -34,18 +34,11 @@ def _make_app(session: AsyncMock) -> object:
         mock_lifespan.side_effect = _noop
         app = create_app()
 
-    async def _override_session() -> AsyncGenerator[AsyncMock]:
-        """
-        Yield the mock session.
-
-        Yields
-        ------
-        AsyncMock
-            The mock database session.
-        """
-        yield session
-
-    app.dependency_overrides[get_db_session] = _override_session  # type: ignore[union-attr]
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__ = AsyncMock(return_value=session)
+    engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    store = PgVectorStore(engine)
+    app.dependency_overrides[get_vector_store] = lambda: store  # type: ignore[union-attr]
     return app
 
 
@@ -0,0 +1,23 @@
+"""Tests for reciprocal-rank fusion."""
+
+import uuid
+
+import pytest
+
+from rag_retriever.fusion import reciprocal_rank_fusion
+
+_A, _B, _C = (uuid.UUID(int=i) for i in range(1, 4))
+
+
+def test_fusion_rewards_items_in_both_rankings() -> None:
+    """Test that an item ranked by both lists beats a top item of one list."""
+    fused = reciprocal_rank_fusion([[_A, _B], [_C, _B]], k=60)
+
+    assert [item for item, _ in fused] == [_B, _A, _C]
+    assert fused[0][1] == pytest.approx(2 / 62)
+    assert fused[1][1] == pytest.approx(1 / 61)
+
+
+def test_fusion_of_empty_rankings() -> None:
+    """Test that empty rankings fuse to nothing."""
+    assert reciprocal_rank_fusion([[], []]) == []
@@ -132,3 +132,31 @@ async def test_ready_model_not_loaded(app_no_lifespan: object) -> None:
     assert data["status"] == "not_ready"
     assert data["db"] is True
     assert data["model"] is False
+
+
+@pytest.mark.asyncio
+async def test_ready_without_database(app_no_lifespan: object) -> None:
+    """
+    Test that GET /ready returns 200 when the service runs without a database.
+
+    Parameters
+    ----------
+    app_no_lifespan : object
+        FastAPI app fixture without lifespan.
+    """
+    with (
+        patch(
+            "rag_retriever.routes.health.check_db_health",
+            new_callable=AsyncMock,
+            return_value=None,
+        ),
+        patch("rag_retriever.routes.health.check_model_health", return_value=True),
+    ):
+        transport = ASGITransport(app=app_no_lifespan)  # type: ignore[arg-type]
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/ready")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "ready"
+    assert data["db"] is None
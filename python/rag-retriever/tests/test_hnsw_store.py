@@ -0,0 +1,306 @@
+"""Tests for the in-process HNSW vector store."""
+
+import uuid
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from lib_embedding.hnsw import HnswIndex, open_artifact, publish_artifact
+from lib_schemas.schemas import SearchFilters
+
+from rag_retriever.stores import HnswVectorStore, SearchQuery
+
+_IDS = [uuid.UUID(int=i + 1) for i in range(4)]
+_MODEL = "models:/embedder/3"
+_VECTORS = np.array(
+    [[1.0, 0.0, 0.0], [0.9, 0.1, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]], dtype=np.float32
+)
+
+
+def _engine(conn: AsyncMock) -> MagicMock:
+    """
+    Build a mock engine whose connections use a mock connection.
+
+    Parameters
+    ----------
+    conn : AsyncMock
+        Connection yielded by ``engine.connect()``.
+
+    Returns
+    -------
+    MagicMock
+        The mock engine.
+    """
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__ = AsyncMock(return_value=conn)
+    engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    return engine
+
+
+def _version(corpus_version: int) -> MagicMock:
+    """
+    Build a mock result of the corpus version query.
+
+    Parameters
+    ----------
+    corpus_version : int
+        Version stored in ``corpus_state``.
+
+    Returns
+    -------
+    MagicMock
+        Result whose scalar is the version.
+    """
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = corpus_version
+    return result
+
+
+def _stored(*rows: int) -> AsyncMock:
+    """
+    Build a mock connection holding some of the indexed chunks.
+
+    Parameters
+    ----------
+    *rows : int
+        Positions in ``_IDS`` of the chunks still stored.
+
+    Returns
+    -------
+    AsyncMock
+        Connection at the artifact's corpus version whose queries return
+        those chunks in reverse order.
+    """
+    conn = AsyncMock()
+    result = MagicMock()
+    result.all.return_value = [(_IDS[i], f"doc{i}.md", f"chunk {i}", {}) for i in reversed(rows)]
+    conn.execute.side_effect = [_version(1), result]
+    return conn
+
+
+@pytest.fixture
+def artifact_dir(tmp_path: Path) -> Path:
+    """
+    Publish an HNSW artifact over ``_VECTORS``.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest temporary directory fixture.
+
+    Returns
+    -------
+    Path
+        Artifact root directory.
+    """
+    publish_artifact(
+        tmp_path,
+        "v1",
+        HnswIndex.build(_VECTORS, m=2),
+        _IDS,
+        {"corpus_version": 1, "embedding_model": _MODEL},
+    )
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_and_hydrates(artifact_dir: Path) -> None:
+    """Test that hits keep the graph's ranking after hydration."""
+    conn = _stored(0, 1, 2, 3)
+    store = HnswVectorStore.open(_engine(conn), artifact_dir, 3, _MODEL)
+    query = SearchQuery(np.array([1.0, 0.05, 0.0], dtype=np.float32), limit=2)
+
+    results = await store.search(query)
+
+    assert [r.chunk_id for r in results] == [_IDS[0], _IDS[1]]
+    assert [r.content for r in results] == ["chunk 0", "chunk 1"]
+    assert results[0].similarity_score > results[1].similarity_score
+    conn.execution_options.assert_awaited_with(postgresql_readonly=True)
+
+
+@pytest.mark.asyncio
+async def test_search_drops_low_similarity_hits(artifact_dir: Path) -> None:
+    """Test that hits below the threshold are dropped."""
+    store = HnswVectorStore.open(_engine(_stored(0, 1, 2, 3)), artifact_dir, 3, _MODEL)
+    query = SearchQuery(np.array([1.0, 0.0, 0.0], dtype=np.float32), 4, similarity_threshold=0.5)
+
+    results = await store.search(query)
+
+    assert [r.chunk_id for r in results] == [_IDS[0], _IDS[1]]
+
+
+@pytest.mark.asyncio
+async def test_search_with_deleted_hit_runs_in_postgres(artifact_dir: Path) -> None:
+    """Test that a hit deleted since the version check sends the search to pgvector."""
+    conn = _stored(1, 2, 3)
+    fallback = MagicMock()
+    fallback.all.return_value = [(_IDS[1], "doc1.md", "chunk 1", {}, 0.99)]
+    conn.execute.side_effect = [*conn.execute.side_effect, None, fallback]
+    store = HnswVectorStore.open(_engine(conn), artifact_dir, 3, _MODEL)
+    query = SearchQuery(np.array([1.0, 0.0, 0.0], dtype=np.float32), 2, similarity_threshold=0.5)
+
+    results = await store.search(query)
+
+    assert [r.chunk_id for r in results] == [_IDS[1]]
+    assert "<=>" in str(conn.execute.await_args_list[-1].args[0])
+
+
+@pytest.mark.asyncio
+async def test_search_without_hits_skips_database(artifact_dir: Path) -> None:
+    """Test that no query is sent when nothing passes the threshold."""
+    conn = _stored()
+    store = HnswVectorStore.open(_engine(conn), artifact_dir, 3, _MODEL)
+    query = SearchQuery(np.array([-1.0, -1.0, -1.0], dtype=np.float32), 2, 0.5)
+
+    assert await store.search(query) == []
+    conn.execute.assert_awaited_once()
+
+
+def test_open_memory_maps_current_version(artifact_dir: Path) -> None:
+    """Test that the current artifact version is memory-mapped."""
+    store = HnswVectorStore.open(MagicMock(), artifact_dir, 3, _MODEL)
+
+    assert store.artifact.version == "v1"
+    assert isinstance(store.artifact.graph.vectors, np.memmap)
+
+
+def test_open_rejects_other_dimension(artifact_dir: Path) -> None:
+    """Test that an artifact of another dimension is rejected."""
+    with pytest.raises(ValueError, match="expected 384"):
+        HnswVectorStore.open(MagicMock(), artifact_dir, 384, _MODEL)
+
+
+def test_open_rejects_other_model(artifact_dir: Path) -> None:
+    """Test that an artifact built by another model version is rejected."""
+    with pytest.raises(ValueError, match="built with embedding model 'models:/embedder/3'"):
+        HnswVectorStore.open(MagicMock(), artifact_dir, 3, "models:/embedder/4")
+
+
+@pytest.mark.asyncio
+async def test_search_hybrid_fuses_graph_and_lexical_rankings(artifact_dir: Path) -> None:
+    """Test that a chunk ranked by both searches comes first."""
+    conn = AsyncMock()
+    lexical = MagicMock()
+    lexical.all.return_value = [(_IDS[1], 0.8), (_IDS[3], 0.5)]
+    hydrated = MagicMock()
+    hydrated.all.return_value = [
+        (_IDS[i], f"doc{i}.md", f"chunk {i}", {}, 1.0 - i / 10) for i in (3, 1, 0)
+    ]
+    conn.execute.side_effect = [_version(1), lexical, hydrated]
+    store = HnswVectorStore.open(_engine(conn), artifact_dir, 3, _MODEL)
+    query = SearchQuery(
+        np.array([1.0, 0.0, 0.0], dtype=np.float32),
+        limit=3,
+        similarity_threshold=0.5,
+        text="chunk",
+        search_mode="hybrid",
+    )
+
+    results = await store.search(query)
+
+    assert [r.chunk_id for r in results] == [_IDS[1], _IDS[0], _IDS[3]]
+    assert results[0].fusion_score == pytest.approx(1 / 62 + 1 / 61)
+    assert results[0].similarity_score == pytest.approx(0.9)
+
+
+@pytest.mark.asyncio
+async def test_search_hybrid_drops_lexical_hits_below_threshold(artifact_dir: Path) -> None:
+    """Test that the threshold applies to lexical-only hits before the limit."""
+    conn = AsyncMock()
+    lexical = MagicMock()
+    lexical.all.return_value = [(_IDS[3], 0.8), (_IDS[2], 0.5)]
+    hydrated = MagicMock()
+    hydrated.all.return_value = [
+        (_IDS[0], "doc0.md", "chunk 0", {}, 1.0),
+        (_IDS[1], "doc1.md", "chunk 1", {}, 0.99),
+        (_IDS[2], "doc2.md", "chunk 2", {}, 0.6),
+        (_IDS[3], "doc3.md", "chunk 3", {}, 0.1),
+    ]
+    conn.execute.side_effect = [_version(1), lexical, hydrated]
+    store = HnswVectorStore.open(_engine(conn), artifact_dir, 3, _MODEL)
+    query = SearchQuery(
+        np.array([1.0, 0.0, 0.0], dtype=np.float32),
+        limit=3,
+        similarity_threshold=0.5,
+        text="chunk",
+        search_mode="hybrid",
+    )
+
+    results = await store.search(query)
+
+    assert [r.chunk_id for r in results] == [_IDS[0], _IDS[1], _IDS[2]]
+
+
+@pytest.mark.asyncio
+async def test_stale_artifact_searches_postgres_until_republished(artifact_dir: Path) -> None:
+    """Test that an artifact behind the corpus is never searched, then replaced once published."""
+    conn = AsyncMock()
+    fallback = MagicMock()
+    fallback.all.return_value = [(_IDS[2], "doc2.md", "chunk 2", {}, 0.1)]
+    hydrated = MagicMock()
+    hydrated.all.return_value = [(_IDS[0], "doc0.md", "chunk 0", {})]
+    conn.execute.side_effect = [_version(2), None, fallback, _version(2), hydrated]
+    store = HnswVectorStore.open(_engine(conn), artifact_dir, 3, _MODEL)
+    query = SearchQuery(np.array([1.0, 0.0, 0.0], dtype=np.float32), limit=1)
+
+    stale = await store.search(query)
+    publish_artifact(
+        artifact_dir,
+        "v2",
+        HnswIndex.build(_VECTORS, m=2),
+        _IDS,
+        {"corpus_version": 2, "embedding_model": _MODEL},
+    )
+    fresh = await store.search(query)
+
+    assert [r.chunk_id for r in stale] == [_IDS[2]]
+    assert "<=>" in str(conn.execute.await_args_list[2].args[0])
+    assert store.artifact.version == "v2"
+    assert [r.chunk_id for r in fresh] == [_IDS[0]]
+
+
+@pytest.mark.asyncio
+async def test_stale_artifact_is_not_reopened_until_a_new_version(artifact_dir: Path) -> None:
+    """Test that a published version from another corpus version is opened only once."""
+    conn = AsyncMock()
+    fallback = MagicMock()
+    fallback.all.return_value = []
+    conn.execute.side_effect = [_version(3), None, fallback] * 2
+    store = HnswVectorStore.open(_engine(conn), artifact_dir, 3, _MODEL)
+    publish_artifact(
+        artifact_dir,
+        "v2",
+        HnswIndex.build(_VECTORS, m=2),
+        _IDS,
+        {"corpus_version": 2, "embedding_model": _MODEL},
+    )
+    query = SearchQuery(np.array([1.0, 0.0, 0.0], dtype=np.float32), limit=1)
+
+    with patch("rag_retriever.stores.hnsw.open_artifact", wraps=open_artifact) as opened:
+        assert await store.search(query) == []
+        assert await store.search(query) == []
+
+    opened.assert_called_once()
+    assert store.artifact.version == "v1"
+
+
+@pytest.mark.asyncio
+async def test_search_with_filters_runs_in_postgres(artifact_dir: Path) -> None:
+    """Test that a filtered search is planned by PostgreSQL instead of the graph."""
+    conn = AsyncMock()
+    result = MagicMock()
+    result.all.return_value = [(_IDS[2], "doc2.md", "chunk 2", {}, 0.1)]
+    conn.execute.return_value = result
+    store = HnswVectorStore.open(_engine(conn), artifact_dir, 3, _MODEL)
+    query = SearchQuery(
+        np.array([1.0, 0.0, 0.0], dtype=np.float32),
+        limit=1,
+        filters=SearchFilters(document_names=["doc2.md"]),
+    )
+
+    results = await store.search(query)
+
+    assert [r.chunk_id for r in results] == [_IDS[2]]
+    assert "iterative_scan" in str(conn.execute.await_args_list[0].args[0])
+    assert "document_chunks.document_name IN" in str(conn.execute.await_args_list[1].args[0])
@@ -0,0 +1,172 @@
+"""Tests for the in-memory vector store."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from lib_schemas.schemas import SearchFilters
+
+from rag_retriever.stores import MemoryVectorStore, SearchQuery, StoredChunk
+from rag_retriever.stores.base import chunk_id_for
+
+
+def _chunk(name: str, index: int, *values: float) -> StoredChunk:
+    """
+    Build a chunk with a small embedding.
+
+    Parameters
+    ----------
+    name : str
+        Document name.
+    index : int
+        Chunk index.
+    *values : float
+        Embedding components.
+
+    Returns
+    -------
+    StoredChunk
+        Chunk whose content is ``"<name>#<index>"``.
+    """
+    return StoredChunk(name, index, f"{name}#{index}", {}, np.array(values, dtype=np.float32))
+
+
+def _query(*values: float, limit: int = 10, threshold: float = 0.0) -> SearchQuery:
+    """
+    Build a search query.
+
+    Parameters
+    ----------
+    *values : float
+        Query vector components.
+    limit : int
+        Maximum number of results.
+    threshold : float
+        Minimum similarity.
+
+    Returns
+    -------
+    SearchQuery
+        The query.
+    """
+    return SearchQuery(np.array(values, dtype=np.float32), limit, threshold)
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_by_cosine_similarity() -> None:
+    """Test that results are ordered by cosine similarity and limited."""
+    store = MemoryVectorStore(2)
+    await store.upsert([_chunk("a", 0, 0.0, 1.0), _chunk("b", 0, 3.0, 0.1), _chunk("c", 0, 1, 1)])
+
+    results = await store.search(_query(1.0, 0.0, limit=2))
+
+    assert [r.document_name for r in results] == ["b", "c"]
+    assert results[0].similarity_score == pytest.approx(3.0 / np.hypot(3.0, 0.1))
+    assert results[1].similarity_score == pytest.approx(np.sqrt(0.5))
+    assert results[0].chunk_id == chunk_id_for("b", 0)
+
+
+@pytest.mark.asyncio
+async def test_search_applies_threshold() -> None:
+    """Test that chunks below the similarity threshold are dropped."""
+    store = MemoryVectorStore(2)
+    await store.upsert([_chunk("a", 0, 1.0, 0.0), _chunk("b", 0, 0.0, 1.0)])
+
+    results = await store.search(_query(1.0, 0.0, threshold=0.5))
+
+    assert [r.document_name for r in results] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_search_filters_before_ranking() -> None:
+    """Test that filters restrict the ranked chunks, so the limit is still filled."""
+    store = MemoryVectorStore(2)
+    await store.upsert(
+        [
+            StoredChunk("a", 0, "a#0", {"extension": ".md"}, np.array([1.0, 0.0], np.float32)),
+            StoredChunk("b", 0, "b#0", {"extension": ".txt"}, np.array([0.9, 0.1], np.float32)),
+            StoredChunk("b", 1, "b#1", {"extension": ".md"}, np.array([0.5, 0.5], np.float32)),
+            StoredChunk("c", 0, "c#0", {"extension": ".md"}, np.array([0.0, 1.0], np.float32)),
+        ]
+    )
+    query = _query(1.0, 0.0, limit=2)
+
+    by_name = await store.search(query._replace(filters=SearchFilters(document_names=["b", "c"])))
+    by_metadata = await store.search(
+        query._replace(filters=SearchFilters(metadata={"extension": ".md"}))
+    )
+    both = await store.search(
+        query._replace(filters=SearchFilters(document_names=["b"], metadata={"extension": ".md"}))
+    )
+
+    assert [r.content for r in by_name] == ["b#0", "b#1"]
+    assert [r.content for r in by_metadata] == ["a#0", "b#1"]
+    assert [r.content for r in both] == ["b#1"]
+
+
+@pytest.mark.asyncio
+async def test_search_empty_store() -> None:
+    """Test that an empty store returns no results."""
+    assert await MemoryVectorStore(2).search(_query(1.0, 0.0)) == []
+
+
+@pytest.mark.asyncio
+async def test_upsert_replaces_existing_key() -> None:
+    """Test that upserting an existing key replaces content and embedding."""
+    store = MemoryVectorStore(2)
+    await store.upsert([_chunk("a", 0, 1.0, 0.0), _chunk("a", 1, 0.0, 1.0)])
+    replacement = StoredChunk("a", 0, "new", {"k": "v"}, np.array([0.0, 1.0], dtype=np.float32))
+
+    assert await store.upsert([replacement]) == 1
+
+    results = await store.search(_query(0.0, 1.0, threshold=0.99))
+    assert sorted(r.content for r in results) == ["a#1", "new"]
+    assert (await store.stats()).total_chunks == 2
+
+
+@pytest.mark.asyncio
+async def test_upsert_rejects_wrong_dimension() -> None:
+    """Test that embeddings of the wrong dimension are rejected."""
+    store = MemoryVectorStore(3)
+    with pytest.raises(ValueError, match="expected 3-dimensional embeddings"):
+        await store.upsert([_chunk("a", 0, 1.0, 0.0)])
+
+
+@pytest.mark.asyncio
+async def test_delete_and_stats() -> None:
+    """Test that delete removes every chunk of a document."""
+    store = MemoryVectorStore(2)
+    await store.upsert([_chunk("a", 0, 1, 0), _chunk("a", 1, 0, 1), _chunk("b", 0, 1, 1)])
+
+    assert await store.delete(["a", "missing"]) == 2
+    assert await store.delete(["a"]) == 0
+
+    stats = await store.stats()
+    assert stats.total_documents == 1
+    assert stats.total_chunks == 1
+    assert [r.document_name for r in await store.search(_query(1.0, 0.0))] == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_from_embeddings_file(tmp_path: Path) -> None:
+    """Test loading the embedder's JSON output."""
+    path = tmp_path / "embeddings.json"
+    records = [
+        {
+            "document_name": "doc.md",
+            "chunk_index": i,
+            "content": f"chunk {i}",
+            "metadata": {"source": "doc.md"},
+            "embedding": [float(i == 0), float(i == 1)],
+        }
+        for i in range(2)
+    ]
+    path.write_text(json.dumps(records))
+
+    store = MemoryVectorStore.from_embeddings_file(path, 2)
+
+    results = await store.search(_query(0.0, 1.0, limit=1))
+    assert results[0].content == "chunk 1"
+    assert results[0].metadata == {"source": "doc.md"}
+    assert (await store.stats()).total_documents == 1
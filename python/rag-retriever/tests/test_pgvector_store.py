@@ -0,0 +1,100 @@
+"""Tests for the pgvector store."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from lib_schemas.schemas import SearchFilters
+from sqlalchemy.dialects import postgresql
+
+from rag_retriever.stores import PgVectorStore, SearchQuery, StoredChunk
+
+
+def _engine(conn: AsyncMock) -> MagicMock:
+    """
+    Build a mock engine whose transactions use a mock connection.
+
+    Parameters
+    ----------
+    conn : AsyncMock
+        Connection yielded by ``engine.begin()``.
+
+    Returns
+    -------
+    MagicMock
+        The mock engine.
+    """
+    engine = MagicMock()
+    engine.begin.return_value.__aenter__ = AsyncMock(return_value=conn)
+    engine.begin.return_value.__aexit__ = AsyncMock(return_value=False)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_upsert_inserts_on_conflict_and_bumps_version() -> None:
+    """Test that upsert writes one statement and bumps the corpus version."""
+    conn = AsyncMock()
+    conn.execute.return_value = MagicMock()
+    store = PgVectorStore(_engine(conn))
+    embedding = np.zeros(384, dtype=np.float32)
+
+    written = await store.upsert(
+        [
+            StoredChunk("a.md", 0, "old", {}, embedding),
+            StoredChunk("a.md", 0, "new", {}, embedding),
+        ]
+    )
+
+    assert written == 1
+    stmt = conn.execute.await_args_list[0].args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (document_name, chunk_index) DO UPDATE" in sql
+    assert "content_tsv = excluded.content_tsv" in sql
+    assert "corpus_state" in str(conn.execute.await_args_list[1].args[0])
+
+
+@pytest.mark.asyncio
+async def test_upsert_nothing() -> None:
+    """Test that an empty upsert does not open a transaction."""
+    engine = _engine(AsyncMock())
+    assert await PgVectorStore(engine).upsert([]) == 0
+    engine.begin.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_bumps_version_only_when_rows_deleted() -> None:
+    """Test that delete bumps the corpus version only if it removed rows."""
+    conn = AsyncMock()
+    conn.execute.return_value = MagicMock(rowcount=0)
+    store = PgVectorStore(_engine(conn))
+
+    assert await store.delete(["missing.md"]) == 0
+    assert conn.execute.await_count == 1
+
+    conn.execute.reset_mock()
+    conn.execute.return_value = MagicMock(rowcount=3)
+    assert await store.delete(["a.md"]) == 3
+    assert conn.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_search_with_filters_enables_iterative_scan() -> None:
+    """Test that a filtered search filters in SQL with iterative index scans on."""
+    conn = AsyncMock()
+    conn.execute.return_value = MagicMock()
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__ = AsyncMock(return_value=conn)
+    engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    query = SearchQuery(
+        np.zeros(384, dtype=np.float32),
+        5,
+        filters=SearchFilters(document_names=["a.md"], metadata={"extension": ".md"}),
+    )
+
+    await PgVectorStore(engine).search(query)
+
+    set_config, search = (call.args[0] for call in conn.execute.await_args_list[-2:])
+    assert "set_config('hnsw.iterative_scan', 'relaxed_order', true)" in str(set_config)
+    sql = str(search.compile(dialect=postgresql.dialect()))
+    assert "document_chunks.document_name IN" in sql
+    assert "document_chunks.metadata @>" in sql
@@ -0,0 +1,185 @@
+"""Tests for search SQL statements."""
+
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+from lib_orm.indexes import compute_ivfflat_lists
+from lib_schemas.schemas import SearchFilters
+from sqlalchemy.dialects import postgresql
+
+from rag_retriever.queries import (
+    SEARCH_EFFORT_PARAMS,
+    build_filter_clauses,
+    build_hybrid_search_stmt,
+    build_lexical_search_stmt,
+    build_search_stmt,
+    set_search_effort,
+)
+
+
+def test_build_search_stmt_projects_result_columns() -> None:
+    """Test that the search query selects only the columns results need."""
+    stmt = build_search_stmt(np.zeros(384, dtype=np.float32), 0.5, 10)
+
+    assert [c.name for c in stmt.selected_columns] == [
+        "id",
+        "document_name",
+        "content",
+        "metadata",
+        "similarity",
+    ]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "document_chunks.embedding <=>" in sql
+    assert "document_chunks.embedding," not in sql
+    assert "LIMIT" in sql
+
+
+def test_build_search_stmt_orders_by_distance_before_threshold() -> None:
+    """
+    Test that the index-friendly ORDER BY/LIMIT runs before the threshold.
+
+    The inner query must order by the raw distance operator so an ANN index
+    can serve it; the threshold belongs to the outer query only.
+    """
+    stmt = build_search_stmt(np.zeros(384, dtype=np.float32), 0.5, 10)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    _outer, inner = sql.split("FROM (", 1)
+    inner, outer_tail = inner.split(") AS nearest", 1)
+    assert "ORDER BY distance" in inner
+    assert "LIMIT" in inner
+    assert "WHERE" not in inner
+    assert "nearest.distance >=" in outer_tail.split("WHERE", 1)[1]
+
+
+@pytest.mark.asyncio
+async def test_set_search_effort_uses_transaction_local_settings() -> None:
+    """Test that index settings are applied with set_config(..., true)."""
+    session = AsyncMock()
+    await set_search_effort(session, "fast", 5)
+
+    stmt, params = session.execute.await_args.args
+    assert "set_config('ivfflat.probes', :probes, true)" in str(stmt)
+    assert "set_config('hnsw.ef_search', :ef_search, true)" in str(stmt)
+    assert params == {
+        "probes": str(SEARCH_EFFORT_PARAMS["fast"].ivfflat_probes),
+        "ef_search": str(SEARCH_EFFORT_PARAMS["fast"].hnsw_ef_search),
+    }
+
+
+@pytest.mark.asyncio
+async def test_set_search_effort_ef_search_covers_limit() -> None:
+    """Test that hnsw.ef_search is never below the number of rows fetched."""
+    session = AsyncMock()
+    await set_search_effort(session, "fast", 50)
+    assert session.execute.await_args.args[1]["ef_search"] == "50"
+
+
+@pytest.mark.parametrize("row_count", [1_000, 100_000, 5_000_000, 1_000_000_000])
+def test_exhaustive_probes_every_list(row_count: int) -> None:
+    """
+    Test that exhaustive probes cover the lists of any rebuilt IVFFlat index.
+
+    Parameters
+    ----------
+    row_count : int
+        Rows the index was built over.
+    """
+    assert SEARCH_EFFORT_PARAMS["exhaustive"].ivfflat_probes >= compute_ivfflat_lists(row_count)
+
+
+def test_build_lexical_search_stmt_ranks_matching_chunks() -> None:
+    """Test that the full-text query matches the GIN-indexed column by rank."""
+    stmt = build_lexical_search_stmt("congés payés", 20)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "document_chunks.content_tsv @@" in sql
+    assert "plainto_tsquery('english'::regconfig" in sql
+    assert "ORDER BY rank_score DESC" in sql
+    assert "LIMIT" in sql
+
+
+def test_build_hybrid_search_stmt_fuses_both_rankings() -> None:
+    """Test that both rankings are joined and fused by reciprocal rank."""
+    stmt = build_hybrid_search_stmt(np.zeros(384, dtype=np.float32), "congés", 0.5, 5, 20, 60)
+
+    assert [c.name for c in stmt.selected_columns] == [
+        "id",
+        "document_name",
+        "content",
+        "metadata",
+        "similarity",
+        "fusion",
+    ]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "FULL OUTER JOIN" in sql
+    assert "ts_rank_cd" in sql
+    assert "row_number() OVER" in sql
+    assert "ORDER BY distance" in sql
+
+
+def test_build_hybrid_search_stmt_thresholds_fused_rows() -> None:
+    """Test that the threshold and limit apply to the fused rows, not the vector ranking."""
+    stmt = build_hybrid_search_stmt(np.zeros(384, dtype=np.float32), "congés", 0.5, 5, 20, 60)
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    outer = sql[sql.rindex("fused.id = document_chunks.id") :]
+
+    assert ">= 0.5" in outer
+    assert "LIMIT 5" in outer
+    assert sql.count(">= 0.5") == 1
+
+
+def test_build_filter_clauses() -> None:
+    """Test that filters map to indexable document name and containment clauses."""
+    assert build_filter_clauses(None) == []
+    assert build_filter_clauses(SearchFilters()) == []
+
+    clauses = build_filter_clauses(
+        SearchFilters(document_names=["a.md"], metadata={"pokemon_name": "Pikachu"})
+    )
+    sql = [str(c.compile(dialect=postgresql.dialect())) for c in clauses]
+    assert sql[0].startswith("document_chunks.document_name IN")
+    assert sql[1].startswith("document_chunks.metadata @>")
+
+
+def test_build_search_stmt_filters_before_limit() -> None:
+    """Test that filters sit in the inner query, so the limit counts matching chunks."""
+    filters = SearchFilters(metadata={"extension": ".md"})
+    stmt = build_search_stmt(np.zeros(384, dtype=np.float32), 0.5, 10, filters)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    _outer, inner = sql.split("FROM (", 1)
+    inner, _outer_tail = inner.split(") AS nearest", 1)
+    assert "WHERE document_chunks.metadata @>" in inner
+
+
+def test_build_hybrid_search_stmt_filters_both_rankings() -> None:
+    """Test that filters apply to both the vector and the full-text rankings."""
+    filters = SearchFilters(document_names=["a.md"])
+    stmt = build_hybrid_search_stmt(
+        np.zeros(384, dtype=np.float32), "congés", 0.0, 5, 20, 60, filters
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("document_chunks.document_name IN") == 2
+
+
+@pytest.mark.asyncio
+async def test_set_search_effort_filtered_enables_iterative_scans() -> None:
+    """Test that filtered searches turn on relaxed-order iterative index scans."""
+    session = AsyncMock()
+    await set_search_effort(session, "balanced", 10, filtered=True)
+
+    sql = str(session.execute.await_args.args[0])
+    assert "set_config('ivfflat.iterative_scan', 'relaxed_order', true)" in sql
+    assert "set_config('hnsw.iterative_scan', 'relaxed_order', true)" in sql
+
+
+@pytest.mark.asyncio
+async def test_set_search_effort_unfiltered_keeps_strict_order() -> None:
+    """Test that unfiltered searches leave iterative scans off."""
+    session = AsyncMock()
+    await set_search_effort(session, "balanced", 10)
+
+    assert "iterative_scan" not in str(session.execute.await_args.args[0])
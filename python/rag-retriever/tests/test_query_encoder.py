@@ -0,0 +1,238 @@
+"""Tests for the micro-batching query encoder."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from rag_retriever.cache import LRUCache
+from rag_retriever.query_encoder import QueryEncoder, query_cache_key
+
+
+@pytest.mark.asyncio
+async def test_encode_runs_on_worker_thread() -> None:
+    """Test that inference runs off the event loop thread."""
+    threads: list[str] = []
+
+    def encode_array(texts: list[str]) -> NDArray[np.float32]:
+        """
+        Record the calling thread and return a dummy embedding.
+
+        Parameters
+        ----------
+        texts : list[str]
+            Texts to encode.
+
+        Returns
+        -------
+        NDArray[np.float32]
+            One row of 0.1 per text.
+        """
+        threads.append(threading.current_thread().name)
+        return np.full((len(texts), 384), 0.1, dtype=np.float32)
+
+    client = MagicMock()
+    client.encode_array.side_effect = encode_array
+    encoder = QueryEncoder(client)
+
+    encoded = await encoder.encode("hello")
+    encoder.shutdown()
+
+    assert encoded.embedding.shape == (384,)
+    assert encoded.embedding_time_ms >= 0.0
+    assert encoded.queue_wait_ms >= 0.0
+    assert threads[0].startswith("query-encoder")
+    client.encode_array.assert_called_once_with(["hello"])
+
+
+@pytest.mark.asyncio
+async def test_encode_reports_queue_wait() -> None:
+    """Test that waiting for a busy worker is reported as queue wait, not inference."""
+    client = MagicMock()
+
+    def slow_encode(texts: list[str]) -> NDArray[np.float32]:
+        """
+        Simulate a slow model.
+
+        Parameters
+        ----------
+        texts : list[str]
+            Texts to encode.
+
+        Returns
+        -------
+        NDArray[np.float32]
+            One zero row per text.
+        """
+        time.sleep(0.05)
+        return np.zeros((len(texts), 4), dtype=np.float32)
+
+    client.encode_array.side_effect = slow_encode
+    encoder = QueryEncoder(client, max_workers=1)
+
+    first, second = await asyncio.gather(encoder.encode("a"), encoder.encode("b"))
+    encoder.shutdown()
+
+    assert first.queue_wait_ms < 40
+    assert second.queue_wait_ms >= 40
+    assert second.embedding_time_ms >= 40
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive() -> None:
+    """Test that other coroutines keep running while a query is encoded."""
+    client = MagicMock()
+    client.encode_array.side_effect = lambda texts: (
+        time.sleep(0.1) or np.zeros((len(texts), 4), dtype=np.float32)
+    )
+    encoder = QueryEncoder(client)
+    ticks = 0
+
+    async def ticker() -> None:
+        """Count event loop iterations while the query is being encoded."""
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await encoder.encode("hello")
+    task.cancel()
+    encoder.shutdown()
+
+    assert ticks >= 5
+
+
+def _row_per_text(texts: list[str]) -> NDArray[np.float32]:
+    """
+    Return one row per text whose first component is the text length.
+
+    Parameters
+    ----------
+    texts : list[str]
+        Texts to encode.
+
+    Returns
+    -------
+    NDArray[np.float32]
+        Matrix of shape ``(len(texts), 4)``.
+    """
+    out = np.zeros((len(texts), 4), dtype=np.float32)
+    out[:, 0] = [len(t) for t in texts]
+    return out
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_share_one_forward_pass() -> None:
+    """Test that queries arriving within the window are encoded together."""
+    client = MagicMock()
+    client.encode_array.side_effect = _row_per_text
+    encoder = QueryEncoder(client, batch_window_ms=50, max_batch_size=8)
+
+    results = await asyncio.gather(*(encoder.encode(q) for q in ["a", "bb", "ccc"]))
+    encoder.shutdown()
+
+    client.encode_array.assert_called_once_with(["a", "bb", "ccc"])
+    assert [r.embedding[0] for r in results] == [1.0, 2.0, 3.0]
+    assert all(r.batch_size == 3 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting() -> None:
+    """Test that a batch reaching max_batch_size is flushed before the window ends."""
+    client = MagicMock()
+    client.encode_array.side_effect = _row_per_text
+    encoder = QueryEncoder(client, batch_window_ms=20, max_batch_size=2)
+
+    results = await asyncio.gather(*(encoder.encode(q) for q in ["a", "bb", "ccc"]))
+    encoder.shutdown()
+
+    assert [call.args[0] for call in client.encode_array.call_args_list] == [
+        ["a", "bb"],
+        ["ccc"],
+    ]
+    assert [r.batch_size for r in results] == [2, 2, 1]
+    assert results[0].queue_wait_ms < results[2].queue_wait_ms
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_reaches_every_caller() -> None:
+    """Test that a model error is raised in every request of the batch."""
+    client = MagicMock()
+    client.encode_array.side_effect = RuntimeError("model crashed")
+    encoder = QueryEncoder(client, batch_window_ms=10, max_batch_size=8)
+
+    results = await asyncio.gather(encoder.encode("a"), encoder.encode("b"), return_exceptions=True)
+    encoder.shutdown()
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_fails_pending_queries() -> None:
+    """Test that queries still inside the batching window fail on shutdown."""
+    encoder = QueryEncoder(MagicMock(), batch_window_ms=10_000, max_batch_size=8)
+
+    task = asyncio.create_task(encoder.encode("a"))
+    await asyncio.sleep(0)
+    encoder.shutdown()
+
+    with pytest.raises(RuntimeError, match="Query encoder shut down"):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_served_from_cache() -> None:
+    """Test that a repeated query skips the model and is flagged as cached."""
+    client = MagicMock()
+    client.model_name = "all-MiniLM-L6-v2"
+    client.encode_array.side_effect = _row_per_text
+    cache = LRUCache(max_entries=10, max_bytes=10_000, ttl_s=60, sizeof=lambda e: e.nbytes)
+    encoder = QueryEncoder(client, cache=cache)
+
+    first = await encoder.encode("what is  RAG?")
+    second = await encoder.encode("  what is RAG? ")
+    encoder.shutdown()
+
+    client.encode_array.assert_called_once()
+    assert not first.cached
+    assert second.cached
+    assert second.batch_size == 0
+    assert second.queue_wait_ms == 0.0
+    np.testing.assert_array_equal(first.embedding, second.embedding)
+    assert not second.embedding.flags.writeable
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_query_cache_key_depends_on_model() -> None:
+    """Test that cache keys normalise whitespace and include the model name."""
+    assert query_cache_key("m", "a  b\n") == query_cache_key("m", "a b")
+    assert query_cache_key("m", "a b") != query_cache_key("other", "a b")
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"max_workers": 0}, "max_workers must be positive"),
+        ({"max_batch_size": 0}, "max_batch_size must be positive"),
+        ({"batch_window_ms": -1.0}, "batch_window_ms must not be negative"),
+    ],
+)
+def test_invalid_settings(kwargs: dict[str, float], message: str) -> None:
+    """
+    Test that invalid pool and batching settings are rejected.
+
+    Parameters
+    ----------
+    kwargs : dict[str, float]
+        Constructor arguments to override.
+    message : str
+        Expected error message.
+    """
+    with pytest.raises(ValueError, match=message):
+        QueryEncoder(MagicMock(), **kwargs)  # type: ignore[arg-type]
@@ -0,0 +1,114 @@
+"""Tests for the cross-encoder reranker."""
+
+import threading
+import uuid
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from lib_schemas.schemas import SearchResult
+
+from rag_retriever.reranker import Reranker
+
+
+def _candidates(*contents: str) -> list[SearchResult]:
+    """
+    Build search candidates in vector-store order.
+
+    Parameters
+    ----------
+    *contents : str
+        Content of each candidate, best first.
+
+    Returns
+    -------
+    list[SearchResult]
+        One candidate per content.
+    """
+    return [
+        SearchResult(
+            chunk_id=uuid.uuid4(),
+            document_name=f"doc{i}.md",
+            content=content,
+            similarity_score=1.0 - i / 10,
+        )
+        for i, content in enumerate(contents)
+    ]
+
+
+def _client(scores: dict[str, float]) -> MagicMock:
+    """
+    Build a mock cross-encoder scoring passages from a table.
+
+    Parameters
+    ----------
+    scores : dict[str, float]
+        Score of each passage.
+
+    Returns
+    -------
+    MagicMock
+        The mock client.
+    """
+    client = MagicMock()
+    client.score.side_effect = lambda _query, passages, _batch_size: np.array(
+        [scores[p] for p in passages], dtype=np.float32
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_rerank_orders_by_cross_encoder_score() -> None:
+    """Test that candidates are reordered by score in batches."""
+    client = _client({"a": 0.1, "b": 0.9, "c": 0.5})
+    reranker = Reranker(client, batch_size=2, timeout_ms=5_000)
+
+    outcome = await reranker.rerank("q", _candidates("a", "b", "c"))
+
+    assert outcome.reranked is True
+    assert [r.content for r in outcome.results] == ["b", "c", "a"]
+    assert outcome.results[0].rerank_score == pytest.approx(0.9)
+    assert outcome.rerank_time_ms >= 0.0
+    assert [call.args[1] for call in client.score.call_args_list] == [["a", "b"], ["c"]]
+    reranker.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rerank_keeps_order_past_deadline() -> None:
+    """Test that a slow cross-encoder falls back to the original order."""
+    release = threading.Event()
+    client = MagicMock()
+    client.score.side_effect = lambda _query, passages, _batch_size: (
+        release.wait(),
+        np.zeros(len(passages), dtype=np.float32),
+    )[1]
+    reranker = Reranker(client, batch_size=1, timeout_ms=20)
+    candidates = _candidates("a", "b")
+
+    outcome = await reranker.rerank("q", candidates)
+    release.set()
+
+    assert outcome.reranked is False
+    assert outcome.results == candidates
+    assert outcome.rerank_time_ms >= 20
+    reranker.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rerank_nothing() -> None:
+    """Test that an empty candidate list skips the cross-encoder."""
+    client = MagicMock()
+    outcome = await Reranker(client).rerank("q", [])
+
+    assert outcome.results == []
+    client.score.assert_not_called()
+
+
+def test_rejects_invalid_settings() -> None:
+    """Test that non-positive settings are rejected."""
+    with pytest.raises(ValueError, match="max_workers"):
+        Reranker(MagicMock(), max_workers=0)
+    with pytest.raises(ValueError, match="batch_size"):
+        Reranker(MagicMock(), batch_size=0)
+    with pytest.raises(ValueError, match="timeout_ms"):
+        Reranker(MagicMock(), timeout_ms=0)
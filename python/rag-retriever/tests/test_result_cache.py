@@ -0,0 +1,162 @@
+"""Tests for the corpus-versioned search-result cache."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from lib_schemas.schemas import SearchRequest, SearchResult
+
+from rag_retriever.cache import LRUCache
+from rag_retriever.result_cache import CachedSearch, SearchResultCache, cached_search_nbytes
+
+
+def _result_cache(fetch_k: int = 50) -> SearchResultCache:
+    """
+    Create a result cache at corpus version 1.
+
+    Parameters
+    ----------
+    fetch_k : int
+        Minimum number of results fetched per search.
+
+    Returns
+    -------
+    SearchResultCache
+        Cache ready to use.
+    """
+    cache = SearchResultCache(
+        LRUCache(max_entries=10, max_bytes=1 << 20, ttl_s=60, sizeof=cached_search_nbytes),
+        fetch_k=fetch_k,
+        poll_interval_s=5.0,
+    )
+    cache.version = 1
+    return cache
+
+
+def _entry(n_results: int, limit: int) -> CachedSearch:
+    """
+    Create a cached search with ``n_results`` results.
+
+    Parameters
+    ----------
+    n_results : int
+        Number of results.
+    limit : int
+        Limit the results were fetched with.
+
+    Returns
+    -------
+    CachedSearch
+        Cached search.
+    """
+    results = [
+        SearchResult(
+            chunk_id=uuid.uuid4(),
+            document_name="doc.md",
+            content=f"chunk {i}",
+            similarity_score=1.0 - i / 100,
+            metadata={},
+        )
+        for i in range(n_results)
+    ]
+    return CachedSearch(results, np.zeros(4, dtype=np.float32), limit)
+
+
+def test_key_ignores_top_k_and_whitespace() -> None:
+    """Test that requests differing only in top_k or spacing share a key."""
+    cache = _result_cache()
+    a = cache.key("m", SearchRequest(query="fluffy  cake", top_k=5))
+    b = cache.key("m", SearchRequest(query=" fluffy cake", top_k=1))
+    assert a is not None
+    assert a == b
+
+
+def test_key_includes_threshold_and_version() -> None:
+    """Test that the threshold and corpus version change the key."""
+    cache = _result_cache()
+    base = cache.key("m", SearchRequest(query="q"))
+    assert base != cache.key("m", SearchRequest(query="q", similarity_threshold=0.5))
+    cache.version = 2
+    assert base != cache.key("m", SearchRequest(query="q"))
+
+
+def test_key_none_until_version_known() -> None:
+    """Test that nothing is cached before the corpus version is read."""
+    cache = _result_cache()
+    cache.version = None
+    assert cache.key("m", SearchRequest(query="q")) is None
+
+
+def test_fetch_limit() -> None:
+    """Test that searches fetch at least fetch_k results."""
+    cache = _result_cache(fetch_k=20)
+    assert cache.fetch_limit(5) == 20
+    assert cache.fetch_limit(30) == 30
+
+
+def test_get_requires_covering_entry() -> None:
+    """Test that an entry only answers top_k it was fetched deep enough for."""
+    cache = _result_cache()
+    key = cache.key("m", SearchRequest(query="q"))
+    assert key is not None
+    cache.put(key, _entry(n_results=10, limit=10))
+    assert cache.get(key, 10) is not None
+    assert cache.get(key, 20) is None
+
+    cache.put(key, _entry(n_results=3, limit=10))
+    assert cache.get(key, 20) is not None
+
+
+def test_put_drops_stale_version() -> None:
+    """Test that a search keyed at an old corpus version is not stored."""
+    cache = _result_cache()
+    key = cache.key("m", SearchRequest(query="q"))
+    assert key is not None
+    cache.version = 2
+    cache.put(key, _entry(n_results=1, limit=50))
+    assert len(cache.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_clears_on_version_change() -> None:
+    """Test that a new corpus version drops every entry."""
+    cache = _result_cache()
+    key = cache.key("m", SearchRequest(query="q"))
+    assert key is not None
+    cache.put(key, _entry(n_results=1, limit=50))
+
+    engine = MagicMock()
+    with patch("rag_retriever.result_cache.get_corpus_version", AsyncMock(return_value=1)):
+        await cache.refresh(engine)
+    assert len(cache.cache) == 1
+
+    with patch("rag_retriever.result_cache.get_corpus_version", AsyncMock(return_value=2)):
+        await cache.refresh(engine)
+    assert cache.version == 2
+    assert len(cache.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_failure_keeps_version() -> None:
+    """Test that a failed poll keeps the known version and entries."""
+    cache = _result_cache()
+    key = cache.key("m", SearchRequest(query="q"))
+    assert key is not None
+    cache.put(key, _entry(n_results=1, limit=50))
+
+    engine = MagicMock()
+    failing = AsyncMock(side_effect=ConnectionRefusedError("refused"))
+    with patch("rag_retriever.result_cache.get_corpus_version", failing):
+        await cache.refresh(engine)
+    assert cache.version == 1
+    assert len(cache.cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_start_and_stop_poller() -> None:
+    """Test that the poller can be started and stopped."""
+    cache = _result_cache()
+    cache.start(MagicMock())
+    await cache.stop()
+    assert cache._poller is None
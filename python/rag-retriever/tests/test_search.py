@@ -1,28 +1,50 @@
 """Tests for POST /search endpoint."""
 
 import uuid
-from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 
 from rag_retriever.api import create_app
-from rag_retriever.dependencies import get_db_session, get_embedding_client
-
-
-def _make_app(session: AsyncMock, client: MagicMock) -> FastAPI:
+from rag_retriever.cache import LRUCache
+from rag_retriever.dependencies import (
+    get_query_encoder,
+    get_reranker,
+    get_result_cache,
+    get_vector_store,
+)
+from rag_retriever.query_encoder import QueryEncoder
+from rag_retriever.reranker import Reranker
+from rag_retriever.result_cache import SearchResultCache, cached_search_nbytes
+from rag_retriever.stores import MemoryVectorStore, PgVectorStore, StoredChunk, VectorStore
+
+
+def _make_app(
+    session: AsyncMock,
+    client: MagicMock,
+    result_cache: SearchResultCache | None = None,
+    store: VectorStore | None = None,
+    reranker: Reranker | None = None,
+) -> FastAPI:
     """
     Create a test app with overridden dependencies.
 
     Parameters
     ----------
     session : AsyncMock
-        Mock database session.
+        Mock database connection behind the default pgvector store.
     client : MagicMock
         Mock embedding client.
+    result_cache : SearchResultCache | None
+        Search-result cache to inject; disabled by default.
+    store : VectorStore | None
+        Vector store to inject instead of the pgvector store.
+    reranker : Reranker | None
+        Reranker to inject; disabled by default.
 
     Returns
     -------
@@ -38,27 +60,23 @@ def _make_app(session: AsyncMock, client: MagicMock) -> FastAPI:
         mock_lifespan.side_effect = _noop
         app = create_app()
 
-    async def _override_session() -> AsyncGenerator[AsyncMock]:
-        """
-        Yield the mock session.
-
-        Yields
-        ------
-        AsyncMock
-            The mock database session.
-        """
-        yield session
-
-    app.dependency_overrides[get_db_session] = _override_session
-    app.dependency_overrides[get_embedding_client] = lambda: client
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__ = AsyncMock(return_value=session)
+    engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    pg_store = PgVectorStore(engine)
+    app.dependency_overrides[get_vector_store] = lambda: store or pg_store
+    encoder = QueryEncoder(client)
+    app.dependency_overrides[get_query_encoder] = lambda: encoder
+    app.dependency_overrides[get_result_cache] = lambda: result_cache
+    app.dependency_overrides[get_reranker] = lambda: reranker
     return app
 
 
 def _mock_row(
     doc_name: str, content: str, similarity: float, chunk_id: uuid.UUID | None = None
-) -> MagicMock:
+) -> tuple[uuid.UUID, str, str, dict[str, str], float]:
     """
-    Create a mock DB result row.
+    Create a DB result row as projected by the search query.
 
     Parameters
     ----------
@@ -73,16 +91,10 @@ def _mock_row(
 
     Returns
     -------
-    MagicMock
-        Mock row with DocumentChunk and similarity attributes.
+    tuple[uuid.UUID, str, str, dict[str, str], float]
+        Row of id, document name, content, metadata and similarity.
     """
-    row = MagicMock()
-    row.DocumentChunk.id = chunk_id or uuid.uuid4()
-    row.DocumentChunk.document_name = doc_name
-    row.DocumentChunk.content = content
-    row.DocumentChunk.metadata_ = {}
-    row.similarity = similarity
-    return row
+    return (chunk_id or uuid.uuid4(), doc_name, content, {}, similarity)
 
 
 @pytest.mark.asyncio
@@ -97,7 +109,7 @@ async def test_search_returns_results() -> None:
     session.execute.return_value = mock_result
 
     client = MagicMock()
-    client.encode.return_value = [[0.1] * 384]
+    client.encode_array.return_value = np.full((1, 384), 0.1, dtype=np.float32)
 
     app = _make_app(session, client)
     transport = ASGITransport(app=app)  # type: ignore[arg-type]
@@ -112,8 +124,10 @@ async def test_search_returns_results() -> None:
     assert data["results"][0]["similarity_score"] == 0.95
     assert data["results"][1]["similarity_score"] == 0.80
     assert "embedding_time_ms" in data
+    assert data["queue_wait_ms"] >= 0.0
     assert "search_time_ms" in data
-    client.encode.assert_called_once_with(["hello"])
+    assert len(data["query_embedding"]) == 384
+    client.encode_array.assert_called_once_with(["hello"])
 
 
 @pytest.mark.asyncio
@@ -125,7 +139,7 @@ async def test_search_empty_db() -> None:
     session.execute.return_value = mock_result
 
     client = MagicMock()
-    client.encode.return_value = [[0.1] * 384]
+    client.encode_array.return_value = np.full((1, 384), 0.1, dtype=np.float32)
 
     app = _make_app(session, client)
     transport = ASGITransport(app=app)  # type: ignore[arg-type]
@@ -164,7 +178,7 @@ async def test_search_top_k_one() -> None:
     session.execute.return_value = mock_result
 
     client = MagicMock()
-    client.encode.return_value = [[0.1] * 384]
+    client.encode_array.return_value = np.full((1, 384), 0.1, dtype=np.float32)
 
     app = _make_app(session, client)
     transport = ASGITransport(app=app)  # type: ignore[arg-type]
@@ -190,3 +204,277 @@ async def test_search_invalid_top_k() -> None:
         resp = await http.post("/search", json={"query": "test", "top_k": 0})
 
     assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_result_cache_shares_entry_across_top_k() -> None:
+    """
+    Test that a cached search serves smaller top_k without encoding or querying.
+
+    The first request fetches ``fetch_k`` rows; a repeat with a smaller
+    ``top_k`` is sliced from the same entry.
+    """
+    session = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.all.return_value = [
+        _mock_row("doc1.md", "first", 0.95),
+        _mock_row("doc2.md", "second", 0.90),
+        _mock_row("doc3.md", "third", 0.85),
+    ]
+    session.execute.return_value = mock_result
+
+    client = MagicMock()
+    client.model_name = "test-model"
+    client.encode_array.return_value = np.full((1, 384), 0.1, dtype=np.float32)
+
+    result_cache = SearchResultCache(
+        LRUCache(max_entries=10, max_bytes=1 << 20, ttl_s=60, sizeof=cached_search_nbytes),
+        fetch_k=50,
+        poll_interval_s=5.0,
+    )
+    result_cache.version = 1
+
+    app = _make_app(session, client, result_cache)
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        first = await http.post("/search", json={"query": "hello", "top_k": 3})
+        second = await http.post("/search", json={"query": " hello ", "top_k": 1})
+
+    assert first.json()["cached"] is False
+    assert first.json()["total_results"] == 3
+    data = second.json()
+    assert data["cached"] is True
+    assert data["total_results"] == 1
+    assert data["results"][0]["content"] == "first"
+    assert len(data["query_embedding"]) == 384
+    client.encode_array.assert_called_once()
+    # One set_config call and one search query, both for the first request
+    assert session.execute.await_count == 2
+    assert "LIMIT" in str(session.execute.await_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_search_result_cache_invalidated_by_corpus_version() -> None:
+    """Test that a corpus version change forces a fresh search."""
+    session = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.all.return_value = [_mock_row("doc1.md", "first", 0.95)]
+    session.execute.return_value = mock_result
+
+    client = MagicMock()
+    client.model_name = "test-model"
+    client.encode_array.return_value = np.full((1, 384), 0.1, dtype=np.float32)
+
+    result_cache = SearchResultCache(
+        LRUCache(max_entries=10, max_bytes=1 << 20, ttl_s=60, sizeof=cached_search_nbytes),
+        fetch_k=50,
+        poll_interval_s=5.0,
+    )
+    result_cache.version = 1
+
+    app = _make_app(session, client, result_cache)
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        await http.post("/search", json={"query": "hello"})
+        result_cache.version = 2
+        resp = await http.post("/search", json={"query": "hello"})
+
+    assert resp.json()["cached"] is False
+    assert session.execute.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_search_applies_search_effort() -> None:
+    """Test that the requested search effort is set before the search query."""
+    session = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.all.return_value = []
+    session.execute.return_value = mock_result
+
+    client = MagicMock()
+    client.encode_array.return_value = np.full((1, 384), 0.1, dtype=np.float32)
+
+    app = _make_app(session, client)
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        resp = await http.post("/search", json={"query": "q", "search_effort": "exhaustive"})
+
+    assert resp.status_code == 200
+    set_config = session.execute.await_args_list[0]
+    assert "set_config('ivfflat.probes'" in str(set_config.args[0])
+    assert set_config.args[1] == {"probes": "32768", "ef_search": "400"}
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_unknown_search_effort() -> None:
+    """Test that an unknown search effort returns 422."""
+    app = _make_app(AsyncMock(), MagicMock())
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        resp = await http.post("/search", json={"query": "q", "search_effort": "instant"})
+
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_memory_store() -> None:
+    """Test that POST /search ranks chunks from an in-memory store."""
+    store = MemoryVectorStore(384)
+    near = np.zeros(384, dtype=np.float32)
+    near[0] = 1.0
+    far = np.zeros(384, dtype=np.float32)
+    far[1] = 1.0
+    await store.upsert(
+        [
+            StoredChunk("far.md", 0, "far away", {}, far),
+            StoredChunk("near.md", 0, "close by", {}, near),
+        ]
+    )
+
+    client = MagicMock()
+    client.encode_array.return_value = near.reshape(1, -1)
+
+    app = _make_app(AsyncMock(), client, store=store)
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        resp = await http.post("/search", json={"query": "q", "top_k": 1})
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [r["document_name"] for r in data["results"]] == ["near.md"]
+    assert data["results"][0]["similarity_score"] == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_search_hybrid_returns_fusion_scores() -> None:
+    """Test that a hybrid search returns the fused ranking."""
+    session = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.all.return_value = [
+        (*_mock_row("doc1.md", "congés payés", 0.7), 2 / 61),
+        (*_mock_row("doc2.md", "hello world", 0.9), 1 / 61),
+    ]
+    session.execute.return_value = mock_result
+
+    client = MagicMock()
+    client.encode_array.return_value = np.full((1, 384), 0.1, dtype=np.float32)
+
+    app = _make_app(session, client)
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        resp = await http.post("/search", json={"query": "congés", "search_mode": "hybrid"})
+
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["document_name"] for r in results] == ["doc1.md", "doc2.md"]
+    assert results[0]["fusion_score"] == pytest.approx(2 / 61)
+    assert "FULL OUTER JOIN" in str(session.execute.await_args_list[-1].args[0])
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_unsupported_search_mode() -> None:
+    """Test that a hybrid search on the memory store returns 400."""
+    client = MagicMock()
+    app = _make_app(AsyncMock(), client, store=MemoryVectorStore(384))
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        resp = await http.post("/search", json={"query": "q", "search_mode": "hybrid"})
+
+    assert resp.status_code == 400
+    assert "hybrid" in resp.json()["detail"]
+    client.encode_array.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_reranks_candidates() -> None:
+    """Test that a configured reranker reorders an over-fetched candidate list."""
+    session = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.all.return_value = [
+        _mock_row("doc1.md", "short", 0.95),
+        _mock_row("doc2.md", "much longer passage", 0.80),
+    ]
+    session.execute.return_value = mock_result
+
+    client = MagicMock()
+    client.encode_array.return_value = np.full((1, 384), 0.1, dtype=np.float32)
+    cross_encoder = MagicMock()
+    cross_encoder.score.side_effect = lambda _query, passages, _batch_size: np.array(
+        [len(p) for p in passages], dtype=np.float32
+    )
+
+    app = _make_app(session, client, reranker=Reranker(cross_encoder, timeout_ms=5_000))
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        resp = await http.post("/search", json={"query": "hello", "top_k": 1})
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["reranked"] is True
+    assert data["rerank_time_ms"] >= 0.0
+    assert [r["document_name"] for r in data["results"]] == ["doc2.md"]
+    assert data["results"][0]["rerank_score"] == 19.0
+    search_stmt = session.execute.await_args_list[-1].args[0]
+    assert search_stmt.compile().params["param_1"] == 50
+
+
+@pytest.mark.asyncio
+async def test_search_rerank_opt_out() -> None:
+    """Test that a request can skip the configured reranker."""
+    session = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.all.return_value = [_mock_row("doc1.md", "hello", 0.9)]
+    session.execute.return_value = mock_result
+
+    client = MagicMock()
+    client.encode_array.return_value = np.full((1, 384), 0.1, dtype=np.float32)
+    cross_encoder = MagicMock()
+
+    app = _make_app(session, client, reranker=Reranker(cross_encoder))
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        resp = await http.post("/search", json={"query": "hello", "rerank": False})
+
+    assert resp.status_code == 200
+    assert resp.json()["reranked"] is False
+    assert resp.json()["rerank_time_ms"] == 0.0
+    cross_encoder.score.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_rerank_without_reranker() -> None:
+    """Test that requesting reranking on a service without a reranker returns 400."""
+    app = _make_app(AsyncMock(), MagicMock())
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        resp = await http.post("/search", json={"query": "q", "rerank": True})
+
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_passes_filters_to_store() -> None:
+    """Test that request filters restrict the store search."""
+    store = MemoryVectorStore(384)
+    near = np.zeros(384, dtype=np.float32)
+    near[0] = 1.0
+    await store.upsert(
+        [
+            StoredChunk("a.md", 0, "alpha", {"pokemon_name": "Pikachu"}, near),
+            StoredChunk("b.md", 0, "beta", {"pokemon_name": "Evoli"}, near),
+        ]
+    )
+
+    client = MagicMock()
+    client.encode_array.return_value = near.reshape(1, -1)
+
+    app = _make_app(AsyncMock(), client, store=store)
+    transport = ASGITransport(app=app)  # type: ignore[arg-type]
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        resp = await http.post(
+            "/search",
+            json={"query": "q", "filters": {"metadata": {"pokemon_name": "Evoli"}}},
+        )
+
+    assert resp.status_code == 200
+    assert [r["document_name"] for r in resp.json()["results"]] == ["b.md"]
@@ -6,7 +6,7 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from lib_schemas.schemas import ChunkWithEmbedding, SearchResponse
+from lib_schemas.schemas import ChunkInput, SearchResponse
 from umap import UMAP
 
 from rag_viz.task_inputs import task_inputs
@@ -29,11 +29,12 @@ class App:
         # Load embeddings
         input_path = Path(task_inputs.input_file)
         data = json.loads(input_path.read_text(encoding="utf-8"))
-        chunks = [ChunkWithEmbedding(**item) for item in data]
+        chunks = [ChunkInput(**item) for item in data]
         print(f"Loaded {len(chunks)} chunks")
 
-        # Build embedding matrix
-        embedding_matrix = np.array([c.embedding for c in chunks])
+        # Build a float32 embedding matrix straight from the JSON arrays,
+        # without validating every component into a pydantic model
+        embedding_matrix = np.array([item["embedding"] for item in data], dtype=np.float32)
         print(f"Embedding matrix shape: {embedding_matrix.shape}")
 
         # UMAP reduction
@@ -111,7 +112,7 @@ class App:
         self,
         fig: go.Figure,
         reducer: UMAP,
-        chunks: list[ChunkWithEmbedding],
+        chunks: list[ChunkInput],
         coords: np.ndarray,
         df: pd.DataFrame,
     ) -> None:
@@ -124,7 +125,7 @@ class App:
             The plotly figure to add traces to.
         reducer : UMAP
             Fitted UMAP reducer for transforming the query embedding.
-        chunks : list[ChunkWithEmbedding]
+        chunks : list[ChunkInput]
             All corpus chunks.
         coords : np.ndarray
             UMAP 2D coordinates for all chunks.
@@ -175,7 +176,7 @@ class App:
 
         # Plot query point
         if search_response.query_embedding:
-            query_vec = np.array([search_response.query_embedding])
+            query_vec = np.array([search_response.query_embedding], dtype=np.float32)
             query_coords = reducer.transform(query_vec)
             max_len = task_inputs.content_truncate_length
             query_preview = search_response.query[:max_len]
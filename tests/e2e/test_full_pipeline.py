@@ -274,3 +274,27 @@ class TestFullPipeline:
         assert data["total_chunks"] == pipeline["num_embeddings"]
         assert data["embedding_dimension"] == 384
         assert data["model_name"] == "all-MiniLM-L6-v2"
+
+    def test_search_query_uses_vector_index(self, pipeline: dict[str, object]) -> None:
+        """
+        Verify the search statement can be served by the ANN index.
+
+        Sequential scans are disabled for the session so the planner reports
+        whether the statement shape allows an index scan at all, independent
+        of the (small) table size.
+
+        Parameters
+        ----------
+        pipeline : dict[str, object]
+            Pipeline fixture output (ensures ingestion ran first).
+        """
+        import numpy as np
+        from rag_retriever.queries import build_search_stmt
+        from sqlalchemy.dialects import postgresql
+
+        stmt = build_search_stmt(np.full(384, 0.1, dtype=np.float32), 0.5, 5)
+        sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        result = _run_sql(f"SET enable_seqscan = off; EXPLAIN {sql}")
+
+        assert result.returncode == 0, f"EXPLAIN failed:\n{result.stderr}"
+        assert "idx_chunks_embedding" in result.stdout, result.stdout